@@ -12,9 +12,9 @@ from scipy import stats
 from statsmodels.tsa.stattools import acf, adfuller, kpss
 
 
-def load_data(filepath, date_col=None, value_col=None):
+def load_frame(filepath, date_col=None):
     """
-    Load and prepare time series data from CSV.
+    Load a CSV once, indexed by its date column, for analyzing many columns.
     
     Parameters
     ----------
@@ -22,17 +22,15 @@ def load_data(filepath, date_col=None, value_col=None):
         Path to CSV file
     date_col : str, optional
         Name of date column (auto-detected if None)
-    value_col : str, optional
-        Name of value column (auto-detected if None)
     
     Returns
     -------
-    series : pd.Series
-        Time series with datetime index
+    df : pd.DataFrame
+        Data sorted by its datetime index
     date_col : str
         Detected/used date column name
-    value_col : str
-        Detected/used value column name
+    value_cols : list of str
+        Numeric columns, in file order
     """
     df = pd.read_csv(filepath)
     
@@ -43,21 +41,62 @@ def load_data(filepath, date_col=None, value_col=None):
             raise ValueError("No date column found. Specify with --date-col")
         date_col = date_cols[0]
     
-    # Auto-detect value column
-    if value_col is None:
-        value_cols = df.select_dtypes(include=[np.number]).columns
-        if len(value_cols) == 0:
-            raise ValueError("No numeric column found. Specify with --value-col")
-        value_col = value_cols[0]
+    value_cols = [
+        col for col in df.select_dtypes(include=[np.number]).columns
+        if col != date_col
+    ]
     
     df[date_col] = pd.to_datetime(df[date_col])
     df = df.set_index(date_col).sort_index()
+    
+    return df, date_col, value_cols
+
+
+def series_from_frame(df, value_col):
+    """
+    Extract one value column of a loaded frame as a series without gaps.
+    
+    Raises ValueError if fewer than 10 observations remain.
+    """
     series = df[value_col].dropna()
     
     if len(series) < 10:
         raise ValueError(f"Too few observations ({len(series)}). Need at least 10.")
     
-    return series, date_col, value_col
+    return series
+
+
+def load_data(filepath, date_col=None, value_col=None):
+    """
+    Load and prepare time series data from CSV.
+    
+    Parameters
+    ----------
+    filepath : str
+        Path to CSV file
+    date_col : str, optional
+        Name of date column (auto-detected if None)
+    value_col : str, optional
+        Name of value column (auto-detected if None)
+    
+    Returns
+    -------
+    series : pd.Series
+        Time series with datetime index
+    date_col : str
+        Detected/used date column name
+    value_col : str
+        Detected/used value column name
+    """
+    df, date_col, value_cols = load_frame(filepath, date_col)
+    
+    # Auto-detect value column
+    if value_col is None:
+        if len(value_cols) == 0:
+            raise ValueError("No numeric column found. Specify with --value-col")
+        value_col = value_cols[0]
+    
+    return series_from_frame(df, value_col), date_col, value_col
 
 
 def detect_frequency(series):
@@ -4,10 +4,19 @@ Time Series Diagnostic Analysis
 
 Runs comprehensive statistical tests and analysis on time series data.
 Output: diagnostics.json, summary.txt, diagnostics_state.json
+
+Batch mode (--batch DIR and/or --all-columns) diagnoses many series across a
+process pool and also writes index.json, listing every series and failure.
 """
 
 import argparse
 import json
+import os
+import re
+import sys
+import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
 
 import numpy as np
@@ -19,6 +28,8 @@ from statsmodels.tsa.seasonal import STL
 
 from ts_utils import (
     load_data,
+    load_frame,
+    series_from_frame,
     detect_frequency,
     test_stationarity,
     get_stationary_series,
@@ -26,6 +37,11 @@ from ts_utils import (
     check_transform_recommendation
 )
 
+# Batch runs report progress every this many series
+PROGRESS_EVERY = 100
+# Series queued per worker, bounding memory while files are still loading
+IN_FLIGHT_PER_WORKER = 4
+
 
 def analyze_data_quality(series):
     """Analyze data quality metrics."""
@@ -413,53 +429,42 @@ def generate_summary(diagnostics, output_path):
             f.write(f"Transform: {tf['recommendation'].upper()} recommended\n")
 
 
-def run_diagnostics(filepath, output_dir, date_col=None, value_col=None, seasonal_period=None):
-    """Run complete diagnostic pipeline."""
-    output_dir = Path(output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    print("\n" + "=" * 60)
-    print("TIME SERIES DIAGNOSTICS")
-    print("=" * 60 + "\n")
+def compute_diagnostics(series, seasonal_period=None, verbose=True):
+    """Run all analyses on a loaded series and return the diagnostics."""
+    log = print if verbose else lambda *args: None
     
-    # Load data
-    series, detected_date_col, detected_value_col = load_data(filepath, date_col, value_col)
-    print(f"Loaded {len(series)} observations ({series.index.min().date()} to {series.index.max().date()})")
+    log("\nRunning analyses...")
     
-    # Run all analyses
-    print("\nRunning analyses...")
-    
-    print("  [1/8] Data quality")
+    log("  [1/8] Data quality")
     data_quality = analyze_data_quality(series)
     
-    print("  [2/8] Distribution")
+    log("  [2/8] Distribution")
     distribution = analyze_distribution(series)
     
-    print("  [3/8] Stationarity tests (ADF, KPSS)")
+    log("  [3/8] Stationarity tests (ADF, KPSS)")
     stationarity = test_stationarity(series)
     d = stationarity['differencing_needed']
     freq = data_quality['frequency']
     
     if not stationarity.get('differencing_verified', True):
-        print("        WARNING: d=2 may be insufficient")
+        log("        WARNING: d=2 may be insufficient")
     
-    print("  [4/8] Seasonality (STL decomposition)")
+    log("  [4/8] Seasonality (STL decomposition)")
     seasonality = analyze_seasonality(series, seasonal_period, d=d, freq=freq)
     
-    print("  [5/8] Trend analysis")
+    log("  [5/8] Trend analysis")
     trend = analyze_trend(series, seasonality.get('period'), d=d, freq=freq)
     
-    print("  [6/8] Autocorrelation (ACF, PACF)")
+    log("  [6/8] Autocorrelation (ACF, PACF)")
     autocorrelation = analyze_autocorrelation(series, d)
     
-    print("  [7/8] Forecastability (Ljung-Box)")
+    log("  [7/8] Forecastability (Ljung-Box)")
     forecastability = test_forecastability(series, d)
     
-    print("  [8/8] Transform recommendation (Box-Cox)")
+    log("  [8/8] Transform recommendation (Box-Cox)")
     transform = check_transform_recommendation(series)
     
-    # Compile results
-    diagnostics = {
+    return {
         'data_quality': data_quality,
         'distribution': distribution,
         'stationarity': stationarity,
@@ -469,6 +474,12 @@ def run_diagnostics(filepath, output_dir, date_col=None, value_col=None, seasona
         'forecastability': forecastability,
         'transform': transform
     }
+
+
+def save_diagnostics(diagnostics, output_dir, date_col, value_col):
+    """Write diagnostics.json, summary.txt and diagnostics_state.json."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
     
     # Save diagnostics.json
     with open(output_dir / 'diagnostics.json', 'w') as f:
@@ -478,16 +489,34 @@ def run_diagnostics(filepath, output_dir, date_col=None, value_col=None, seasona
     generate_summary(diagnostics, output_dir / 'summary.txt')
     
     # Save diagnostic state for visualize.py
+    stationarity = diagnostics['stationarity']
     diagnostic_state = {
-        'date_col': detected_date_col,
-        'value_col': detected_value_col,
+        'date_col': date_col,
+        'value_col': value_col,
         'd': stationarity['differencing_needed'],
         'series_used_for_acf': stationarity['series_used_for_acf'],
-        'seasonal_period': seasonality.get('period'),
-        'frequency': data_quality['frequency']
+        'seasonal_period': diagnostics['seasonality'].get('period'),
+        'frequency': diagnostics['data_quality']['frequency']
     }
     with open(output_dir / 'diagnostics_state.json', 'w') as f:
         json.dump(diagnostic_state, f, indent=2)
+
+
+def run_diagnostics(filepath, output_dir, date_col=None, value_col=None, seasonal_period=None):
+    """Run complete diagnostic pipeline."""
+    output_dir = Path(output_dir)
+    
+    print("\n" + "=" * 60)
+    print("TIME SERIES DIAGNOSTICS")
+    print("=" * 60 + "\n")
+    
+    # Load data
+    series, detected_date_col, detected_value_col = load_data(filepath, date_col, value_col)
+    print(f"Loaded {len(series)} observations ({series.index.min().date()} to {series.index.max().date()})")
+    
+    # Run all analyses
+    diagnostics = compute_diagnostics(series, seasonal_period)
+    save_diagnostics(diagnostics, output_dir, detected_date_col, detected_value_col)
     
     print(f"\nOutput saved to {output_dir}/")
     print(f"  - diagnostics.json")
@@ -495,10 +524,15 @@ def run_diagnostics(filepath, output_dir, date_col=None, value_col=None, seasona
     print(f"  - diagnostics_state.json")
     
     # Print quick summary
+    stationarity = diagnostics['stationarity']
+    seasonality = diagnostics['seasonality']
+    transform = diagnostics['transform']
+    d = stationarity['differencing_needed']
+    
     print("\n" + "=" * 60)
     print("QUICK SUMMARY")
     print("=" * 60)
-    print(f"Forecastable: {'Yes' if forecastability['forecastable'] else 'No'}")
+    print(f"Forecastable: {'Yes' if diagnostics['forecastability']['forecastable'] else 'No'}")
     print(f"Stationary: {'Yes' if stationarity['adf_stationary'] else 'No (d=' + str(d) + ')'}")
     
     if not stationarity.get('differencing_verified', True):
@@ -506,7 +540,7 @@ def run_diagnostics(filepath, output_dir, date_col=None, value_col=None, seasona
     
     seasonal_str = f"Yes (period={seasonality['period']})" if seasonality['is_seasonal'] else "No"
     print(f"Seasonal: {seasonal_str}")
-    print(f"Trend: {trend['direction']}")
+    print(f"Trend: {diagnostics['trend']['direction']}")
     
     if transform['recommendation'] != 'none':
         print(f"Transform: {transform['recommendation']} recommended")
@@ -514,6 +548,162 @@ def run_diagnostics(filepath, output_dir, date_col=None, value_col=None, seasona
     return diagnostics
 
 
+def _safe_name(name):
+    """Turn a file stem or column name into a directory name."""
+    return re.sub(r'[^\w.-]+', '_', str(name)).strip('._') or 'series'
+
+
+def _init_worker():
+    """Silence per-series statsmodels warnings; failures go to the index."""
+    warnings.simplefilter('ignore')
+
+
+def _diagnose_series(series, output_dir, date_col, value_col, seasonal_period):
+    """Diagnose one series in a worker process and return its index entry."""
+    started = time.perf_counter()
+    entry = {'output_dir': str(output_dir)}
+    try:
+        diagnostics = compute_diagnostics(series, seasonal_period, verbose=False)
+        save_diagnostics(diagnostics, output_dir, date_col, value_col)
+    except Exception as e:
+        entry.update(status='failed', error=f"{type(e).__name__}: {e}")
+    else:
+        seasonality = diagnostics['seasonality']
+        entry.update(
+            status='ok',
+            n_observations=diagnostics['data_quality']['n_observations'],
+            forecastable=diagnostics['forecastability']['forecastable'],
+            differencing_needed=diagnostics['stationarity']['differencing_needed'],
+            seasonal_period=seasonality['period'] if seasonality['is_seasonal'] else None,
+            trend=diagnostics['trend']['direction'],
+            transform=diagnostics['transform']['recommendation']
+        )
+    entry['seconds'] = round(time.perf_counter() - started, 3)
+    return entry
+
+
+def _failure(filepath, value_col, error):
+    """Build the index entry of a series that could not be loaded."""
+    return {
+        'name': Path(filepath).stem if value_col is None else f"{Path(filepath).stem}/{value_col}",
+        'file': str(filepath),
+        'value_col': None if value_col is None else str(value_col),
+        'status': 'failed',
+        'error': f"{type(error).__name__}: {error}"
+    }
+
+
+def _iter_series(files, output_dir, date_col, value_col, by_file, all_columns, failures):
+    """
+    Load each file once and yield (name, file, series, date_col, value_col, output_dir).
+    
+    Each series gets its own output directory: output_dir/FILE with by_file,
+    output_dir/COLUMN with all_columns, or output_dir/FILE/COLUMN with both.
+    Files or columns that cannot be loaded are appended to failures.
+    """
+    for filepath in files:
+        try:
+            df, detected_date_col, value_cols = load_frame(filepath, date_col)
+            if value_col is not None:
+                value_cols = [value_col]
+            elif not all_columns:
+                value_cols = value_cols[:1]
+            if not value_cols:
+                raise ValueError("No numeric column found. Specify with --value-col")
+        except Exception as e:
+            failures.append(_failure(filepath, value_col, e))
+            continue
+        
+        for col in value_cols:
+            try:
+                series = series_from_frame(df, col)
+            except Exception as e:
+                failures.append(_failure(filepath, col, e))
+                continue
+            
+            parts = ([filepath.stem] if by_file else []) + ([str(col)] if all_columns else [])
+            series_dir = Path(output_dir).joinpath(*map(_safe_name, parts))
+            yield '/'.join(parts), filepath, series, detected_date_col, col, series_dir
+
+
+def run_batch(files, output_dir, date_col=None, value_col=None, seasonal_period=None,
+              by_file=True, all_columns=False, workers=None):
+    """
+    Diagnose many series in parallel worker processes.
+    
+    Each CSV is read once, however many value columns it has, and its series
+    are fanned out across a process pool as they are loaded. Writes the usual
+    outputs per series plus index.json listing every series, and returns the
+    index.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    
+    print("\n" + "=" * 60)
+    print("TIME SERIES DIAGNOSTICS (BATCH)")
+    print("=" * 60 + "\n")
+    print(f"Diagnosing {len(files)} file(s) with {workers} worker(s)...")
+    
+    started = time.perf_counter()
+    entries, failures = [], []
+    series_iter = _iter_series(files, output_dir, date_col, value_col, by_file, all_columns, failures)
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        pending = {}
+        
+        def collect(done):
+            for future in done:
+                entry = pending.pop(future)
+                try:
+                    entry.update(future.result())
+                except Exception as e:
+                    # A worker that died takes its series down, not the run
+                    entry.update(status='failed', error=f"{type(e).__name__}: {e}")
+                entries.append(entry)
+                if entry['status'] == 'failed':
+                    print(f"  FAILED {entry['name']}: {entry['error']}")
+                if len(entries) % PROGRESS_EVERY == 0:
+                    elapsed = time.perf_counter() - started
+                    print(f"  {len(entries)} series done ({len(entries) / elapsed:.1f} series/s)")
+        
+        for name, filepath, series, detected_date_col, col, series_dir in series_iter:
+            # Bound the series held in memory while workers catch up
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            future = executor.submit(
+                _diagnose_series, series, series_dir, detected_date_col, col, seasonal_period
+            )
+            pending[future] = {'name': name, 'file': str(filepath), 'value_col': str(col)}
+        collect(list(pending))
+    
+    elapsed = time.perf_counter() - started
+    for failure in failures:
+        print(f"  FAILED {failure['name']}: {failure['error']}")
+    entries.extend(failures)
+    entries.sort(key=lambda entry: entry['name'])
+    
+    n_failed = sum(entry['status'] == 'failed' for entry in entries)
+    index = {
+        'n_series': len(entries),
+        'n_ok': len(entries) - n_failed,
+        'n_failed': n_failed,
+        'workers': workers,
+        'elapsed_seconds': round(elapsed, 3),
+        'series_per_second': round(len(entries) / elapsed, 2) if elapsed > 0 else None,
+        'series': entries
+    }
+    with open(output_dir / 'index.json', 'w') as f:
+        json.dump(index, f, indent=2)
+    
+    print(f"\nDiagnosed {len(entries)} series in {elapsed:.2f}s "
+          f"({index['series_per_second']} series/s), {n_failed} failed")
+    print(f"Index saved to {output_dir / 'index.json'}")
+    
+    return index
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(
         description='Time Series Diagnostics',
@@ -524,14 +714,40 @@ Examples:
   python diagnose.py data.csv --output-dir results/
   python diagnose.py data.csv --date-col timestamp --value-col sales
   python diagnose.py data.csv --seasonal-period 12
+  python diagnose.py data.csv --all-columns --output-dir results/
+  python diagnose.py --batch metrics/ --all-columns --workers 8
         """
     )
-    parser.add_argument('input_file', help='Path to CSV file')
+    parser.add_argument('input_file', nargs='?', help='Path to CSV file')
     parser.add_argument('--output-dir', default='diagnostics', help='Output directory (default: diagnostics)')
     parser.add_argument('--date-col', help='Date column name (auto-detected if omitted)')
     parser.add_argument('--value-col', help='Value column name (auto-detected if omitted)')
     parser.add_argument('--seasonal-period', type=int, help='Seasonal period (auto-detected if omitted)')
+    parser.add_argument('--batch', metavar='DIR', help='Diagnose every CSV file in DIR')
+    parser.add_argument('--all-columns', action='store_true', help='Diagnose every numeric column')
+    parser.add_argument('--workers', type=int, help='Worker processes for batch runs (default: CPU count)')
     
     args = parser.parse_args()
     
-    run_diagnostics(args.input_file, args.output_dir, args.date_col, args.value_col, args.seasonal_period)
+    if (args.batch is None) == (args.input_file is None):
+        parser.error('give either input_file or --batch DIR')
+    if args.all_columns and args.value_col:
+        parser.error('--all-columns and --value-col cannot be combined')
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers must be at least 1')
+    
+    if args.batch is None and not args.all_columns:
+        run_diagnostics(args.input_file, args.output_dir, args.date_col, args.value_col, args.seasonal_period)
+    else:
+        if args.batch is not None:
+            files = sorted(Path(args.batch).glob('*.csv'))
+            if not files:
+                parser.error(f'no CSV files found in {args.batch}')
+        else:
+            files = [Path(args.input_file)]
+        index = run_batch(
+            files, args.output_dir, args.date_col, args.value_col, args.seasonal_period,
+            by_file=args.batch is not None, all_columns=args.all_columns, workers=args.workers
+        )
+        if index['n_failed']:
+            sys.exit(1)
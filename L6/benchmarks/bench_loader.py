@@ -0,0 +1,74 @@
+"""Compare the eager task loader with the streaming one.
+
+Run with: uv run python benchmarks/bench_loader.py [SIZE ...]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from synthetic import make_store
+
+from task import storage
+
+
+def eager_pending() -> int:
+    """List pending tasks the way load_tasks/get_tasks used to."""
+    data = json.loads(storage.STORAGE_PATH.read_text())
+    tasks = [storage.dict_to_task(t) for t in data["tasks"]]
+    return len([t for t in tasks if not t.done])
+
+
+def streaming_pending() -> int:
+    """List pending tasks through the streaming loader."""
+    return len(storage.get_tasks(done=False))
+
+
+def eager_count() -> int:
+    """Count tasks by decoding all of them."""
+    data = json.loads(storage.STORAGE_PATH.read_text())
+    return len([storage.dict_to_task(t) for t in data["tasks"]])
+
+
+def streaming_count() -> int:
+    """Count tasks on raw records."""
+    return storage.count_tasks()
+
+
+def measure(fn) -> tuple[float, float]:
+    """Return wall time in seconds and peak traced memory in MiB."""
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("sizes", nargs="*", type=int, default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'tasks':>9}  {'scenario':<8}  {'loader':<9}  {'time (s)':>8}  {'peak (MiB)':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            make_store(Path(tmp), size)
+            scenarios = [
+                ("pending", eager_pending, streaming_pending),
+                ("count", eager_count, streaming_count),
+            ]
+            for name, before, after in scenarios:
+                for loader, fn in [("eager", before), ("streaming", after)]:
+                    elapsed, peak = measure(fn)
+                    print(f"{size:>9}  {name:<8}  {loader:<9}  {elapsed:>8.2f}  {peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Time 'task list --limit 20' style reads on JSON and memory-mapped stores.
+
+Run with: uv run python benchmarks/bench_mmap.py [SIZE ...]
+"""
+
+import argparse
+import tempfile
+import time
+from itertools import islice
+from pathlib import Path
+
+from synthetic import make_store
+
+from task import storage
+
+
+def first_pending(limit: int = 20) -> int:
+    """Decode the first page of pending tasks."""
+    return len(list(islice(storage.iter_tasks(done=False), limit)))
+
+
+def count_pending() -> int:
+    """Count pending tasks."""
+    return storage.count_tasks(done=False)
+
+
+def timed(fn) -> float:
+    """Return the best of three wall times in milliseconds."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("sizes", nargs="*", type=int, default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'tasks':>9}  {'format':<7}  {'first 20 (ms)':>13}  {'count (ms)':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            make_store(Path(tmp), size)
+            for fmt in ["json", "binary"]:
+                storage.convert_store(fmt)
+                print(
+                    f"{size:>9}  {fmt:<7}  {timed(first_pending):>13.1f}"
+                    f"  {timed(count_pending):>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Measure memory per task and load time for each task representation.
+
+Run with: uv run python benchmarks/bench_models.py [SIZE ...]
+"""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from synthetic import make_store
+
+from task import storage
+from task.models import Priority
+
+
+@dataclass
+class DictTask:
+    """The Task dataclass as it was before it used slots."""
+
+    title: str
+    done: bool = False
+    priority: Priority = Priority.LOW
+    created_at: datetime = field(default_factory=datetime.now)
+    due_date: datetime | None = None
+    id: int | None = None
+
+
+def load_dict_tasks() -> list[DictTask]:
+    """Load every task into the dict-backed dataclass."""
+    return [
+        DictTask(
+            id=r["id"],
+            title=r["title"],
+            done=r["done"],
+            priority=Priority(r["priority"]),
+            created_at=datetime.fromisoformat(r["created_at"]),
+            due_date=datetime.fromisoformat(r["due_date"]) if r["due_date"] else None,
+        )
+        for r in storage.iter_records()
+    ]
+
+
+def measure(load) -> tuple[float, float]:
+    """Return load time in seconds and retained memory in bytes."""
+    gc.collect()
+    start = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = load()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("sizes", nargs="*", type=int, default=[100_000, 500_000])
+    args = parser.parse_args()
+
+    loaders = [
+        ("dataclass", load_dict_tasks),
+        ("slotted", storage.load_tasks),
+        ("TaskTable", storage.load_table),
+    ]
+    print(f"{'tasks':>9}  {'representation':<14}  {'load (s)':>8}  {'bytes/task':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            make_store(Path(tmp), size)
+            for name, load in loaders:
+                elapsed, retained = measure(load)
+                print(f"{size:>9}  {name:<14}  {elapsed:>8.2f}  {retained / size:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
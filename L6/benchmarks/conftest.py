@@ -0,0 +1,178 @@
+"""Fixtures for the pytest benchmark suite.
+
+Run with: uv run pytest benchmarks [--sizes 1000,1000000] [--report FILE]
+
+Each benchmark runs against synthetic stores of every --sizes entry, and the
+timings are written to a JSON report for comparing runs.
+"""
+
+import io
+import json
+import platform
+import shutil
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from synthetic import make_store, use_store
+
+from task import display
+
+DEFAULT_SIZES = "1000,10000,100000"
+DEFAULT_REPORT = "benchmarks/report.json"
+
+results_key = pytest.StashKey[list]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("task benchmarks")
+    group.addoption(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        help=f"comma-separated store sizes (default {DEFAULT_SIZES})",
+    )
+    group.addoption(
+        "--rounds", type=int, default=5, help="timed runs per benchmark (default 5)"
+    )
+    group.addoption(
+        "--report",
+        default=DEFAULT_REPORT,
+        help=f"JSON file for the results (default {DEFAULT_REPORT})",
+    )
+
+
+def _label(size: int) -> str:
+    """Return a short label for a store size, e.g. 100k or 1M."""
+    for unit, scale in [("M", 1_000_000), ("k", 1_000)]:
+        if size >= scale and size % scale == 0:
+            return f"{size // scale}{unit}"
+    return str(size)
+
+
+def pytest_configure(config):
+    config.stash[results_key] = []
+
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("sizes").split(",")]
+        metafunc.parametrize("size", sizes, ids=map(_label, sizes))
+
+
+@pytest.fixture(scope="session")
+def templates(tmp_path_factory):
+    """Synthetic stores by size, generated once per session."""
+    stores = {}
+
+    def get(size: int) -> Path:
+        if size not in stores:
+            directory = tmp_path_factory.mktemp(f"template-{_label(size)}")
+            make_store(directory, size)
+            stores[size] = directory
+        return stores[size]
+
+    return get
+
+
+@pytest.fixture
+def store(size, templates, tmp_path):
+    """A fresh copy of the synthetic store of the given size."""
+    directory = tmp_path / ".task"
+    shutil.copytree(templates(size), directory)
+    return use_store(directory)
+
+
+@pytest.fixture
+def console(monkeypatch):
+    """Send display output to an in-memory console."""
+    from rich.console import Console
+
+    out = Console(file=io.StringIO(), width=120)
+    monkeypatch.setattr(display, "console", lambda: out)
+    return out
+
+
+class Benchmark:
+    """Time a function over several rounds, pytest-benchmark style."""
+
+    def __init__(self, node: pytest.Item, rounds: int, results: list) -> None:
+        self.node = node
+        self.rounds = rounds
+        self.results = results
+
+    def __call__(self, fn, *args, setup=None):
+        """Time fn(*args) each round, after setup() if given; return its result."""
+        times = []
+        for _ in range(self.rounds):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            result = fn(*args)
+            times.append(time.perf_counter() - start)
+
+        callspec = getattr(self.node, "callspec", None)
+        self.results.append(
+            {
+                "id": self.node.name,
+                "name": self.node.originalname,
+                "params": dict(callspec.params) if callspec else {},
+                "stats": {
+                    "rounds": len(times),
+                    "min": min(times),
+                    "median": statistics.median(times),
+                    "mean": statistics.fmean(times),
+                    "max": max(times),
+                },
+            }
+        )
+        return result
+
+
+@pytest.fixture
+def bench(request):
+    """Benchmark a function; the timings go into the report."""
+    return Benchmark(
+        request.node,
+        request.config.getoption("rounds"),
+        request.config.stash[results_key],
+    )
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = config.stash[results_key]
+    if not results:
+        return
+
+    terminalreporter.section("benchmarks (ms)")
+    terminalreporter.write_line(
+        f"{'benchmark':<40} {'min':>10} {'median':>10} {'max':>10}"
+    )
+    for result in results:
+        stats = result["stats"]
+        terminalreporter.write_line(
+            f"{result['id']:<40}"
+            f" {stats['min'] * 1000:>10.2f}"
+            f" {stats['median'] * 1000:>10.2f}"
+            f" {stats['max'] * 1000:>10.2f}"
+        )
+
+
+def pytest_sessionfinish(session):
+    results = session.config.stash[results_key]
+    if not results:
+        return
+
+    report = {
+        "datetime": datetime.now().isoformat(),
+        "machine": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "processor": platform.machine(),
+        },
+        "benchmarks": results,
+    }
+    path = Path(session.config.getoption("report"))
+    path.write_text(json.dumps(report, indent=2, default=str) + "\n")
@@ -0,0 +1,48 @@
+"""Synthetic task stores for benchmarks."""
+
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from task import storage
+
+PRIORITIES = ["low", "medium", "high"]
+WORDS = ["review", "write", "fix", "plan", "call", "email", "draft", "ship", "test"]
+
+
+def make_records(size: int, seed: int = 0) -> list[dict]:
+    """Generate raw task records with a realistic mix of fields."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    records = []
+    for task_id in range(1, size + 1):
+        created = start + timedelta(minutes=task_id)
+        due = created + timedelta(days=rng.randint(1, 60))
+        records.append(
+            {
+                "id": task_id,
+                "title": f"{rng.choice(WORDS)} {rng.choice(WORDS)} #{task_id}",
+                "done": rng.random() < 0.7,
+                "priority": rng.choice(PRIORITIES),
+                "created_at": created.isoformat(),
+                "due_date": due.isoformat() if rng.random() < 0.4 else None,
+            }
+        )
+    return records
+
+
+def use_store(directory: Path) -> Path:
+    """Point the storage module at a store inside directory."""
+    storage.STORAGE_DIR = directory
+    storage.STORAGE_PATH = directory / "tasks.json"
+    return storage.STORAGE_PATH
+
+
+def make_store(directory: Path, size: int) -> Path:
+    """Write a synthetic store of the given size and point storage at it."""
+    path = use_store(directory)
+    records = make_records(size)
+    storage._write_document(
+        {"version": 1, "next_id": size + 1, "tasks": {r["id"]: r for r in records}}
+    )
+    return path
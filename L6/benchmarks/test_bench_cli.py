@@ -0,0 +1,23 @@
+"""End-to-end CLI latency over synthetic stores, run in-process with CliRunner."""
+
+import pytest
+from typer.testing import CliRunner
+
+from task.commands import app
+
+COMMANDS = {
+    "list-page": ["list", "-n", "20"],
+    "list-top": ["list", "--top", "20"],
+    "add": ["add", "Benchmark task"],
+    "done": ["done", "1"],
+    "stats": ["stats"],
+    "search": ["search", "review"],
+    "due": ["due", "--within", "2w"],
+}
+
+
+@pytest.mark.parametrize("command", COMMANDS)
+def test_cli(bench, store, command, console):
+    runner = CliRunner()
+    result = bench(runner.invoke, app, COMMANDS[command])
+    assert result.exit_code == 0, result.output
@@ -0,0 +1,50 @@
+"""Storage layer benchmarks over synthetic stores."""
+
+import pytest
+
+from task import display, storage
+from task.models import Priority, Task
+
+# Rendering is far slower than loading, so only tables up to this size are timed
+TABLE_MAX_ROWS = 10_000
+
+
+def test_load_tasks(bench, store, size):
+    tasks = bench(storage.load_tasks)
+    assert len(tasks) == size
+
+
+def test_save_tasks(bench, store, size):
+    tasks = storage.load_tasks()
+    bench(storage.save_tasks, tasks)
+
+
+@pytest.mark.parametrize("engine", ["json", "journal"])
+def test_add_task(bench, store, engine, monkeypatch):
+    monkeypatch.setenv("TASK_STORAGE", engine)
+    bench(lambda: storage.add_task(Task(title="Benchmark task")))
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"done": False},
+        {"priority": Priority.HIGH},
+        {"done": True, "priority": Priority.LOW},
+    ],
+    ids=["pending", "high", "done-low"],
+)
+def test_get_tasks(bench, store, filters):
+    bench(lambda: storage.get_tasks(**filters))
+
+
+def test_count_tasks(bench, store):
+    bench(storage.count_tasks, False)
+
+
+def test_table(bench, store, size, console):
+    if size > TABLE_MAX_ROWS:
+        pytest.skip(f"rendering is only timed up to {TABLE_MAX_ROWS} rows")
+    tasks = storage.load_tasks()
+    rows = bench(display.table, tasks)
+    assert rows == size
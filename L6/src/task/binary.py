@@ -0,0 +1,201 @@
+import json
+import mmap
+import struct
+from collections.abc import Container, Iterable, Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO
+
+from task.models import (
+    NO_DUE_DATE,
+    PRIORITIES,
+    PRIORITY_CODES,
+    from_epoch_us,
+    to_epoch_us,
+)
+
+# Binary snapshot layout: MAGIC, a preamble with the header size and record
+# count, the JSON header, a table of fixed-width records, then a heap of
+# UTF-8 titles, each followed by its recurrence rule, if any. Record i lives
+# at a fixed offset, so the table can be paged through a read-only memory map.
+# Records decode to the same raw dicts as the JSON snapshot.
+MARKER = b"TASK\x00"
+VERSION = 3
+MAGIC = MARKER + bytes([VERSION])
+PREAMBLE = struct.Struct("<IQ")
+# id, done, priority code, created_at, due_date, title offset, title size,
+# recurrence rule size
+RECORD = struct.Struct("<qBBqqQIH")
+# Record layouts by version; version 2 predates recurrence rules
+RECORDS = {2: struct.Struct("<qBBqqQI"), VERSION: RECORD}
+
+
+def is_binary(path: Path) -> bool:
+    """Return whether a snapshot file starts with the binary format marker."""
+    with path.open("rb") as f:
+        return f.read(len(MARKER)) == MARKER
+
+
+def encode(header: dict, records: list[dict]) -> tuple[bytes, list[int]]:
+    """Serialize a snapshot and return it with the byte offset of each record."""
+    header_bytes = json.dumps(header).encode()
+    table_start = len(MAGIC) + PREAMBLE.size + len(header_bytes)
+    heap_start = table_start + RECORD.size * len(records)
+
+    table, titles, offsets = [], [], []
+    title_offset = heap_start
+    for i, record in enumerate(records):
+        title = record["title"].encode()
+        recur = (record.get("recur") or "").encode()
+        due_date = record["due_date"]
+        table.append(
+            RECORD.pack(
+                record["id"],
+                record["done"],
+                PRIORITY_CODES[record["priority"]],
+                to_epoch_us(datetime.fromisoformat(record["created_at"])),
+                to_epoch_us(datetime.fromisoformat(due_date)) if due_date else NO_DUE_DATE,
+                title_offset,
+                len(title),
+                len(recur),
+            )
+        )
+        titles.append(title + recur)
+        offsets.append(table_start + i * RECORD.size)
+        title_offset += len(title) + len(recur)
+
+    preamble = MAGIC + PREAMBLE.pack(len(header_bytes), len(records)) + header_bytes
+    return b"".join([preamble, *table, *titles]), offsets
+
+
+def _to_record(row: tuple, text: bytes) -> dict:
+    """Convert an unpacked record row and its heap text to a raw task record."""
+    task_id, done, priority, created_at, due_date, _, title_size = row[:7]
+    record = {
+        "id": task_id,
+        "title": str(text[:title_size], "utf-8"),
+        "done": bool(done),
+        "priority": PRIORITIES[priority].value,
+        "created_at": from_epoch_us(created_at).isoformat(),
+        "due_date": (
+            None if due_date == NO_DUE_DATE else from_epoch_us(due_date).isoformat()
+        ),
+    }
+    if len(row) > 7 and row[7]:
+        record["recur"] = str(text[title_size : title_size + row[7]], "utf-8")
+    return record
+
+
+def _text_size(row: tuple) -> int:
+    """Return the size of a record's title and recurrence rule in the heap."""
+    return row[6] + (row[7] if len(row) > 7 else 0)
+
+
+def _record_struct(buffer) -> struct.Struct:
+    """Return the record layout of a snapshot, rejecting unknown versions."""
+    layout = None
+    if buffer[: len(MARKER)] == MARKER:
+        layout = RECORDS.get(buffer[len(MARKER)])
+    if layout is None:
+        raise ValueError("Unsupported binary snapshot version")
+    return layout
+
+
+def _read_preamble(buffer) -> tuple[dict, int, int, struct.Struct]:
+    """Return the header, table start, record count and record layout."""
+    layout = _record_struct(buffer)
+    header_size, count = PREAMBLE.unpack_from(buffer, len(MAGIC))
+    header_start = len(MAGIC) + PREAMBLE.size
+    header = json.loads(bytes(buffer[header_start : header_start + header_size]))
+    return header, header_start + header_size, count, layout
+
+
+def read_header(path: Path) -> dict:
+    """Read the snapshot header without touching the records."""
+    with path.open("rb") as f:
+        return file_header(f)
+
+
+def file_header(f: BinaryIO) -> dict:
+    """Read the header of an open snapshot file."""
+    f.seek(0)
+    head = f.read(len(MAGIC) + PREAMBLE.size)
+    (header_size, _) = PREAMBLE.unpack_from(head, len(MAGIC))
+    header, *_ = _read_preamble(head + f.read(header_size))
+    return header
+
+
+def scan(
+    path: Path,
+    done: bool | None = None,
+    priority: str | None = None,
+    include: Container[int] = (),
+    header: dict | None = None,
+) -> Iterator[dict]:
+    """Page through the record table via mmap, decoding only matching records.
+
+    Records whose ID is in include are yielded regardless of the filters. If
+    header is given, it is filled in from the same file before the first record.
+    """
+    code = None if priority is None else PRIORITY_CODES[priority]
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        snapshot_header, table_start, count, layout = _read_preamble(mm)
+        if header is not None:
+            header.update(snapshot_header)
+        view = memoryview(mm)
+        table = view[table_start : table_start + count * layout.size]
+        rows = layout.iter_unpack(table)
+        try:
+            for row in rows:
+                if row[0] not in include:
+                    if done is not None and row[1] != done:
+                        continue
+                    if code is not None and row[2] != code:
+                        continue
+                yield _to_record(row, view[row[5] : row[5] + _text_size(row)])
+        finally:
+            # The map can only be closed once no views into it remain
+            del rows
+            table.release()
+            view.release()
+
+
+def count(path: Path, done: bool | None = None, priority: str | None = None) -> int:
+    """Count records matching the filters without decoding any of them."""
+    code = None if priority is None else PRIORITY_CODES[priority]
+    matches = 0
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        _, table_start, total, layout = _read_preamble(mm)
+        if done is None and code is None:
+            return total
+        with memoryview(mm) as view, view[
+            table_start : table_start + total * layout.size
+        ] as table:
+            for row in layout.iter_unpack(table):
+                if (done is None or row[1] == done) and (code is None or row[2] == code):
+                    matches += 1
+    return matches
+
+
+def iter_records(path: Path, header: dict | None = None) -> Iterator[dict]:
+    """Stream every raw record from a binary snapshot."""
+    return scan(path, header=header)
+
+
+def read_records(path: Path, offsets: Iterable[int]) -> list[dict]:
+    """Read the records at the given byte offsets."""
+    with path.open("rb") as f:
+        return file_records(f, offsets)
+
+
+def file_records(f: BinaryIO, offsets: Iterable[int]) -> list[dict]:
+    """Read the records at the given byte offsets of an open snapshot file."""
+    f.seek(0)
+    layout = _record_struct(f.read(len(MAGIC)))
+    records = []
+    for offset in offsets:
+        f.seek(offset)
+        row = layout.unpack(f.read(layout.size))
+        f.seek(row[5])
+        records.append(_to_record(row, f.read(_text_size(row))))
+    return records
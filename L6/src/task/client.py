@@ -0,0 +1,259 @@
+"""Storage calls that go through the task daemon when one is running.
+
+Each function talks to the daemon over its Unix socket if it is up and falls
+back to task.storage otherwise, so commands work the same either way.
+"""
+
+import json
+import os
+from collections.abc import Iterator
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+
+from task import storage
+from task.models import Priority, Task
+
+# Exceptions the daemon reports back, re-raised on the client side
+ERRORS = {
+    "KeyError": KeyError,
+    "ValueError": ValueError,
+    "ConflictError": storage.ConflictError,
+}
+
+
+def socket_path() -> Path:
+    """Return the path of the daemon socket next to the snapshot."""
+    return storage.STORAGE_PATH.with_suffix(".sock")
+
+
+def _connect():
+    """Connect to the daemon, or return None if it isn't running."""
+    path = socket_path()
+    if not path.exists():
+        return None
+
+    # Only paid for when a daemon may be running
+    import socket
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()  # Stale socket left behind by a daemon that died
+        return None
+    return sock
+
+
+def _stream(sock, method: str, **params) -> Iterator:
+    """Send a request and yield its result followed by any streamed records."""
+    with sock, sock.makefile("rwb") as stream:
+        stream.write(json.dumps({"method": method, **params}).encode() + b"\n")
+        stream.flush()
+
+        head = json.loads(stream.readline())
+        if "error" in head:
+            raise ERRORS.get(head["error"], RuntimeError)(*head["args"])
+        yield head["result"]
+        for line in stream:
+            yield json.loads(line)
+
+
+def _call(sock, method: str, **params):
+    """Send a request and return its result."""
+    return next(_stream(sock, method, **params))
+
+
+def request(method: str, **params):
+    """Send a request to the daemon, returning None if it isn't running.
+
+    Requests made for their side effect return a count, never None.
+    """
+    sock = _connect()
+    return None if sock is None else _call(sock, method, **params)
+
+
+def add_tasks(tasks: list[Task]) -> None:
+    """Add tasks in a single transaction, assigning their IDs."""
+    sock = _connect()
+    if sock is None:
+        return storage.add_tasks(tasks)
+
+    records = [storage.task_to_dict(task) for task in tasks]
+    for task, task_id in zip(tasks, _call(sock, "add", records=records)):
+        task.id = task_id
+
+
+def find_tasks(task_ids: list[int]) -> list[Task]:
+    """Get tasks by their IDs, raising KeyError with every missing ID."""
+    sock = _connect()
+    if sock is None:
+        return storage.find_tasks(task_ids)
+    return [storage.dict_to_task(r) for r in _call(sock, "find", ids=task_ids)]
+
+
+def complete_tasks(task_ids: list[int]) -> list[Task]:
+    """Mark tasks as done in a single transaction and return them."""
+    sock = _connect()
+    if sock is None:
+        return storage.complete_tasks(task_ids)
+    return [storage.dict_to_task(r) for r in _call(sock, "done", ids=task_ids)]
+
+
+def delete_tasks(task_ids: list[int]) -> list[Task]:
+    """Delete tasks in a single transaction and return them."""
+    sock = _connect()
+    if sock is None:
+        return storage.delete_tasks(task_ids)
+    return [storage.dict_to_task(r) for r in _call(sock, "delete", ids=task_ids)]
+
+
+def iter_tasks(
+    done: bool | None = None,
+    priority: Priority | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+    sort: list[str] | None = None,
+    archived: bool = False,
+) -> Iterator[Task]:
+    """Stream tasks matching the filters."""
+    sock = _connect()
+    if sock is None:
+        return storage.iter_tasks(
+            done=done,
+            priority=priority,
+            offset=offset,
+            limit=limit,
+            sort=sort,
+            archived=archived,
+        )
+
+    value = priority.value if priority else None
+    records = _stream(
+        sock,
+        "list",
+        done=done,
+        priority=value,
+        offset=offset,
+        limit=limit,
+        sort=sort,
+        archived=archived,
+    )
+    next(records)  # Raise any error before the first record is needed
+    return map(storage.dict_to_task, records)
+
+
+def count_tasks(
+    done: bool | None = None,
+    priority: Priority | None = None,
+    archived: bool = False,
+) -> int:
+    """Count tasks matching the filters."""
+    sock = _connect()
+    if sock is None:
+        return storage.count_tasks(done=done, priority=priority, archived=archived)
+
+    value = priority.value if priority else None
+    return _call(sock, "count", done=done, priority=value, archived=archived)
+
+
+def _read_list(
+    path: Path,
+    done: bool | None = None,
+    priority: Priority | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+    sort: list[str] | None = None,
+    archived: bool = False,
+) -> tuple[list[Task], int, int]:
+    """Read one list's matching tasks with their total and done counts."""
+    previous, storage.STORAGE_PATH = storage.STORAGE_PATH, path
+    try:
+        tasks = list(
+            iter_tasks(
+                done=done,
+                priority=priority,
+                offset=offset,
+                limit=limit,
+                sort=sort,
+                archived=archived,
+            )
+        )
+        total = count_tasks(done=done, priority=priority, archived=archived)
+        if done is None:
+            done_count = count_tasks(done=True, priority=priority, archived=archived)
+        else:
+            done_count = total if done else 0
+    finally:
+        storage.STORAGE_PATH = previous
+    return tasks, total, done_count
+
+
+def read_lists(
+    names: list[str], **filters
+) -> Iterator[tuple[str, list[Task], int, int]]:
+    """Yield each list's matching tasks and counts, reading lists in parallel.
+
+    Lists are read by a pool of processes, one list per task, and yielded in
+    order as soon as each is ready. Takes the filters of iter_tasks.
+    """
+    paths = [storage.list_path(name) for name in names]
+    if len(paths) == 1:
+        yield names[0], *_read_list(paths[0], **filters)
+        return
+
+    # Only paid for when there are several lists to read
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(min(len(paths), os.cpu_count() or 1)) as pool:
+        results = pool.map(partial(_read_list, **filters), paths)
+        for name, result in zip(names, results):
+            yield name, *result
+
+
+def due_tasks(end: datetime, start: datetime | None = None) -> list[Task]:
+    """Return pending tasks due in [start, end), soonest first."""
+    sock = _connect()
+    if sock is None:
+        return storage.due_tasks(end, start)
+
+    records = _call(
+        sock, "due", end=end.isoformat(), start=start.isoformat() if start else None
+    )
+    return [storage.dict_to_task(record) for record in records]
+
+
+def search_tasks(
+    query: str, done: bool | None = None, limit: int | None = None
+) -> list[Task]:
+    """Return tasks whose titles match every query term, best first."""
+    sock = _connect()
+    if sock is None:
+        return storage.search_tasks(query, done=done, limit=limit)
+
+    records = _call(sock, "search", query=query, done=done, limit=limit)
+    return [storage.dict_to_task(record) for record in records]
+
+
+def undo() -> str | None:
+    """Reverse the last change and return its summary, None if there is none."""
+    sock = _connect()
+    if sock is None:
+        return storage.undo()
+    return _call(sock, "undo")
+
+
+def redo() -> str | None:
+    """Repeat the last undone change and return its summary, if any."""
+    sock = _connect()
+    if sock is None:
+        return storage.redo()
+    return _call(sock, "redo")
+
+
+def task_counts() -> dict[str, dict[str, int]]:
+    """Return pending/done counts per priority."""
+    sock = _connect()
+    if sock is None:
+        return storage.task_counts()
+    return _call(sock, "counts")
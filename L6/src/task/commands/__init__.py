@@ -1,12 +1,120 @@
+import time
+from pathlib import Path
+from typing import Annotated
+
 import typer
+from typer.core import TyperCommand, TyperGroup
+
+from task import profiling
+
+# Command name -> (module, help). A command's module, and whatever it imports,
+# is only loaded when that command runs.
+COMMANDS = {
+    "add": ("task.commands.add", "Add a new task."),
+    "archive": (
+        "task.commands.archive",
+        "Move old completed tasks to the compressed archive.",
+    ),
+    "clear": ("task.commands.clear", "Delete tasks permanently."),
+    "daemon": (
+        "task.commands.daemon",
+        "Run a background daemon that keeps tasks in memory.",
+    ),
+    "done": ("task.commands.done", "Mark tasks as completed."),
+    "due": ("task.commands.due", "List pending tasks due soon."),
+    "export": (
+        "task.commands.export",
+        "Export tasks or convert the task store to another format.",
+    ),
+    "import": (
+        "task.commands.import_",
+        "Import tasks from a JSON Lines or CSV file.",
+    ),
+    "list": ("task.commands.list", "List tasks."),
+    "migrate": (
+        "task.commands.migrate",
+        "Import tasks from tasks.json into the SQLite store.",
+    ),
+    "overdue": ("task.commands.overdue", "List pending tasks past their due date."),
+    "redo": ("task.commands.redo", "Redo the last undone change."),
+    "search": ("task.commands.search", "Search task titles."),
+    "stats": ("task.commands.stats", "Show task counts by priority and status."),
+    "undo": ("task.commands.undo", "Undo the last add, done or delete."),
+}
+
+
+class LazyGroup(TyperGroup):
+    """Command group that imports each command only when it is invoked.
+
+    Help and completion are served from placeholders built from COMMANDS.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        for name, (_, help_text) in COMMANDS.items():
+            self.add_command(TyperCommand(name, help=help_text))
+
+    def resolve_command(self, ctx, args):
+        name, command, args = super().resolve_command(ctx, args)
+        if name in COMMANDS:
+            # __import__ rather than importlib, so -X importtime reports it
+            module = __import__(COMMANDS[name][0], fromlist=["app"])
+            command = typer.main.get_command(module.app)
+            # Startup: from loading the CLI to having the command ready
+            profiling.add("import", time.perf_counter() - profiling.START)
+        return name, command, args
+
+
+app = typer.Typer(cls=LazyGroup, no_args_is_help=True)
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    task_list: Annotated[
+        str | None,
+        typer.Option(
+            "--list",
+            envvar="TASK_LIST",
+            help="use the task list NAME instead of the default list",
+        ),
+    ] = None,
+    profile: Annotated[
+        bool,
+        typer.Option(
+            "--profile", envvar="TASK_PROFILE", help="print the time spent per phase"
+        ),
+    ] = False,
+    profile_out: Annotated[
+        Path | None,
+        typer.Option(
+            "--profile-out",
+            envvar="TASK_PROFILE_OUT",
+            help="also write cProfile stats to FILE, for pstats or snakeviz",
+        ),
+    ] = None,
+) -> None:
+    """Task manager CLI."""
+    if task_list is not None:
+        from task import storage
 
-from .add import app as add_app
-from .done import app as done_app
-from .list import app as list_app
+        try:
+            storage.use_list(task_list)
+        except ValueError:
+            from task import display
+            from task.constants import EXIT_INVALID_INPUT
 
-app = typer.Typer(help="Task manager CLI.", no_args_is_help=True)
+            display.error(
+                f"Invalid list name: {task_list}. Use letters, digits, - and _"
+            )
+            raise typer.Exit(EXIT_INVALID_INPUT)
+    if profile_out is not None:
+        import cProfile
 
-# Single commands - flattens to top level
-app.add_typer(add_app)
-app.add_typer(done_app)
-app.add_typer(list_app)
+        profiler = cProfile.Profile()
+        ctx.call_on_close(lambda: profiler.dump_stats(profile_out))
+        ctx.call_on_close(profiler.disable)
+        profiler.enable()
+    if profile or profile_out is not None:
+        profiling.enable()
+        ctx.call_on_close(profiling.report)
@@ -1,31 +1,59 @@
+import time
 from datetime import datetime
 from typing import Annotated
 
 import typer
 
-from task import display
+from task import display, recurrence
+from task.client import add_tasks
 from task.constants import EXIT_INVALID_INPUT
 from task.models import Priority, Task
-from task.storage import add_task
 
 app = typer.Typer()
 
 
 @app.command()
 def add(
-    title: Annotated[str, typer.Argument(help="task description")],
+    title: Annotated[str | None, typer.Argument(help="task description")] = None,
     priority: Annotated[
         str, typer.Option("--priority", "-p", help="priority level")
     ] = "low",
     due: Annotated[
         str | None, typer.Option("--due", "-d", help="due date (YYYY-MM-DD)")
     ] = None,
+    every: Annotated[
+        str | None,
+        typer.Option(
+            "--every", "-e", help="repeat, e.g. daily, weekly, 3d or mon,thu"
+        ),
+    ] = None,
+    from_file: Annotated[
+        typer.FileText | None,
+        typer.Option(
+            "--from-file", "-f", help="add one task per line ('-' for stdin)"
+        ),
+    ] = None,
 ) -> None:
     """Add a new task."""
-    # Validate title
-    if not title.strip():
-        display.error("Title cannot be empty")
+    # Collect titles from the argument or the file
+    if title is not None and from_file is not None:
+        display.error("Use either a title or --from-file, not both")
         raise typer.Exit(EXIT_INVALID_INPUT)
+    if from_file is not None:
+        titles = [line.strip() for line in from_file if line.strip()]
+    elif title is not None:
+        # Validate title
+        if not title.strip():
+            display.error("Title cannot be empty")
+            raise typer.Exit(EXIT_INVALID_INPUT)
+        titles = [title.strip()]
+    else:
+        display.error("Provide a title or --from-file")
+        raise typer.Exit(EXIT_INVALID_INPUT)
+
+    if not titles:
+        display.warning("No tasks to add")
+        return
 
     # Validate and parse priority
     try:
@@ -43,12 +71,31 @@ def add(
             display.error(f"Invalid date format: {due}. Use YYYY-MM-DD")
             raise typer.Exit(EXIT_INVALID_INPUT)
 
-    # Create and save task
-    task = Task(
-        title=title.strip(),
-        priority=task_priority,
-        due_date=due_date,
-    )
-    add_task(task)
+    # Recurring tasks start on their first occurrence, from today by default
+    rule = None
+    if every:
+        try:
+            rule = recurrence.parse(every)
+        except ValueError:
+            display.error(
+                f"Invalid recurrence: {every}. "
+                "Use daily, weekly, monthly, yearly, e.g. 3d or mon,thu"
+            )
+            raise typer.Exit(EXIT_INVALID_INPUT)
+        today = datetime.combine(datetime.now().date(), datetime.min.time())
+        due_date = recurrence.first(rule, due_date or today)
+        rule = recurrence.anchor(rule, due_date)
+
+    # Create and save all tasks in one transaction
+    started = time.perf_counter()
+    tasks = [
+        Task(title=line, priority=task_priority, due_date=due_date, recur=rule)
+        for line in titles
+    ]
+    add_tasks(tasks)
 
-    display.success(f"Added '{task.title}'")
+    if from_file is None:
+        display.success(f"Added '{tasks[0].title}'")
+    else:
+        display.success(f"Added {len(tasks)} tasks")
+        display.throughput(len(tasks), time.perf_counter() - started)
@@ -0,0 +1,41 @@
+from datetime import timedelta
+from typing import Annotated
+
+import typer
+
+from task import display
+from task.client import request
+from task.constants import EXIT_INVALID_INPUT
+from task.ranges import parse_days
+from task.storage import ARCHIVE_AFTER_DAYS, archive_tasks
+
+app = typer.Typer()
+
+
+@app.command()
+def archive(
+    older_than: Annotated[
+        str,
+        typer.Option("--older-than", help="archive tasks created before, e.g. 30d"),
+    ] = f"{ARCHIVE_AFTER_DAYS}d",
+) -> None:
+    """Move old completed tasks to the compressed archive."""
+    try:
+        days = parse_days(older_than)
+    except ValueError:
+        display.error(f"Invalid duration: {older_than}. Use e.g. 30d or 4w")
+        raise typer.Exit(EXIT_INVALID_INPUT)
+
+    # Let a running daemon write out buffered changes first
+    request("flush")
+
+    try:
+        archived = archive_tasks(timedelta(days=days))
+    except ValueError as e:
+        display.error(str(e))
+        raise typer.Exit(EXIT_INVALID_INPUT)
+
+    if not archived:
+        display.info(f"No completed tasks older than {older_than}")
+        return
+    display.success(f"Archived {archived} tasks")
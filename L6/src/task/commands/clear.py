@@ -0,0 +1,67 @@
+import time
+from typing import Annotated
+
+import typer
+
+from task import display
+from task.client import delete_tasks, find_tasks
+from task.constants import EXIT_INVALID_INPUT
+from task.ranges import parse_ids
+
+app = typer.Typer()
+
+
+@app.command()
+def clear(
+    task_id: Annotated[int | None, typer.Argument(help="task ID to delete")] = None,
+    ids: Annotated[
+        str | None,
+        typer.Option("--ids", help="task IDs or ranges to delete (e.g. 3,7,9-40)"),
+    ] = None,
+    force: Annotated[
+        bool, typer.Option("--force", help="skip confirmation prompt")
+    ] = False,
+) -> None:
+    """Delete tasks permanently."""
+    # Collect task IDs
+    if (task_id is None) == (ids is None):
+        display.error("Provide a task ID or --ids")
+        raise typer.Exit(EXIT_INVALID_INPUT)
+    try:
+        task_ids = [task_id] if ids is None else parse_ids([ids])
+    except ValueError as e:
+        display.error(str(e))
+        raise typer.Exit(EXIT_INVALID_INPUT)
+
+    # Confirm deletion
+    if not force:
+        try:
+            tasks = find_tasks(task_ids)
+        except KeyError as e:
+            _not_found(e)
+        prompt = (
+            f"Delete '{tasks[0].title}'?"
+            if len(tasks) == 1
+            else f"Delete {len(tasks)} tasks?"
+        )
+        if not typer.confirm(prompt, default=True):
+            display.warning("Cancelled")
+            raise typer.Abort()
+
+    started = time.perf_counter()
+    try:
+        tasks = delete_tasks(task_ids)
+    except KeyError as e:
+        _not_found(e)
+
+    if ids is None:
+        display.success(f"Deleted '{tasks[0].title}'")
+    else:
+        display.success(f"Deleted {len(tasks)} tasks")
+        display.throughput(len(tasks), time.perf_counter() - started)
+
+
+def _not_found(error: KeyError) -> None:
+    """Report missing task IDs and exit."""
+    display.not_found(error.args)
+    raise typer.Exit(EXIT_INVALID_INPUT)
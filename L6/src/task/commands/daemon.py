@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+import time
+
+import typer
+
+from task import display, storage
+from task.client import request, socket_path
+from task.constants import EXIT_ERROR
+
+app = typer.Typer(
+    name="daemon", help="Run a background daemon that keeps tasks in memory."
+)
+
+# Seconds to wait for a newly started daemon to accept connections
+START_TIMEOUT = 5.0
+
+
+@app.command()
+def start() -> None:
+    """Start the daemon in the background."""
+    if request("status") is not None:
+        display.warning("Daemon is already running")
+        return
+
+    # The daemon serves the list this command was pointed at
+    subprocess.Popen(
+        [sys.executable, "-m", "task.daemon"],
+        env={**os.environ, "TASK_LIST": storage.current_list()},
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + START_TIMEOUT
+    while (status := request("status")) is None:
+        if time.monotonic() > deadline:
+            display.error(f"Daemon did not start listening on {socket_path()}")
+            raise typer.Exit(EXIT_ERROR)
+        time.sleep(0.05)
+
+    display.success(f"Daemon started (pid {status['pid']})")
+
+
+@app.command()
+def stop() -> None:
+    """Flush pending changes and stop the daemon."""
+    if request("stop") is None:
+        display.warning("Daemon is not running")
+        return
+    display.success("Daemon stopped")
+
+
+@app.command()
+def status() -> None:
+    """Show whether the daemon is running."""
+    status = request("status")
+    if status is None:
+        display.info("Daemon is not running")
+        return
+    display.info(
+        f"Daemon running (pid {status['pid']}): "
+        f"{status['tasks']} tasks, {status['pending']} changes pending"
+    )
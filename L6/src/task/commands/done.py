@@ -1,33 +1,40 @@
+import time
 from typing import Annotated
 
 import typer
 
 from task import display
-from task.constants import EXIT_ERROR, EXIT_INVALID_INPUT
-from task.storage import load_tasks, save_tasks
+from task.client import complete_tasks
+from task.constants import EXIT_INVALID_INPUT
+from task.ranges import parse_ids
 
 app = typer.Typer()
 
 
 @app.command()
 def done(
-    task_id: Annotated[int, typer.Argument(help="task ID to mark as completed")],
+    task_ids: Annotated[
+        list[str], typer.Argument(help="task IDs or ranges to complete (e.g. 3 7 9-40)")
+    ],
 ) -> None:
-    """Mark a task as completed."""
-    tasks = load_tasks()
-
-    # Validate task ID (1-indexed)
-    if task_id < 1:
-        display.error("Task ID must be positive")
+    """Mark tasks as completed."""
+    # Validate task IDs
+    try:
+        ids = parse_ids(task_ids)
+    except ValueError as e:
+        display.error(str(e))
         raise typer.Exit(EXIT_INVALID_INPUT)
 
-    if task_id > len(tasks):
-        display.error(f"Task {task_id} not found")
+    # Mark tasks as done in one transaction
+    started = time.perf_counter()
+    try:
+        tasks = complete_tasks(ids)
+    except KeyError as e:
+        display.not_found(e.args)
         raise typer.Exit(EXIT_INVALID_INPUT)
 
-    # Mark task as done
-    task = tasks[task_id - 1]
-    task.done = True
-    save_tasks(tasks)
-
-    display.success(f"Completed: {task.title}")
+    if len(tasks) == 1:
+        display.success(f"Completed: {tasks[0].title}")
+    else:
+        display.success(f"Completed {len(tasks)} tasks")
+        display.throughput(len(tasks), time.perf_counter() - started)
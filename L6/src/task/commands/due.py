@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta
+from typing import Annotated
+
+import typer
+
+from task import display
+from task.client import due_tasks
+from task.constants import EXIT_INVALID_INPUT
+from task.ranges import parse_days
+
+app = typer.Typer()
+
+
+@app.command()
+def due(
+    within: Annotated[
+        str, typer.Option("--within", "-w", help="look ahead, e.g. 7d or 2w")
+    ] = "7d",
+) -> None:
+    """List pending tasks due soon."""
+    try:
+        days = parse_days(within)
+    except ValueError:
+        display.error(f"Invalid duration: {within}. Use e.g. 7d or 2w")
+        raise typer.Exit(EXIT_INVALID_INPUT)
+
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    # Due dates are whole days, so include everything due on the last day
+    tasks = due_tasks(today + timedelta(days=days + 1), start=today)
+
+    if not tasks:
+        display.warning(f"No tasks due within {within}")
+        return
+
+    display.table(tasks)
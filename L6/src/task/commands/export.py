@@ -0,0 +1,94 @@
+import sys
+import time
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from task import display, transfer
+from task.client import request
+from task.constants import EXIT_INVALID_INPUT
+from task.storage import (
+    SNAPSHOT_FORMATS,
+    convert_store,
+    export_snapshot,
+    iter_records,
+)
+
+app = typer.Typer()
+
+FORMATS = SNAPSHOT_FORMATS + transfer.FORMATS
+
+# Records exported between progress updates
+PROGRESS_EVERY = 10_000
+
+
+def _progress(
+    records: Iterable[dict], update: Callable[[str], None]
+) -> Iterator[dict]:
+    """Pass records through, reporting the running count now and then."""
+    for count, record in enumerate(records, start=1):
+        if count % PROGRESS_EVERY == 0:
+            update(f"Exported {count} tasks...")
+        yield record
+
+
+@app.command()
+def export(
+    fmt: Annotated[
+        str,
+        typer.Option("--format", "-f", help="format (json, binary, jsonl, csv)"),
+    ] = "json",
+    output: Annotated[
+        Path | None, typer.Option("--output", "-o", help="file to write")
+    ] = None,
+    in_place: Annotated[
+        bool, typer.Option("--in-place", help="convert the task store itself")
+    ] = False,
+) -> None:
+    """Export tasks or convert the task store to another format."""
+    # Validate format
+    fmt = fmt.lower()
+    if fmt not in FORMATS:
+        display.error(f"Invalid format: {fmt}. Use {', '.join(FORMATS)}")
+        raise typer.Exit(EXIT_INVALID_INPUT)
+    if in_place and fmt not in SNAPSHOT_FORMATS:
+        display.error("Only json and binary stores can be converted in place")
+        raise typer.Exit(EXIT_INVALID_INPUT)
+
+    # Let a running daemon write out buffered changes first
+    request("flush")
+
+    if in_place:
+        convert_store(fmt)
+        display.success(f"Converted task store to {fmt}")
+        return
+
+    if fmt in transfer.FORMATS:
+        # Stream one record at a time, archived tasks included
+        records = iter_records(archived=True)
+        if output is None:
+            transfer.write(records, fmt, sys.stdout)
+            return
+
+        started = time.perf_counter()
+        with (
+            output.open("w", newline="") as out,
+            display.status("Exporting tasks...") as update,
+        ):
+            count = transfer.write(_progress(records, update), fmt, out)
+        display.success(f"Exported {count} tasks to {output}")
+        display.throughput(count, time.perf_counter() - started)
+        return
+
+    content = export_snapshot(fmt)
+    if output is None:
+        if fmt == "binary":
+            display.error("Binary export needs --output")
+            raise typer.Exit(EXIT_INVALID_INPUT)
+        typer.echo(content.decode(), nl=False)
+        return
+
+    output.write_bytes(content)
+    display.success(f"Exported tasks to {output}")
@@ -0,0 +1,51 @@
+import time
+from typing import Annotated
+
+import typer
+
+from task import display, transfer
+from task.client import request
+from task.constants import EXIT_INVALID_INPUT
+from task.storage import import_tasks
+
+app = typer.Typer()
+
+
+@app.command("import")
+def import_(
+    source: Annotated[
+        typer.FileText, typer.Argument(help="file to import ('-' for stdin)")
+    ],
+    fmt: Annotated[
+        str | None,
+        typer.Option(
+            "--format", "-f", help="jsonl or csv (default: from the file name)"
+        ),
+    ] = None,
+) -> None:
+    """Import tasks from a JSON Lines or CSV file."""
+    # Validate format
+    fmt = fmt.lower() if fmt else transfer.format_for(source.name)
+    if fmt not in transfer.FORMATS:
+        display.error(f"Invalid format: {fmt}. Use jsonl or csv")
+        raise typer.Exit(EXIT_INVALID_INPUT)
+
+    # Let a running daemon write out buffered changes first
+    request("flush")
+
+    # Decode and store one batch at a time
+    started = time.perf_counter()
+    count = 0
+    try:
+        with display.status("Importing tasks...") as update:
+            for count in import_tasks(transfer.read(source, fmt)):
+                update(f"Imported {count} tasks...")
+    except ValueError as e:
+        display.error(f"{e}. Imported {count} tasks before it")
+        raise typer.Exit(EXIT_INVALID_INPUT)
+
+    if not count:
+        display.warning("No tasks to import")
+        return
+    display.success(f"Imported {count} tasks")
+    display.throughput(count, time.perf_counter() - started)
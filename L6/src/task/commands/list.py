@@ -1,14 +1,22 @@
+from itertools import chain
 from typing import Annotated
 
 import typer
 
 from task import display
+from task.client import count_tasks, iter_tasks, read_lists
 from task.constants import EXIT_INVALID_INPUT
 from task.models import Priority
-from task.storage import get_tasks
+from task.storage import SORT_KEYS, list_names
 
 app = typer.Typer()
 
+# Tasks per page for --page when no --limit is given
+PAGE_SIZE = 50
+
+# Sort order for --top when no --sort is given
+TOP_SORT = "priority,due"
+
 
 @app.command()
 def list(
@@ -19,8 +27,71 @@ def list(
     priority: Annotated[
         str | None, typer.Option("--priority", "-p", help="filter by priority")
     ] = None,
+    limit: Annotated[
+        int | None, typer.Option("--limit", "-n", help="show at most N tasks")
+    ] = None,
+    offset: Annotated[
+        int | None, typer.Option("--offset", help="skip the first N tasks")
+    ] = None,
+    page: Annotated[
+        int | None,
+        typer.Option("--page", help=f"show page N ({PAGE_SIZE} tasks or --limit)"),
+    ] = None,
+    sort: Annotated[
+        str | None,
+        typer.Option("--sort", "-s", help="sort by keys, e.g. priority,due"),
+    ] = None,
+    top: Annotated[
+        int | None,
+        typer.Option("--top", help=f"show the first N by --sort (default {TOP_SORT})"),
+    ] = None,
+    pager: Annotated[
+        bool, typer.Option("--pager", help="page through tasks a screen at a time")
+    ] = False,
+    all_lists: Annotated[
+        bool, typer.Option("--all-lists", help="show every task list in turn")
+    ] = False,
 ) -> None:
     """List tasks."""
+    if limit is not None and limit < 1:
+        display.error("Limit must be positive")
+        raise typer.Exit(EXIT_INVALID_INPUT)
+    if offset is not None and offset < 0:
+        display.error("Offset cannot be negative")
+        raise typer.Exit(EXIT_INVALID_INPUT)
+    if page is not None and page < 1:
+        display.error("Page must be positive")
+        raise typer.Exit(EXIT_INVALID_INPUT)
+    if page is not None and offset is not None:
+        display.error("Use either --offset or --page, not both")
+        raise typer.Exit(EXIT_INVALID_INPUT)
+    if top is not None and top < 1:
+        display.error("Top must be positive")
+        raise typer.Exit(EXIT_INVALID_INPUT)
+    if top is not None and limit is not None:
+        display.error("Use either --limit or --top, not both")
+        raise typer.Exit(EXIT_INVALID_INPUT)
+
+    # Parse sort keys
+    if top is not None:
+        limit = top
+        sort = sort or TOP_SORT
+    sort_keys = None
+    if sort:
+        sort_keys = [key.strip().lower() for key in sort.split(",")]
+        for key in sort_keys:
+            if key not in SORT_KEYS:
+                display.error(
+                    f"Invalid sort key: {key}. Use {', '.join(SORT_KEYS)}"
+                )
+                raise typer.Exit(EXIT_INVALID_INPUT)
+
+    # Work out which slice of the matching tasks to show
+    if page is not None:
+        limit = limit or PAGE_SIZE
+        offset = (page - 1) * limit
+    offset = offset or 0
+
     # Parse priority filter
     priority_filter = None
     if priority:
@@ -37,11 +108,55 @@ def list(
     elif not all_tasks:
         done_filter = False  # Default: show only pending
 
-    # Get filtered tasks
-    tasks = get_tasks(done=done_filter, priority=priority_filter)
+    # Completed tasks include those moved to the archive
+    archived = done_filter is not False
 
-    if not tasks:
+    if all_lists:
+        # Each list is read in parallel and shown with its own slice and summary
+        lists = read_lists(
+            list_names(),
+            done=done_filter,
+            priority=priority_filter,
+            offset=offset,
+            limit=limit,
+            sort=sort_keys,
+            archived=archived,
+        )
+        for name, tasks, total, done_count in lists:
+            display.info(f"\n[bold]{name}[/bold]")
+            if not tasks:
+                display.warning("No tasks found")
+                continue
+            shown = display.pages(tasks) if pager else display.table(tasks)
+            display.summary(total, done_count, offset=offset, shown=shown)
+        return
+
+    # Stream only the requested slice of the filtered tasks into the table
+    tasks = iter_tasks(
+        done=done_filter,
+        priority=priority_filter,
+        offset=offset,
+        limit=limit,
+        sort=sort_keys,
+        archived=archived,
+    )
+    first = next(tasks, None)
+
+    if first is None:
         display.warning("No tasks found")
         return
 
-    display.table(tasks)
+    tasks = chain([first], tasks)
+    shown = display.pages(tasks) if pager else display.table(tasks)
+
+    # Summary from storage counters rather than another pass over the tasks
+    total = count_tasks(
+        done=done_filter, priority=priority_filter, archived=archived
+    )
+    if done_filter is None:
+        done_count = count_tasks(
+            done=True, priority=priority_filter, archived=archived
+        )
+    else:
+        done_count = total if done_filter else 0
+    display.summary(total, done_count, offset=offset, shown=shown)
@@ -0,0 +1,30 @@
+from typing import Annotated
+
+import typer
+
+from task import display
+from task.client import request
+from task.constants import EXIT_ERROR
+from task.storage import migrate_to_sqlite
+
+app = typer.Typer()
+
+
+@app.command()
+def migrate(
+    force: Annotated[
+        bool, typer.Option("--force", help="overwrite an existing database")
+    ] = False,
+) -> None:
+    """Import tasks from tasks.json into the SQLite store."""
+    # Let a running daemon write out buffered changes first
+    request("flush")
+
+    try:
+        count = migrate_to_sqlite(force=force)
+    except FileExistsError as e:
+        display.error(f"{e}. Use --force to overwrite")
+        raise typer.Exit(EXIT_ERROR)
+
+    display.success(f"Imported {count} tasks")
+    display.info("Set TASK_STORAGE=sqlite to use the SQLite store")
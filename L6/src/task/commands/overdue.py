@@ -0,0 +1,21 @@
+from datetime import datetime
+
+import typer
+
+from task import display
+from task.client import due_tasks
+
+app = typer.Typer()
+
+
+@app.command()
+def overdue() -> None:
+    """List pending tasks past their due date."""
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    tasks = due_tasks(today)
+
+    if not tasks:
+        display.info("No overdue tasks")
+        return
+
+    display.table(tasks)
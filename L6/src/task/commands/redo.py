@@ -0,0 +1,16 @@
+import typer
+
+from task import display
+from task.client import redo as redo_change
+
+app = typer.Typer()
+
+
+@app.command()
+def redo() -> None:
+    """Redo the last undone change."""
+    summary = redo_change()
+    if summary is None:
+        display.warning("Nothing to redo")
+        return
+    display.success(f"Redid: {summary}")
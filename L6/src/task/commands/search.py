@@ -0,0 +1,38 @@
+from typing import Annotated
+
+import typer
+
+from task import display
+from task.client import search_tasks
+from task.constants import EXIT_INVALID_INPUT
+from task.search import query_terms
+
+app = typer.Typer()
+
+
+@app.command()
+def search(
+    terms: Annotated[list[str], typer.Argument(help="words or word prefixes")],
+    all_tasks: Annotated[
+        bool, typer.Option("--all", "-a", help="include completed")
+    ] = False,
+    limit: Annotated[
+        int, typer.Option("--limit", "-n", help="show at most N matches")
+    ] = 20,
+) -> None:
+    """Search task titles."""
+    query = " ".join(terms)
+    if not query_terms(query):
+        display.error("Search terms must contain letters or digits")
+        raise typer.Exit(EXIT_INVALID_INPUT)
+    if limit < 1:
+        display.error("Limit must be positive")
+        raise typer.Exit(EXIT_INVALID_INPUT)
+
+    tasks = search_tasks(query, done=None if all_tasks else False, limit=limit)
+
+    if not tasks:
+        display.warning(f"No tasks match '{query}'")
+        return
+
+    display.table(tasks)
@@ -0,0 +1,33 @@
+from typing import Annotated
+
+import typer
+
+from task import display
+from task.client import request, task_counts
+from task.storage import recount_tasks, repair_counts
+from task.storage import task_counts as stored_counts
+
+app = typer.Typer()
+
+
+@app.command()
+def stats(
+    check: Annotated[
+        bool,
+        typer.Option("--check", help="recount all tasks and repair stale counters"),
+    ] = False,
+) -> None:
+    """Show task counts by priority and status."""
+    if not check:
+        display.stats(task_counts())
+        return
+
+    # Compare the maintained counters with a full recount
+    request("flush")
+    counts = recount_tasks()
+    if stored_counts() == counts:
+        display.success("Counters match the stored tasks")
+    else:
+        repair_counts()
+        display.warning("Counters were out of date and have been rebuilt")
+    display.stats(counts)
@@ -0,0 +1,16 @@
+import typer
+
+from task import display
+from task.client import undo as undo_change
+
+app = typer.Typer()
+
+
+@app.command()
+def undo() -> None:
+    """Undo the last add, done or delete."""
+    summary = undo_change()
+    if summary is None:
+        display.warning("Nothing to undo")
+        return
+    display.success(f"Undid: {summary}")
@@ -0,0 +1,166 @@
+"""Background daemon serving the task store from memory over a Unix socket.
+
+Run with `task daemon start`, or `python -m task.daemon` in the foreground;
+either serves the task list named by TASK_LIST, or the default list.
+"""
+
+import json
+import os
+import signal
+import socket
+import time
+from collections.abc import Iterator
+from datetime import datetime
+
+from task import storage
+from task.client import socket_path
+from task.models import Priority
+from task.storage import MemoryStore
+
+# Seconds to buffer changes in memory before writing them to disk
+FLUSH_DELAY = 1.0
+
+# Seconds a client may take to send its request and read the reply
+CLIENT_TIMEOUT = 5.0
+
+
+def _priority(request: dict) -> Priority | None:
+    """Decode the priority filter of a request."""
+    return Priority(request["priority"]) if request["priority"] else None
+
+
+def _handle(store: MemoryStore, request: dict) -> Iterator:
+    """Run one request against the store, yielding its result then records."""
+    method = request["method"]
+    if method == "add":
+        yield store.add(request["records"])
+    elif method == "find":
+        yield store.find(request["ids"])
+    elif method == "done":
+        yield store.complete(request["ids"])
+    elif method == "delete":
+        yield store.delete(request["ids"])
+    elif method == "undo":
+        yield store.undo()
+    elif method == "redo":
+        yield store.redo()
+    elif method == "list":
+        yield None
+        yield from store.iter_records(
+            done=request["done"],
+            priority=_priority(request),
+            offset=request["offset"],
+            limit=request["limit"],
+            sort=request["sort"],
+            archived=request["archived"],
+        )
+    elif method == "count":
+        yield store.count(
+            done=request["done"],
+            priority=_priority(request),
+            archived=request["archived"],
+        )
+    elif method == "counts":
+        yield store.counts
+    elif method == "due":
+        start = request["start"]
+        yield store.due(
+            datetime.fromisoformat(request["end"]),
+            datetime.fromisoformat(start) if start else None,
+        )
+    elif method == "search":
+        yield store.search(
+            request["query"], done=request["done"], limit=request["limit"]
+        )
+    elif method in ("flush", "stop"):
+        flushed = len(store.pending)
+        store.flush()
+        yield flushed
+    elif method == "status":
+        yield {
+            "pid": os.getpid(),
+            "tasks": len(store.records),
+            "pending": len(store.pending),
+        }
+    else:
+        raise ValueError(f"Unknown daemon request: {method}")
+
+
+def _respond(store: MemoryStore, conn: socket.socket) -> str:
+    """Read one request from a client, answer it and return its method."""
+    with conn.makefile("rwb") as stream:
+        request = json.loads(stream.readline())
+        replies = _handle(store, request)
+        try:
+            store.refresh()
+            head = {"result": next(replies)}
+        except (KeyError, ValueError) as e:
+            head = {"error": type(e).__name__, "args": list(e.args)}
+            replies = iter(())
+        except Exception as e:
+            # A failed write, e.g. a ConflictError, fails this request only:
+            # the changes stay buffered and are retried on the next flush
+            head = {"error": type(e).__name__, "args": [str(e)]}
+            replies = iter(())
+
+        stream.write(json.dumps(head).encode() + b"\n")
+        for record in replies:
+            stream.write(json.dumps(record).encode() + b"\n")
+    return request["method"]
+
+
+def serve() -> None:
+    """Serve requests until a client sends stop, flushing changes write-behind."""
+    store = MemoryStore()
+    path = socket_path()
+    path.unlink(missing_ok=True)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen()
+    deadline = None
+    try:
+        while True:
+            server.settimeout(
+                None if deadline is None else max(deadline - time.monotonic(), 0)
+            )
+            try:
+                conn, _ = server.accept()
+            except TimeoutError:
+                try:
+                    store.flush()
+                    deadline = None
+                except Exception:
+                    deadline = time.monotonic() + FLUSH_DELAY  # Try again later
+                continue
+
+            with conn:
+                conn.settimeout(CLIENT_TIMEOUT)
+                try:
+                    method = _respond(store, conn)
+                except (OSError, json.JSONDecodeError):
+                    continue  # Client went away or sent garbage
+            if method == "stop" and not store.pending:
+                break  # Unless the flush failed, which was reported instead
+            if store.pending and deadline is None:
+                deadline = time.monotonic() + FLUSH_DELAY
+    finally:
+        store.flush()
+        server.close()
+        path.unlink(missing_ok=True)
+
+
+def _terminate(signum, frame) -> None:
+    """Turn SIGTERM into a clean exit so buffered changes are flushed."""
+    raise SystemExit(0)
+
+
+def main() -> None:
+    """Serve the task list named by TASK_LIST until stopped."""
+    storage.use_list(os.environ.get("TASK_LIST") or storage.DEFAULT_LIST)
+    signal.signal(signal.SIGTERM, _terminate)
+    serve()
+
+
+if __name__ == "__main__":
+    main()
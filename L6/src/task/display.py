@@ -1,9 +1,19 @@
-from rich.console import Console
-from rich.table import Table
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from functools import cache
+from itertools import islice
+from typing import TYPE_CHECKING
 
+import typer
+
+from task import profiling
 from task.models import Priority, Task
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# Lines around a page of rows: table borders and header, plus the prompt
+PAGE_CHROME_LINES = 6
 
 PRIORITY_COLORS = {
     Priority.HIGH: "red",
@@ -12,58 +22,160 @@ PRIORITY_COLORS = {
 }
 
 
+@cache
+def console() -> "Console":
+    """Create the shared console on first output; rich is slow to import."""
+    from rich.console import Console
+
+    return Console()
+
+
 def success(message: str) -> None:
     """Display a success message."""
-    console.print(f"[green]{message}[/green]")
+    console().print(f"[green]{message}[/green]")
 
 
 def error(message: str) -> None:
     """Display an error message."""
-    console.print(f"[red]{message}[/red]")
+    console().print(f"[red]{message}[/red]")
 
 
 def warning(message: str) -> None:
     """Display a warning message."""
-    console.print(f"[yellow]{message}[/yellow]")
+    console().print(f"[yellow]{message}[/yellow]")
 
 
 def info(message: str) -> None:
     """Display an info message."""
-    console.print(message)
+    console().print(message)
+
+
+def not_found(task_ids: Iterable[int], limit: int = 10) -> None:
+    """Display an error for missing task IDs, listing at most limit of them."""
+    task_ids = list(task_ids)
+    missing = ", ".join(map(str, task_ids[:limit]))
+    if len(task_ids) > limit:
+        missing += f" and {len(task_ids) - limit:,} more"
+    noun = "Task" if len(task_ids) == 1 else "Tasks"
+    error(f"{noun} {missing} not found")
+
+
+def throughput(count: int, seconds: float) -> None:
+    """Display how many tasks a batch processed and how fast."""
+    rate = count / seconds if seconds else float("inf")
+    info(f"  {count} tasks in {seconds:.2f}s ({rate:,.0f} tasks/s)")
+
+
+@contextmanager
+def status(message: str) -> Iterator[Callable[[str], None]]:
+    """Show a status line while a long batch runs, yielding its update function.
+
+    Only shown on a terminal, and cleared when the block ends.
+    """
+    with console().status(message) as live:
+        yield live.update
+
+
+def table(tasks: Iterable[Task]) -> int:
+    """Display tasks in a formatted table and return how many were shown."""
+    with profiling.span("render"):
+        return _table(tasks)
+
+
+def _due(task: Task) -> str:
+    """Format a task's due date, with its recurrence rule if it repeats."""
+    due = task.due_date.strftime("%b %d") if task.due_date else "-"
+    return f"{due} ({task.recur})" if task.recur else due
 
 
-def table(tasks: list[Task]) -> None:
-    """Display tasks in a formatted table."""
+def _table(tasks: Iterable[Task]) -> int:
+    """Build and print the table for table()."""
+    from rich.table import Table
+    from rich.text import Text
+
     tbl = Table()
-    tbl.add_column("#", style="dim", width=4)
+    # IDs are never reused, so the column grows with them instead of cropping
+    tbl.add_column("#", style="dim", min_width=4, no_wrap=True)
     tbl.add_column("Task")
     tbl.add_column("Priority")
     tbl.add_column("Due")
     tbl.add_column("Status", width=6)
 
-    for idx, task in enumerate(tasks, start=1):
-        priority_color = PRIORITY_COLORS[task.priority]
+    # Text cells skip rich's markup parser, which dominates on long lists
+    for task in tasks:
         style = "dim" if task.done else ""
-
-        due_str = "-"
-        if task.due_date:
-            due_str = task.due_date.strftime("%b %d")
-
-        status = "[green]done[/green]" if task.done else "[ ]"
-
         tbl.add_row(
-            str(idx),
-            f"[{style}]{task.title}[/{style}]" if style else task.title,
-            f"[{priority_color}]{task.priority.value}[/{priority_color}]",
-            due_str,
-            status,
+            str(task.id),
+            Text(task.title, style=style),
+            Text(task.priority.value, style=PRIORITY_COLORS[task.priority]),
+            _due(task),
+            Text("done", style="green") if task.done else Text("[ ]"),
             style=style,
         )
 
-    console.print(tbl)
+    console().print(tbl)
+    return tbl.row_count
+
+
+def pages(tasks: Iterable[Task], page_size: int | None = None) -> int:
+    """Display tasks one page-sized table at a time and return how many were shown.
+
+    Only the rows of pages actually displayed are built. On a terminal the
+    user is asked before each further page; otherwise pages are streamed.
+    """
+    out = console()
+    if page_size is None:
+        # Leave room for the table header, borders and the prompt
+        page_size = max(out.size.height - PAGE_CHROME_LINES, 5)
+
+    tasks = iter(tasks)
+    shown = 0
+    page = list(islice(tasks, page_size))
+    while page:
+        shown += table(page)
+        page = list(islice(tasks, page_size))
+        if page and out.is_interactive and not _more():
+            break
+    return shown
 
-    # Summary
-    total = len(tasks)
-    done_count = sum(1 for t in tasks if t.done)
-    pending_count = total - done_count
-    info(f"\n  {total} tasks ({pending_count} pending, {done_count} done)")
+
+def _more() -> bool:
+    """Wait for a key press and return whether to show another page."""
+    console().print("[dim]-- more: any key to continue, q to quit --[/dim]", end="")
+    key = typer.getchar()
+    console().print()
+    return key.lower() != "q"
+
+
+def stats(counts: dict[str, dict[str, int]]) -> None:
+    """Display pending/done counts per priority with totals."""
+    from rich.table import Table
+
+    tbl = Table()
+    tbl.add_column("Priority")
+    for column in ("Pending", "Done", "Total"):
+        tbl.add_column(column, justify="right")
+
+    pending = done = 0
+    for priority, color in PRIORITY_COLORS.items():
+        row = counts[priority.value]
+        pending += row["pending"]
+        done += row["done"]
+        tbl.add_row(
+            f"[{color}]{priority.value}[/{color}]",
+            str(row["pending"]),
+            str(row["done"]),
+            str(row["pending"] + row["done"]),
+        )
+    tbl.add_section()
+    tbl.add_row("all", str(pending), str(done), str(pending + done), style="bold")
+    console().print(tbl)
+
+
+def summary(total: int, done_count: int, offset: int = 0, shown: int = 0) -> None:
+    """Display task counts, noting which slice of them was shown."""
+    counts = f"{total} tasks ({total - done_count} pending, {done_count} done)"
+    if offset or shown < total:
+        info(f"\n  Showing {offset + 1}-{offset + shown} of {counts}")
+    else:
+        info(f"\n  {counts}")
@@ -0,0 +1,76 @@
+"""Bounded undo and redo stacks of storage operations.
+
+Each stack is a file of one entry per line, newest last, and each line starts
+with a fixed-width sequence number. Pushing appends a line and popping
+truncates the file before its last line, so neither depends on how much
+history there is. A stack is bounded by dropping its older half once it holds
+twice the retention limit, which keeps that cost amortized constant too.
+"""
+
+import json
+import mmap
+import os
+from pathlib import Path
+
+# Width of the sequence number that starts each entry, plus a space
+SEQ_WIDTH = 20
+
+
+def _line_starts(mm: mmap.mmap, count: int) -> list[int]:
+    """Return the offsets of up to count lines, counting back from the end."""
+    starts = []
+    end = len(mm) - 1  # Skip the newline ending the last line
+    while end > 0 and len(starts) < count:
+        start = mm.rfind(b"\n", 0, end) + 1
+        starts.append(start)
+        end = start - 1
+    return starts
+
+
+def _read_seq(mm: mmap.mmap, start: int) -> int:
+    """Read the sequence number of the line at start."""
+    return int(mm[start : start + SEQ_WIDTH])
+
+
+def push(path: Path, entry: dict, limit: int) -> None:
+    """Add an entry on top of the stack, keeping at least limit entries."""
+    seq, tail = 1, None
+    with path.open("a+b") as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                seq = _read_seq(mm, _line_starts(mm, 1)[0]) + 1
+                if seq - _read_seq(mm, 0) >= 2 * limit:
+                    # Keep the newest limit - 1 entries and the new one
+                    starts = _line_starts(mm, limit - 1)
+                    tail = mm[starts[-1] :] if starts else b""
+
+    line = b"%0*d " % (SEQ_WIDTH - 1, seq) + json.dumps(entry).encode() + b"\n"
+    if tail is None:
+        with path.open("ab") as f:
+            f.write(line)
+    else:
+        _replace(path, tail + line)
+
+
+def _replace(path: Path, content: bytes) -> None:
+    """Atomically replace a stack file with content."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+
+
+def pop(path: Path) -> dict | None:
+    """Remove and return the top entry, or None if the stack is empty."""
+    try:
+        f = path.open("r+b")
+    except FileNotFoundError:
+        return None
+
+    with f:
+        if not os.fstat(f.fileno()).st_size:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = _line_starts(mm, 1)[0]
+            entry = json.loads(mm[start + SEQ_WIDTH :])
+        f.truncate(start)
+    return entry
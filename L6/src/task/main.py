@@ -1,3 +1,5 @@
+# Imported first, so the profiler's startup phase includes loading typer
+from task import profiling  # noqa: F401
 from task.commands import app
 
 if __name__ == "__main__":
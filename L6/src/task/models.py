@@ -1,5 +1,8 @@
+import sys
+from array import array
+from collections.abc import Iterator
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 
 
@@ -9,10 +12,99 @@ class Priority(str, Enum):
     HIGH = "high"
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     title: str
     done: bool = False
     priority: Priority = Priority.LOW
     created_at: datetime = field(default_factory=datetime.now)
     due_date: datetime | None = None
+    id: int | None = None
+    recur: str | None = None
+
+
+EPOCH = datetime(1970, 1, 1)
+NO_DUE_DATE = -(2**63)
+
+PRIORITY_CODES = {priority.value: code for code, priority in enumerate(Priority)}
+PRIORITIES = list(Priority)
+
+
+def to_epoch_us(value: datetime) -> int:
+    """Convert a naive datetime to integer microseconds since the epoch."""
+    delta = value - EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def from_epoch_us(value: int) -> datetime:
+    """Convert microseconds since the epoch back to a naive datetime."""
+    return EPOCH + timedelta(microseconds=value)
+
+
+class TaskTable:
+    """Columnar task storage: parallel arrays instead of one object per task.
+
+    Tasks are only materialised as Task objects when indexed or iterated.
+    """
+
+    __slots__ = (
+        "ids",
+        "titles",
+        "done",
+        "priorities",
+        "created_at",
+        "due_dates",
+        "recur",
+    )
+
+    def __init__(self) -> None:
+        self.ids = array("q")
+        self.titles: list[str] = []
+        self.done = bytearray()
+        self.priorities = array("b")
+        self.created_at = array("q")
+        self.due_dates = array("q")
+        # Few tasks recur, so rules are kept by row index
+        self.recur: dict[int, str] = {}
+
+    def append(
+        self,
+        task_id: int,
+        title: str,
+        done: bool,
+        priority: str,
+        created_at: datetime,
+        due_date: datetime | None,
+        recur: str | None = None,
+    ) -> None:
+        """Append one task from its field values."""
+        if recur:
+            self.recur[len(self.ids)] = recur
+        self.ids.append(task_id)
+        self.titles.append(sys.intern(title))
+        self.done.append(done)
+        self.priorities.append(PRIORITY_CODES[priority])
+        self.created_at.append(to_epoch_us(created_at))
+        self.due_dates.append(to_epoch_us(due_date) if due_date else NO_DUE_DATE)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> Task:
+        due = self.due_dates[index]
+        return Task(
+            id=self.ids[index],
+            title=self.titles[index],
+            done=bool(self.done[index]),
+            priority=PRIORITIES[self.priorities[index]],
+            created_at=from_epoch_us(self.created_at[index]),
+            due_date=None if due == NO_DUE_DATE else from_epoch_us(due),
+            recur=self.recur.get(index),
+        )
+
+    def __iter__(self) -> Iterator[Task]:
+        return (self[i] for i in range(len(self)))
+
+    def done_count(self) -> int:
+        """Count completed tasks without materialising them."""
+        return self.done.count(1)
@@ -0,0 +1,100 @@
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+
+# Phase timings for --profile / TASK_PROFILE. Spans nest, and each phase is
+# charged only its own time: a span's children are subtracted from it. Lazy
+# pipelines are timed per stage with timed(), so reading, decoding, filtering
+# and building tasks are told apart even though they interleave. Everything
+# is a no-op until enable() is called.
+START = time.perf_counter()
+
+_enabled = False
+_totals: dict[str, float] = defaultdict(float)
+# Open spans: [name, start, time spent in child spans]
+_stack: list[list] = []
+
+
+def enable() -> None:
+    """Start recording spans."""
+    global _enabled
+    _enabled = True
+
+
+def enabled() -> bool:
+    """Return whether spans are being recorded."""
+    return _enabled
+
+
+def add(name: str, seconds: float) -> None:
+    """Charge time measured elsewhere to a phase."""
+    _totals[name] += seconds
+
+
+def _enter(name: str) -> None:
+    _stack.append([name, time.perf_counter(), 0.0])
+
+
+def _exit() -> None:
+    name, start, children = _stack.pop()
+    elapsed = time.perf_counter() - start
+    _totals[name] += elapsed - children
+    if _stack:
+        _stack[-1][2] += elapsed
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Charge the time spent in the block to a phase."""
+    if not _enabled:
+        yield
+        return
+
+    _enter(name)
+    try:
+        yield
+    finally:
+        _exit()
+
+
+def timed(name: str, items: Iterable) -> Iterable:
+    """Charge the time spent producing each item to a phase.
+
+    Returns items unchanged when profiling is off, so hot loops pay nothing.
+    """
+    if not _enabled:
+        return items
+    return _timed(name, iter(items))
+
+
+def _timed(name: str, items: Iterator) -> Iterator:
+    while True:
+        _enter(name)
+        try:
+            item = next(items)
+        except StopIteration:
+            return
+        finally:
+            _exit()
+        yield item
+
+
+def totals() -> dict[str, float]:
+    """Return seconds per phase, including untracked time as "other"."""
+    result = dict(_totals)
+    result["other"] = max(time.perf_counter() - START - sum(result.values()), 0.0)
+    return result
+
+
+def report() -> None:
+    """Print the time per phase to stderr."""
+    phases = totals()
+    total = sum(phases.values())
+    lines = ["", "Profile:"]
+    for name, seconds in sorted(phases.items(), key=lambda item: -item[1]):
+        share = seconds / total * 100 if total else 0.0
+        lines.append(f"  {name:<10} {seconds * 1000:>9.1f} ms  {share:>5.1f}%")
+    lines.append(f"  {'total':<10} {total * 1000:>9.1f} ms")
+    print("\n".join(lines), file=sys.stderr)
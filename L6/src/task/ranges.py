@@ -0,0 +1,46 @@
+import re
+
+DURATION = re.compile(r"(\d+)([dw]?)")
+ID_RANGE = re.compile(r"(\d+)(?:-(\d+))?")
+# Most IDs one command accepts, so a typo like 1-2000000 fails fast
+MAX_IDS = 100_000
+
+
+def parse_ids(specs: list[str]) -> list[int]:
+    """Parse task IDs like ["3", "7,9-12"] into a list of IDs.
+
+    Raises ValueError for malformed specs, non-positive IDs, and for no IDs
+    or more than MAX_IDS IDs in total.
+    """
+    task_ids = []
+    for spec in specs:
+        for part in spec.replace(",", " ").split():
+            match = ID_RANGE.fullmatch(part)
+            if match is None:
+                kind = "range" if "-" in part else "task ID"
+                raise ValueError(f"Invalid {kind}: {part}")
+
+            first = int(match.group(1))
+            last = first if match.group(2) is None else int(match.group(2))
+            if first > last:
+                raise ValueError(f"Invalid range: {part}")
+            if len(task_ids) + last - first + 1 > MAX_IDS:
+                raise ValueError(f"Too many task IDs: at most {MAX_IDS:,} at once")
+            task_ids.extend(range(first, last + 1))
+
+    if not task_ids:
+        raise ValueError("No task IDs given")
+    if any(task_id < 1 for task_id in task_ids):
+        raise ValueError("Task ID must be positive")
+    return task_ids
+
+
+def parse_days(spec: str) -> int:
+    """Parse a duration like "7d", "2w" or "10" (days) into a number of days.
+
+    Raises ValueError for malformed durations.
+    """
+    match = DURATION.fullmatch(spec.strip().lower())
+    if match is None:
+        raise ValueError(f"Invalid duration: {spec}")
+    return int(match.group(1)) * (7 if match.group(2) == "w" else 1)
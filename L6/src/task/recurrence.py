@@ -0,0 +1,136 @@
+"""Recurrence rules for repeating tasks.
+
+A recurring task is stored once, due on its next occurrence. Its later
+occurrences are only computed, on demand, for the window being looked at;
+completing one stores it as an ordinary done task and moves the recurring
+task on.
+
+Rules are "daily", "weekly", "monthly", "yearly", an interval like "3d" or
+"2w", or a list of weekdays like "mon,wed,fri" ("weekdays" for mon-fri).
+Monthly and yearly rules are stored with the day of the month they started
+on, e.g. "monthly:31", so clamping to a shorter month doesn't stick.
+"""
+
+import calendar
+import re
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+
+from task.ranges import DURATION, parse_days
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+NAMED = {"daily": "1d", "weekly": "1w", "weekdays": "mon,tue,wed,thu,fri"}
+MONTHS = {"monthly": 1, "yearly": 12}
+ANCHORED = re.compile(r"(monthly|yearly):([1-9]|[12]\d|3[01])")
+
+
+def parse(rule: str) -> str:
+    """Normalize a recurrence rule.
+
+    Raises ValueError for unknown rules.
+    """
+    rule = rule.strip().lower().replace(" ", "")
+    if rule in NAMED or rule in MONTHS or ANCHORED.fullmatch(rule):
+        return rule
+    if DURATION.fullmatch(rule):
+        if parse_days(rule) < 1:
+            raise ValueError(f"Invalid recurrence: {rule}")
+        return rule
+
+    days = set(rule.split(","))
+    if not days or not days <= set(WEEKDAYS):
+        raise ValueError(f"Invalid recurrence: {rule}")
+    return ",".join(day for day in WEEKDAYS if day in days)
+
+
+def _interval(rule: str) -> timedelta | None:
+    """Return the fixed step between occurrences, if the rule has one."""
+    rule = NAMED.get(rule, rule)
+    if DURATION.fullmatch(rule):
+        return timedelta(days=parse_days(rule))
+    return None
+
+
+def _weekdays(rule: str) -> set[int]:
+    """Return the weekday numbers of a weekday list rule."""
+    return {WEEKDAYS.index(day) for day in NAMED.get(rule, rule).split(",")}
+
+
+def _months(rule: str) -> tuple[int, int | None] | None:
+    """Return the months between occurrences and the anchor day, if any."""
+    kind, _, day = rule.partition(":")
+    if kind not in MONTHS:
+        return None
+    return MONTHS[kind], int(day) if day else None
+
+
+def anchor(rule: str, due: datetime) -> str:
+    """Pin a monthly or yearly rule to the day of the month of due."""
+    months = _months(rule)
+    if months is None or months[1] is not None:
+        return rule
+    return f"{rule}:{due.day}"
+
+
+def _add_months(when: datetime, months: int, day: int) -> datetime:
+    """Move a date by whole months to day, clamped to the end of shorter months."""
+    year, month = divmod(when.month - 1 + months, 12)
+    year += when.year
+    day = min(day, calendar.monthrange(year, month + 1)[1])
+    return when.replace(year=year, month=month + 1, day=day)
+
+
+def next_after(rule: str, when: datetime) -> datetime:
+    """Return the first occurrence strictly after when."""
+    months = _months(rule)
+    if months is not None:
+        step, day = months
+        return _add_months(when, step, day or when.day)
+    step = _interval(rule)
+    if step is not None:
+        return when + step
+
+    days = _weekdays(rule)
+    when += timedelta(days=1)
+    while when.weekday() not in days:
+        when += timedelta(days=1)
+    return when
+
+
+def first(rule: str, when: datetime) -> datetime:
+    """Return the first occurrence on or after when."""
+    months = _months(rule)
+    if months is not None:
+        step, day = months
+        if day is None:
+            return when
+        # Monthly rules land on day this month, yearly ones this year
+        start = _add_months(when, 0, day)
+        return start if start >= when else _add_months(when, step, day)
+    if _interval(rule) is not None:
+        return when
+    if when.weekday() in _weekdays(rule):
+        return when
+    return next_after(rule, when)
+
+
+def occurrences(
+    rule: str, due: datetime, start: datetime | None, end: datetime
+) -> Iterator[datetime]:
+    """Yield the occurrences from due onwards that fall in [start, end)."""
+    rule = anchor(rule, due)
+    when = due
+    step = _interval(rule)
+    if step is not None and start is not None and when < start:
+        # Jump straight to the window instead of stepping through the gap
+        when += (start - when) // step * step
+    while when < end:
+        if start is None or when >= start:
+            yield when
+        when = next_after(rule, when)
+
+
+def advance(rule: str, due: datetime, today: datetime) -> datetime:
+    """Return the next occurrence after due, skipping any before today."""
+    rule = anchor(rule, due)
+    return next(occurrences(rule, next_after(rule, due), today, datetime.max))
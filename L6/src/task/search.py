@@ -0,0 +1,142 @@
+import mmap
+import re
+import struct
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Iterable
+from itertools import accumulate, chain
+from pathlib import Path
+
+# Inverted index layout: a preamble with the key of the snapshot it indexes
+# (see storage.INDEX_KEY), the vocabulary size and posting count, then the end
+# offset of each token in the heap, the end offset of each token's postings,
+# the postings (task IDs), and a heap of UTF-8 tokens in sorted order. Terms
+# are looked up by bisecting the vocabulary, so a prefix only touches the
+# tokens and postings it matches.
+KEY_SIZE = 16
+PREAMBLE = struct.Struct(f"<{KEY_SIZE}sqq")
+
+TOKEN = re.compile(r"\w+")
+
+# Score of a query term matching a whole word or only the start of one
+EXACT = 2
+PREFIX = 1
+
+
+def tokenize(text: str) -> set[str]:
+    """Split text into the lower-cased words it is indexed under."""
+    return set(TOKEN.findall(text.casefold()))
+
+
+def query_terms(query: str) -> list[str]:
+    """Split a query into its distinct terms, in order."""
+    return list(dict.fromkeys(TOKEN.findall(query.casefold())))
+
+
+def score(title: str, terms: list[str]) -> int:
+    """Score a title against query terms, or 0 unless every term matches."""
+    tokens = tokenize(title)
+    total = 0
+    for term in terms:
+        if term in tokens:
+            total += EXACT
+        elif any(token.startswith(term) for token in tokens):
+            total += PREFIX
+        else:
+            return 0
+    return total
+
+
+def match(term: str, postings: Iterable[tuple[str, int]]) -> dict[int, int]:
+    """Score the tasks of (token, ID) postings whose tokens start with term."""
+    scores = {}
+    for token, task_id in postings:
+        weight = EXACT if token == term else PREFIX
+        if scores.get(task_id, 0) < weight:
+            scores[task_id] = weight
+    return scores
+
+
+def combine(matches: list[dict[int, int]]) -> dict[int, int]:
+    """Keep tasks matched by every term, summing their scores."""
+    if not matches:
+        return {}
+    matches = sorted(matches, key=len)
+    scores = matches[0]
+    for other in matches[1:]:
+        scores = {i: s + other[i] for i, s in scores.items() if i in other}
+    return scores
+
+
+def rank(scores: dict[int, int]) -> list[int]:
+    """Order task IDs by descending score, then by ID."""
+    return sorted(scores, key=lambda task_id: (-scores[task_id], task_id))
+
+
+def encode(records: Iterable[dict], key: bytes) -> bytes:
+    """Serialize the inverted index of the records' titles."""
+    postings = defaultdict(list)
+    for record in records:
+        task_id = record["id"]
+        for token in tokenize(record["title"]):
+            postings[token].append(task_id)
+
+    vocabulary = sorted(postings)
+    heap = [token.encode() for token in vocabulary]
+    lists = [postings[token] for token in vocabulary]
+    token_ends = array("q", accumulate(map(len, heap)))
+    posting_ends = array("q", accumulate(map(len, lists)))
+    ids = array("q", chain.from_iterable(lists))
+
+    return b"".join(
+        [
+            PREAMBLE.pack(key, len(heap), len(ids)),
+            token_ends.tobytes(),
+            posting_ends.tobytes(),
+            ids.tobytes(),
+            *heap,
+        ]
+    )
+
+
+def lookup(path: Path, terms: list[str], key: bytes) -> dict[int, int] | None:
+    """Score the tasks matching every term by bisecting the index.
+
+    Returns None if the index is missing or was built for another snapshot.
+    """
+    try:
+        with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) < PREAMBLE.size:
+                return None
+            index_key, count, total = PREAMBLE.unpack_from(mm)
+            ends_start = PREAMBLE.size + 8 * count
+            ids_start = ends_start + 8 * count
+            heap_start = ids_start + 8 * total
+            if index_key != key or not 0 <= heap_start <= len(mm):
+                return None
+
+            with (
+                memoryview(mm) as view,
+                view[PREAMBLE.size : ends_start].cast("q") as token_ends,
+                view[ends_start:ids_start].cast("q") as posting_ends,
+                view[ids_start:heap_start].cast("q") as ids,
+                view[heap_start:] as heap,
+            ):
+                if len(heap) != (token_ends[-1] if count else 0):
+                    return None  # Not laid out as this version writes it
+
+                def token(i: int) -> bytes:
+                    return bytes(heap[token_ends[i - 1] if i else 0 : token_ends[i]])
+
+                def postings(prefix: bytes) -> Iterable[tuple[str, int]]:
+                    i = bisect_left(range(count), prefix, key=token)
+                    while i < count and (word := token(i)).startswith(prefix):
+                        start = posting_ends[i - 1] if i else 0
+                        for task_id in ids[start : posting_ends[i]].tolist():
+                            yield word.decode(), task_id
+                        i += 1
+
+                return combine([match(term, postings(term.encode())) for term in terms])
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,335 @@
+import sqlite3
+from collections.abc import Iterable, Iterator
+from contextlib import closing
+from pathlib import Path
+
+from task import search
+from task.models import Priority
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    priority TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    due_date TEXT,
+    recur TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_done ON tasks (done);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date);
+
+-- Per-priority pending/done counters, kept up to date by triggers
+CREATE TABLE IF NOT EXISTS task_counts (
+    priority TEXT NOT NULL,
+    done INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (priority, done)
+);
+CREATE TRIGGER IF NOT EXISTS tasks_count_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO task_counts VALUES (NEW.priority, NEW.done, 1)
+        ON CONFLICT (priority, done) DO UPDATE SET n = n + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_count_delete AFTER DELETE ON tasks BEGIN
+    UPDATE task_counts SET n = n - 1
+        WHERE priority = OLD.priority AND done = OLD.done;
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_count_update
+AFTER UPDATE OF done, priority ON tasks BEGIN
+    UPDATE task_counts SET n = n - 1
+        WHERE priority = OLD.priority AND done = OLD.done;
+    INSERT INTO task_counts VALUES (NEW.priority, NEW.done, 1)
+        ON CONFLICT (priority, done) DO UPDATE SET n = n + 1;
+END;
+
+-- Search index: one row per distinct word of each task's title
+CREATE TABLE IF NOT EXISTS task_words (
+    token TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    PRIMARY KEY (token, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_task_words_id ON task_words (id);
+CREATE TRIGGER IF NOT EXISTS tasks_words_delete AFTER DELETE ON tasks BEGIN
+    DELETE FROM task_words WHERE id = OLD.id;
+END;
+"""
+
+# Bumped when a schema change needs existing databases to be backfilled
+SCHEMA_VERSION = 2
+
+COLUMNS = "id, title, done, priority, created_at, due_date, recur"
+
+# ORDER BY terms for storage.SORT_KEYS, each putting the most urgent first
+SORT_COLUMNS = {
+    "priority": "CASE priority WHEN 'high' THEN 0 WHEN 'medium' THEN 1 ELSE 2 END",
+    "due": "due_date IS NULL, due_date",
+    "created": "created_at",
+    "title": "title COLLATE NOCASE",
+}
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Open the task database, creating the schema if needed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    if conn.execute("SELECT 1 FROM task_counts LIMIT 1").fetchone() is None:
+        # Databases created before the counters existed
+        with conn:
+            _rebuild_counts(conn)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version < SCHEMA_VERSION:
+        with conn:
+            if version < 1:
+                # Databases created before the search index existed
+                _index_words(conn, conn.execute("SELECT id, title FROM tasks"))
+            columns = [row["name"] for row in conn.execute("PRAGMA table_info(tasks)")]
+            if "recur" not in columns:
+                # Databases created before recurring tasks existed
+                conn.execute("ALTER TABLE tasks ADD COLUMN recur TEXT")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tasks_recur ON tasks (id) "
+                "WHERE recur IS NOT NULL AND done = 0"
+            )
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def _index_words(conn: sqlite3.Connection, records: Iterable) -> None:
+    """Add the words of records' titles to the search index."""
+    conn.executemany(
+        "INSERT OR IGNORE INTO task_words (token, id) VALUES (?, ?)",
+        (
+            (token, record["id"])
+            for record in records
+            for token in search.tokenize(record["title"])
+        ),
+    )
+
+
+def _record_to_row(record: dict) -> tuple:
+    """Convert a raw task record to a row tuple in COLUMNS order."""
+    return (
+        record["id"],
+        record["title"],
+        int(record["done"]),
+        record["priority"],
+        record["created_at"],
+        record["due_date"],
+        record.get("recur"),
+    )
+
+
+def _row_to_record(row: sqlite3.Row) -> dict:
+    """Convert a database row to a raw task record."""
+    record = dict(row)
+    record["done"] = bool(record["done"])
+    if record["recur"] is None:
+        del record["recur"]
+    return record
+
+
+def _apply(conn: sqlite3.Connection, op: dict) -> None:
+    """Apply a single storage operation to the database."""
+    if op["op"] == "add":
+        conn.execute(
+            f"INSERT INTO tasks ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            _record_to_row(op["task"]),
+        )
+        _index_words(conn, [op["task"]])
+    elif op["op"] == "done":
+        conn.execute("UPDATE tasks SET done = 1 WHERE id = ?", (op["id"],))
+    elif op["op"] == "reopen":
+        conn.execute("UPDATE tasks SET done = 0 WHERE id = ?", (op["id"],))
+    elif op["op"] == "update":
+        conn.execute(
+            "UPDATE tasks SET title = ?, done = ?, priority = ?, created_at = ?, "
+            "due_date = ?, recur = ? WHERE id = ?",
+            (*_record_to_row(op["task"])[1:], op["id"]),
+        )
+        conn.execute("DELETE FROM task_words WHERE id = ?", (op["id"],))
+        _index_words(conn, [op["task"]])
+    elif op["op"] == "delete":
+        conn.execute("DELETE FROM tasks WHERE id = ?", (op["id"],))
+    else:
+        raise ValueError(f"Unknown storage operation: {op['op']}")
+
+
+def commit(path: Path, ops: tuple[dict, ...]) -> None:
+    """Apply operations in a single transaction."""
+    with closing(connect(path)) as conn, conn:
+        for op in ops:
+            _apply(conn, op)
+
+
+def replace_all(path: Path, records: list[dict], next_id: int) -> None:
+    """Replace the contents of the database with raw task records."""
+    with closing(connect(path)) as conn, conn:
+        conn.execute("DELETE FROM task_words")
+        conn.execute("DELETE FROM tasks")
+        conn.executemany(
+            f"INSERT INTO tasks ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            map(_record_to_row, records),
+        )
+        _index_words(conn, records)
+        # Keep IDs of deleted tasks from being reused
+        conn.execute("DELETE FROM sqlite_sequence WHERE name = 'tasks'")
+        conn.execute(
+            "INSERT INTO sqlite_sequence (name, seq) VALUES ('tasks', ?)",
+            (next_id - 1,),
+        )
+
+
+def next_id(path: Path) -> int:
+    """Return the ID the next inserted task will receive."""
+    with closing(connect(path)) as conn:
+        row = conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'tasks'"
+        ).fetchone()
+    return row["seq"] + 1 if row else 1
+
+
+def _rebuild_counts(conn: sqlite3.Connection) -> None:
+    """Recompute the counters table from the tasks table."""
+    conn.execute("DELETE FROM task_counts")
+    conn.execute(
+        "INSERT INTO task_counts "
+        "SELECT priority, done, COUNT(*) FROM tasks GROUP BY priority, done"
+    )
+
+
+def rebuild_counts(path: Path) -> None:
+    """Recompute the counters table from the tasks table."""
+    with closing(connect(path)) as conn, conn:
+        _rebuild_counts(conn)
+
+
+def counts(path: Path) -> dict[str, dict[str, int]]:
+    """Return pending/done counts per priority from the counters table."""
+    result = {priority.value: {"pending": 0, "done": 0} for priority in Priority}
+    with closing(connect(path)) as conn:
+        for row in conn.execute("SELECT priority, done, n FROM task_counts"):
+            result[row["priority"]]["done" if row["done"] else "pending"] = row["n"]
+    return result
+
+
+def _where(done: bool | None, priority: Priority | None) -> tuple[str, list]:
+    """Build a WHERE clause for the done/priority filters."""
+    clauses, params = [], []
+    if done is not None:
+        clauses.append("done = ?")
+        params.append(int(done))
+    if priority is not None:
+        clauses.append("priority = ?")
+        params.append(priority.value)
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, params
+
+
+def count(
+    path: Path,
+    done: bool | None = None,
+    priority: Priority | None = None,
+) -> int:
+    """Count tasks matching the filters using the indexes."""
+    where, params = _where(done, priority)
+    with closing(connect(path)) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM tasks {where}", params).fetchone()[0]
+
+
+def get_records(path: Path, task_ids: list[int]) -> dict[int, dict]:
+    """Return raw records for the task IDs that exist."""
+    records = {}
+    with closing(connect(path)) as conn:
+        # Stay under SQLite's limit on bound parameters
+        for start in range(0, len(task_ids), 500):
+            chunk = task_ids[start : start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            for row in conn.execute(
+                f"SELECT {COLUMNS} FROM tasks WHERE id IN ({placeholders})", chunk
+            ):
+                records[row["id"]] = _row_to_record(row)
+    return records
+
+
+def due_records(path: Path, end: str, start: str | None = None) -> list[dict]:
+    """Return pending tasks due in [start, end) using the due date index."""
+    clauses, params = ["done = 0", "due_date < ?"], [end]
+    if start is not None:
+        clauses.append("due_date >= ?")
+        params.append(start)
+
+    with closing(connect(path)) as conn:
+        rows = conn.execute(
+            f"SELECT {COLUMNS} FROM tasks WHERE {' AND '.join(clauses)} "
+            "ORDER BY due_date, id",
+            params,
+        )
+        return [_row_to_record(row) for row in rows]
+
+
+def recurring_records(path: Path) -> list[dict]:
+    """Return pending recurring tasks using their partial index."""
+    with closing(connect(path)) as conn:
+        rows = conn.execute(
+            f"SELECT {COLUMNS} FROM tasks WHERE recur IS NOT NULL AND done = 0"
+        )
+        return [_row_to_record(row) for row in rows]
+
+
+def search_records(
+    path: Path,
+    terms: list[str],
+    done: bool | None = None,
+    limit: int | None = None,
+) -> list[dict]:
+    """Return records matching every term, best first, via the words table."""
+    with closing(connect(path)) as conn:
+        matches = [
+            search.match(
+                term,
+                conn.execute(
+                    "SELECT token, id FROM task_words WHERE token >= ? AND token < ?",
+                    # Every word starting with term sorts below this bound
+                    (term, term + chr(0x10FFFF)),
+                ),
+            )
+            for term in terms
+        ]
+
+    ranked = search.rank(search.combine(matches))
+    results = []
+    for start in range(0, len(ranked), 500):
+        batch = ranked[start : start + 500]
+        records = get_records(path, batch)
+        for task_id in batch:
+            record = records[task_id]
+            if done is None or record["done"] == done:
+                results.append(record)
+                if len(results) == limit:
+                    return results
+    return results
+
+
+def iter_records(
+    path: Path,
+    done: bool | None = None,
+    priority: Priority | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+    sort: list[str] | None = None,
+) -> Iterator[dict]:
+    """Stream raw records using the done/priority indexes."""
+    where, params = _where(done, priority)
+    order = ", ".join([*(SORT_COLUMNS[name] for name in sort or ()), "id"])
+    # A negative LIMIT means no limit in SQLite
+    params += [-1 if limit is None else limit, offset]
+    with closing(connect(path)) as conn:
+        for row in conn.execute(
+            f"SELECT {COLUMNS} FROM tasks {where} ORDER BY {order} LIMIT ? OFFSET ?",
+            params,
+        ):
+            yield _row_to_record(row)
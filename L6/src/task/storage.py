@@ -1,61 +1,1267 @@
+import gzip
+import heapq
+import io
 import json
-from datetime import datetime
+import mmap
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_left, insort
+from collections import defaultdict
+from collections.abc import Callable, Container, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import wraps
+from itertools import chain, islice
 from pathlib import Path
+from typing import BinaryIO
 
-from task.models import Priority, Task
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, rely on the generation check
+    fcntl = None
+
+from task import binary, history, profiling, recurrence, search
+from task.models import PRIORITY_CODES, Priority, Task, TaskTable, to_epoch_us
 
 STORAGE_DIR = Path.home() / ".task"
 STORAGE_PATH = STORAGE_DIR / "tasks.json"
 
+# Named lists (task --list NAME) are stored as separate shards under this
+# directory of STORAGE_DIR, each with its own snapshot, indexes, journal and
+# lock, so a list's operations only pay for its own tasks. The default list
+# is the original tasks.json.
+LISTS_DIR = "lists"
+DEFAULT_LIST = "default"
+LIST_NAME = re.compile(r"[\w-]+")
+
+# Storage engine selected with the TASK_STORAGE env var: "json" rewrites the
+# whole file, "journal" appends to an operation log, "sqlite" uses tasks.db.
+DEFAULT_ENGINE = "json"
+ENGINES = ("json", "journal", "sqlite")
+
+# Fold the journal back into the snapshot once it grows past this size
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+
+# Compaction moves completed tasks created more than this many days ago to the
+# archive; override with the TASK_ARCHIVE_DAYS env var ("off" to disable)
+ARCHIVE_AFTER_DAYS = 30
+
+# Operation that reverses each kind of change
+INVERSE_OPS = {"add": "delete", "done": "reopen", "reopen": "done"}
+# Changes whose reverse carries the task's current record (see _step)
+REVERSE_OPS = {"delete": "add", "update": "update"}
+
+# Changes kept for task undo; override with the TASK_HISTORY env var ("off"
+# to disable)
+HISTORY_SIZE = 100
+
+# Snapshot header entries describing the archive
+ARCHIVE_KEYS = ("archived", "archive_size")
+
+# Snapshot formats, detected from the file contents. JSON snapshots are written
+# with the header and each record on its own line so that single records can
+# be read back through the id index.
+SNAPSHOT_FORMATS = ("json", "binary")
+SNAPSHOT_TASKS_KEY = ', "tasks": ['
+
+# Every index file starts with the size and generation of the snapshot it was
+# built for; readers that find another snapshot fall back to a full read.
+INDEX_KEY = struct.Struct("<qq")
+
+# Upper bound for due dates, used to match every task with a due date
+DUE_INDEX_END = 2**63 - 1
+
+# Sort keys for raw records, each putting the most urgent tasks first
+SORT_KEYS = {
+    "priority": lambda record: -PRIORITY_CODES[record["priority"]],
+    "due": lambda record: (record["due_date"] is None, record["due_date"] or ""),
+    "created": lambda record: record["created_at"],
+    "title": lambda record: record["title"].casefold(),
+}
+
+# Ranked search matches read from the snapshot at a time
+SEARCH_BATCH = 100
+
+# Tasks added per batch by import_tasks
+IMPORT_BATCH = 10_000
+
+# Times a JSON commit is retried after losing a race to another writer
+COMMIT_ATTEMPTS = 3
+
+# IDs the daemon reserves at a time, so most adds never touch the disk
+ID_BLOCK = 100
+
+_lock_file = None
+_lock_depth = 0
+
+
+class ConflictError(RuntimeError):
+    """The snapshot was rewritten by another process since it was read."""
+
+
+def _engine() -> str:
+    """Return the storage engine selected for this process."""
+    engine = os.environ.get("TASK_STORAGE", DEFAULT_ENGINE).lower()
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown storage engine: {engine}")
+    return engine
+
+
+def list_path(name: str) -> Path:
+    """Return the snapshot path of a task list."""
+    if not LIST_NAME.fullmatch(name):
+        raise ValueError(f"Invalid list name: {name}")
+    if name == DEFAULT_LIST:
+        return STORAGE_DIR / "tasks.json"
+    return STORAGE_DIR / LISTS_DIR / f"{name}.json"
+
+
+def use_list(name: str) -> None:
+    """Point storage at a task list for the rest of the process."""
+    global STORAGE_PATH
+    STORAGE_PATH = list_path(name)
+
+
+def current_list() -> str:
+    """Return the name of the task list storage points at."""
+    if STORAGE_PATH == list_path(DEFAULT_LIST):
+        return DEFAULT_LIST
+    return STORAGE_PATH.stem
+
+
+def list_names() -> list[str]:
+    """Return the default list followed by every named list, by name."""
+    # Every file of a shard starts with its name: work.json, work.idx, ...
+    shards = (STORAGE_DIR / LISTS_DIR).glob("*")
+    names = {path.name.partition(".")[0] for path in shards}
+    return [DEFAULT_LIST, *sorted(names - {DEFAULT_LIST})]
+
+
+def _journal_path() -> Path:
+    """Return the path of the operation log next to the snapshot."""
+    return STORAGE_PATH.with_suffix(".log")
+
+
+def _index_path() -> Path:
+    """Return the path of the id-to-offset index next to the snapshot."""
+    return STORAGE_PATH.with_suffix(".idx")
+
+
+def _due_path() -> Path:
+    """Return the path of the due-date index next to the snapshot."""
+    return STORAGE_PATH.with_suffix(".due")
+
+
+def _search_path() -> Path:
+    """Return the path of the title search index next to the snapshot."""
+    return STORAGE_PATH.with_suffix(".words")
+
+
+def _archive_path() -> Path:
+    """Return the path of the archive of completed tasks next to the snapshot."""
+    return STORAGE_PATH.with_suffix(".archive.gz")
+
+
+def _archive_after() -> timedelta | None:
+    """Return the age at which compaction archives completed tasks, if enabled."""
+    value = os.environ.get("TASK_ARCHIVE_DAYS", str(ARCHIVE_AFTER_DAYS)).lower()
+    if value == "off":
+        return None
+    if not value.isdigit():
+        raise ValueError(f"Invalid TASK_ARCHIVE_DAYS: {value}")
+    return timedelta(days=int(value))
+
+
+def _undo_path() -> Path:
+    """Return the path of the stack of changes to undo next to the snapshot."""
+    return STORAGE_PATH.with_suffix(".undo")
+
+
+def _redo_path() -> Path:
+    """Return the path of the stack of undone changes next to the snapshot."""
+    return STORAGE_PATH.with_suffix(".redo")
+
+
+def _history_size() -> int:
+    """Return how many changes are kept for undo, 0 if disabled."""
+    value = os.environ.get("TASK_HISTORY", str(HISTORY_SIZE)).lower()
+    if value == "off":
+        return 0
+    if not value.isdigit():
+        raise ValueError(f"Invalid TASK_HISTORY: {value}")
+    return int(value)
+
+
+def _reserve_path() -> Path:
+    """Return the path of the daemon's ID reservation next to the snapshot."""
+    return STORAGE_PATH.with_suffix(".ids")
+
+
+def _reserved_id() -> int:
+    """Return the first ID past those reserved by the daemon, or 0."""
+    try:
+        return int(_reserve_path().read_text())
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def _db_path() -> Path:
+    """Return the path of the SQLite database next to the snapshot."""
+    return STORAGE_PATH.with_suffix(".db")
+
+
+def _sqlite():
+    """Import the SQLite engine on first use, since sqlite3 is slow to load."""
+    from task import sqlite_store
+
+    return sqlite_store
+
+
+def _lock_path() -> Path:
+    """Return the path of the advisory lock file next to the snapshot."""
+    return STORAGE_PATH.with_suffix(".lock")
+
+
+@contextmanager
+def _locked() -> Iterator[None]:
+    """Hold the exclusive store lock; nested calls reuse the outer lock."""
+    global _lock_file, _lock_depth
+    if _lock_depth == 0:
+        STORAGE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _lock_file = _lock_path().open("a")
+        if fcntl is not None:
+            fcntl.flock(_lock_file, fcntl.LOCK_EX)
+    _lock_depth += 1
+    try:
+        yield
+    finally:
+        _lock_depth -= 1
+        if _lock_depth == 0:
+            _lock_file.close()  # Closing the file releases the lock
+            _lock_file = None
+
+
+def _exclusive(func: Callable) -> Callable:
+    """Run a read-modify-write storage function under the store lock."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with _locked():
+            return func(*args, **kwargs)
+
+    return wrapper
+
 
 def _ensure_storage_exists() -> None:
     """Create storage directory and file if they don't exist."""
-    STORAGE_DIR.mkdir(parents=True, exist_ok=True)
     if not STORAGE_PATH.exists():
-        STORAGE_PATH.write_text(json.dumps({"version": 1, "tasks": []}))
+        with _locked():
+            if not STORAGE_PATH.exists():
+                _write_snapshot({"version": 1, "next_id": 1, "tasks": {}})
 
 
-def _task_to_dict(task: Task) -> dict:
+def task_to_dict(task: Task) -> dict:
     """Convert a Task to a JSON-serializable dictionary."""
-    return {
+    record = {
+        "id": task.id,
         "title": task.title,
         "done": task.done,
         "priority": task.priority.value,
         "created_at": task.created_at.isoformat(),
         "due_date": task.due_date.isoformat() if task.due_date else None,
     }
+    if task.recur:
+        record["recur"] = task.recur
+    return record
 
 
-def _dict_to_task(data: dict) -> Task:
+def dict_to_task(data: dict) -> Task:
     """Convert a dictionary to a Task object."""
     return Task(
+        id=data["id"],
         title=data["title"],
         done=data["done"],
         priority=Priority(data["priority"]),
         created_at=datetime.fromisoformat(data["created_at"]),
         due_date=datetime.fromisoformat(data["due_date"]) if data["due_date"] else None,
+        recur=data.get("recur"),
+    )
+
+
+def _snapshot_format() -> str:
+    """Return the format of the current snapshot, detected from its marker."""
+    _ensure_storage_exists()
+    return "binary" if binary.is_binary(STORAGE_PATH) else "json"
+
+
+def _read_snapshot() -> dict:
+    """Read the full snapshot, numbering tasks of stores that predate IDs."""
+    if _snapshot_format() == "binary":
+        data = {}
+        records = profiling.timed("decode", binary.iter_records(STORAGE_PATH, data))
+        data["tasks"] = {r["id"]: r for r in records}
+        data.setdefault("generation", 0)
+        if "counts" not in data:
+            data["counts"] = _tally(data["tasks"].values())
+        return data
+
+    with profiling.span("read"):
+        content = STORAGE_PATH.read_text()
+    with profiling.span("decode"):
+        data = json.loads(content)
+
+    if "next_id" not in data:
+        for task_id, record in enumerate(data["tasks"], start=1):
+            record["id"] = task_id
+        data["next_id"] = len(data["tasks"]) + 1
+    data.setdefault("generation", 0)
+    if "counts" not in data:
+        data["counts"] = _tally(data["tasks"])
+
+    data["tasks"] = {record["id"]: record for record in data["tasks"]}
+    return data
+
+
+def _iter_snapshot(
+    done: bool | None = None,
+    priority: Priority | None = None,
+    include: Container[int] = (),
+    header: dict | None = None,
+) -> Iterator[dict]:
+    """Stream raw records from the snapshot one at a time.
+
+    Binary snapshots are paged through a memory map and skip records that
+    fail the filters (unless their ID is in include); JSON snapshots yield
+    everything and leave filtering to the caller. If header is given, it is
+    filled in from the same file before the first record is yielded.
+    """
+    if header is None:
+        header = {}
+    if _snapshot_format() == "binary":
+        value = priority.value if priority else None
+        records = binary.scan(STORAGE_PATH, done, value, include, header)
+        yield from profiling.timed("decode", records)
+        return
+
+    with STORAGE_PATH.open() as f:
+        line = f.readline().rstrip()
+        if not line.endswith(SNAPSHOT_TASKS_KEY):
+            # Written by an older version: fall back to a full read
+            data = _read_snapshot()
+            header.update((k, v) for k, v in data.items() if k != "tasks")
+            yield from data["tasks"].values()
+            return
+
+        header.update(json.loads(line.removesuffix(SNAPSHOT_TASKS_KEY) + "}"))
+
+        lines = (line.rstrip().removesuffix(",") for line in profiling.timed("read", f))
+        yield from profiling.timed(
+            "decode", map(json.loads, (line for line in lines if line != "]}"))
+        )
+
+
+def _read_header() -> dict:
+    """Read the snapshot header without parsing the task records."""
+    if _snapshot_format() == "binary":
+        return binary.read_header(STORAGE_PATH)
+
+    with STORAGE_PATH.open() as f:
+        line = f.readline().rstrip()
+
+    if not line.endswith(SNAPSHOT_TASKS_KEY):
+        # Written by an older version: fall back to a full read
+        data = _read_snapshot()
+        del data["tasks"]
+        return data
+    return json.loads(line.removesuffix(SNAPSHOT_TASKS_KEY) + "}")
+
+
+def _encode_json(header: dict, records: list[dict]) -> tuple[bytes, list[int]]:
+    """Serialize a JSON snapshot with the header and each record on one line."""
+    lines = [json.dumps(header).removesuffix("}") + SNAPSHOT_TASKS_KEY + "\n"]
+    position = len(lines[0])
+    offsets = []
+    for i, record in enumerate(records):
+        # ASCII-only JSON, so character counts equal byte offsets
+        line = json.dumps(record) + (",\n" if i < len(records) - 1 else "\n")
+        offsets.append(position)
+        position += len(line)
+        lines.append(line)
+    lines.append("]}\n")
+    return "".join(lines).encode(), offsets
+
+
+def _encode_snapshot(data: dict, fmt: str) -> tuple[bytes, array]:
+    """Serialize a document and map each task ID to its record's byte offset."""
+    header = {key: value for key, value in data.items() if key != "tasks"}
+    records = list(data["tasks"].values())
+    # Tasks restored by undo are appended out of ID order
+    records.sort(key=lambda record: record["id"])
+    if "counts" not in header:
+        header["counts"] = _tally(records)
+    # Recurring tasks are listed so due windows can find them without a scan
+    header.pop("recurring", None)
+    recurring = [record["id"] for record in records if _recurs(record)]
+    if recurring:
+        header["recurring"] = recurring
+    encode = binary.encode if fmt == "binary" else _encode_json
+    content, positions = encode(header, records)
+
+    offsets = array("q", [-1]) * data["next_id"]
+    for record, position in zip(records, positions):
+        offsets[record["id"]] = position
+    return content, offsets
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    """Replace a file in one step so readers never see a partial write."""
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _due_key(record: dict) -> int:
+    """Return a record's due date as epoch microseconds, for the due index."""
+    return to_epoch_us(datetime.fromisoformat(record["due_date"]))
+
+
+def _encode_due_index(records: Iterable[dict], key: bytes) -> bytes:
+    """Serialize the due index: pending tasks' due dates, sorted, and their IDs."""
+    entries = sorted(
+        (_due_key(record), record["id"])
+        for record in records
+        if record["due_date"] and not record["done"]
+    )
+    dues = array("q", (due for due, _ in entries))
+    ids = array("q", (task_id for _, task_id in entries))
+    header = key + struct.pack("<q", len(entries))
+    return header + dues.tobytes() + ids.tobytes()
+
+
+def _write_snapshot(data: dict, fmt: str = "json") -> None:
+    """Write the snapshot in the given format and rebuild its indexes."""
+    with profiling.span("encode"):
+        content, offsets = _encode_snapshot(data, fmt)
+    with profiling.span("index"):
+        key = INDEX_KEY.pack(len(content), data.get("generation", 0))
+        due_index = _encode_due_index(data["tasks"].values(), key)
+        search_index = search.encode(data["tasks"].values(), key)
+    with profiling.span("write"):
+        STORAGE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(STORAGE_PATH, content)
+        _write_atomic(_index_path(), key + offsets.tobytes())
+        _write_atomic(_due_path(), due_index)
+        _write_atomic(_search_path(), search_index)
+
+
+def _read_due_index(start: int | None, end: int) -> list[int] | None:
+    """Return IDs of snapshot tasks due in [start, end) by bisecting the index.
+
+    Returns None if the index is missing or stale.
+    """
+    try:
+        with (
+            _due_path().open("rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            start_at = INDEX_KEY.size + 8
+            if len(mm) < start_at or mm[: INDEX_KEY.size] != _snapshot_key():
+                return None
+            (count,) = struct.unpack_from("<q", mm, INDEX_KEY.size)
+            if len(mm) != start_at + 16 * count:
+                return None
+
+            with (
+                memoryview(mm) as view,
+                view[start_at : start_at + 8 * count].cast("q") as dues,
+                view[start_at + 8 * count :].cast("q") as ids,
+            ):
+                low = 0 if start is None else bisect_left(dues, start)
+                high = bisect_left(dues, end)
+                with ids[low:high] as hits:
+                    return hits.tolist()
+    except FileNotFoundError:
+        return None
+
+
+def _snapshot_key(f: BinaryIO | None = None) -> bytes:
+    """Return the index key of the snapshot, or of an open snapshot file."""
+    if f is None:
+        return INDEX_KEY.pack(STORAGE_PATH.stat().st_size, _generation())
+    return INDEX_KEY.pack(os.fstat(f.fileno()).st_size, _file_generation(f))
+
+
+def _file_generation(f: BinaryIO) -> int:
+    """Return the generation recorded in an open snapshot file."""
+    f.seek(0)
+    if f.read(len(binary.MARKER)) == binary.MARKER:
+        return binary.file_header(f).get("generation", 0)
+    f.seek(0)
+    line = f.readline().rstrip().decode()
+    if not line.endswith(SNAPSHOT_TASKS_KEY):
+        return -1  # Written by an older version, without indexes
+    return json.loads(line.removesuffix(SNAPSHOT_TASKS_KEY) + "}").get(
+        "generation", 0
     )
 
 
+def _read_index(task_ids: list[int], key: bytes) -> dict[int, int] | None:
+    """Return snapshot offsets for task IDs, or None if the index is unusable.
+
+    key identifies the snapshot the offsets will be read from.
+    """
+    try:
+        with _index_path().open("rb") as f:
+            if f.read(INDEX_KEY.size) != key:
+                return None
+
+            offsets = {}
+            for task_id in task_ids:
+                f.seek(INDEX_KEY.size + 8 * task_id)
+                entry = f.read(8)
+                if task_id > 0 and len(entry) == 8:
+                    (offset,) = struct.unpack("<q", entry)
+                    if offset >= 0:
+                        offsets[task_id] = offset
+            return offsets
+    except FileNotFoundError:
+        return None
+
+
+def _indexed_records(task_ids: list[int]) -> dict[int, dict]:
+    """Read snapshot records through the id index, skipping absent IDs.
+
+    The snapshot is opened first and the index checked against that file,
+    since a writer may replace the two between reads.
+    """
+    with STORAGE_PATH.open("rb") as f:
+        offsets = _read_index(task_ids, _snapshot_key(f))
+        if offsets is not None:
+            f.seek(0)
+            if f.read(len(binary.MARKER)) == binary.MARKER:
+                records = binary.file_records(f, offsets.values())
+            else:
+                records = []
+                for offset in offsets.values():
+                    f.seek(offset)
+                    line = f.readline().rstrip().removesuffix(b",")
+                    records.append(json.loads(line))
+            if all(r["id"] == task_id for r, task_id in zip(records, offsets)):
+                return dict(zip(offsets, records))
+
+    # Missing or stale index: fall back to a full read
+    tasks = _read_snapshot()["tasks"]
+    return {i: tasks[i] for i in task_ids if i in tasks}
+
+
+def _read_stamped_journal() -> tuple[int | None, list[dict]]:
+    """Read journaled operations with the snapshot generation they build on.
+
+    The generation is None for journals written before they were stamped.
+    A torn trailing record is ignored.
+    """
+    path = _journal_path()
+    try:
+        with profiling.span("read"):
+            lines = path.read_text().splitlines()
+    except FileNotFoundError:
+        return None, []
+
+    generation = None
+    if lines and lines[0].startswith('{"generation"'):
+        generation = json.loads(lines.pop(0))["generation"]
+    ops = []
+    for line in lines:
+        try:
+            ops.append(json.loads(line))
+        except json.JSONDecodeError:
+            break  # Interrupted append: everything after it is unusable
+    return generation, ops
+
+
+def _journal_ops(generation: int | None, ops: list[dict], snapshot: int) -> list:
+    """Return journaled ops that still apply on top of a snapshot generation.
+
+    A journal stamped with an older generation was folded into the snapshot
+    by a compaction that ran after it was read, or before a crash could
+    remove it.
+    """
+    if generation is not None and generation < snapshot:
+        return []
+    return ops
+
+
+def _read_journal() -> list[dict]:
+    """Read the journaled operations on top of the current snapshot."""
+    generation, ops = _read_stamped_journal()
+    if generation is None:
+        return ops
+    return _journal_ops(generation, ops, _generation())
+
+
+def _empty_counts() -> dict[str, dict[str, int]]:
+    """Return zeroed pending/done counters for every priority."""
+    return {priority.value: {"pending": 0, "done": 0} for priority in Priority}
+
+
+def _count(counts: dict | None, record: dict, delta: int) -> None:
+    """Adjust the counter a raw record falls under, if counters are kept."""
+    if counts is not None:
+        status = "done" if record["done"] else "pending"
+        counts[record["priority"]][status] += delta
+
+
+def _tally(records: Iterable[dict]) -> dict[str, dict[str, int]]:
+    """Compute counters from scratch with a pass over raw records."""
+    counts = _empty_counts()
+    for record in records:
+        _count(counts, record, 1)
+    return counts
+
+
+def _apply(records: dict[int, dict], op: dict, counts: dict | None = None) -> None:
+    """Apply a single journal operation to raw task records keyed by ID.
+
+    When counts is given, the counters are updated to match.
+    """
+    if op["op"] == "add":
+        records[op["id"]] = op["task"]
+        _count(counts, op["task"], 1)
+    elif op["op"] == "done":
+        record = records[op["id"]]
+        if not record["done"]:
+            _count(counts, record, -1)
+            record["done"] = True
+            _count(counts, record, 1)
+    elif op["op"] == "reopen":
+        record = records[op["id"]]
+        if record["done"]:
+            _count(counts, record, -1)
+            record["done"] = False
+            _count(counts, record, 1)
+    elif op["op"] == "update":
+        _count(counts, records[op["id"]], -1)
+        records[op["id"]] = op["task"]
+        _count(counts, op["task"], 1)
+    elif op["op"] == "delete":
+        _count(counts, records.pop(op["id"]), -1)
+    else:
+        raise ValueError(f"Unknown journal operation: {op['op']}")
+
+
+def _replay(task_id: int, record: dict | None, ops: list[dict]) -> dict | None:
+    """Apply one task's journal operations to its snapshot record."""
+    records = {task_id: record} if record else {}
+    for op in ops:
+        _apply(records, op)
+    return records.get(task_id)
+
+
+def _iter_document(
+    done: bool | None = None,
+    priority: Priority | None = None,
+) -> Iterator[dict]:
+    """Stream the snapshot with the journal tail applied, one record at a time.
+
+    The filters are only a hint for skipping snapshot records early.
+    """
+    # The journal is read before the snapshot is opened, so a compaction in
+    # between can only leave it stale, which its generation stamp reveals
+    generation, ops = _read_stamped_journal()
+    header = {}
+    records = _iter_snapshot(done, priority, {op["id"] for op in ops}, header)
+    head = list(islice(records, 1))
+    records = chain(head, records)
+    ops = _journal_ops(generation, ops, header.get("generation", 0))
+
+    pending = defaultdict(list)
+    for op in ops:
+        pending[op["id"]].append(op)
+
+    # Tasks whose first journaled op adds them aren't in the snapshot
+    new_ids = [i for i, ops in pending.items() if ops[0]["op"] == "add"]
+    new_ids.sort()
+    added = [
+        record
+        for task_id in new_ids
+        if (record := _replay(task_id, None, pending.pop(task_id)))
+    ]
+
+    def snapshot() -> Iterator[dict]:
+        # Records with journaled changes must be replayed before filtering
+        for record in records:
+            if record["id"] in pending:
+                record = _replay(record["id"], record, pending[record["id"]])
+            if record:
+                yield record
+
+    if added and added[0]["id"] < header["next_id"]:
+        # Tasks restored by undo belong among the snapshot's records
+        yield from heapq.merge(snapshot(), added, key=lambda record: record["id"])
+    else:
+        yield from snapshot()
+        yield from added
+
+
+def _read_document() -> dict:
+    """Read the snapshot and replay the journal tail on top of it.
+
+    The journal is read first, for the same reason as in _iter_document.
+    """
+    generation, ops = _read_stamped_journal()
+    data = _read_snapshot()
+    for op in _journal_ops(generation, ops, data["generation"]):
+        _apply(data["tasks"], op, data["counts"])
+        data["next_id"] = max(data["next_id"], op["id"] + 1)
+    return data
+
+
+def _generation() -> int:
+    """Return the generation of the snapshot on disk."""
+    return _read_header().get("generation", 0)
+
+
+@_exclusive
+def _write_document(data: dict, fmt: str | None = None) -> None:
+    """Write a full snapshot and drop the journal it now contains.
+
+    Documents read from disk carry the generation they were read at; if the
+    snapshot has been rewritten since, ConflictError is raised instead of
+    overwriting the other writer's changes. Documents without a generation
+    replace the store unconditionally.
+    """
+    current = _generation()
+    if data.get("generation", current) != current:
+        raise ConflictError(f"{STORAGE_PATH} was changed by another process")
+
+    data["generation"] = current + 1
+    _write_snapshot(data, fmt or _snapshot_format())
+    _journal_path().unlink(missing_ok=True)
+
+
+def _stored_next_id() -> int:
+    """Return the ID after the highest one the store has handed out."""
+    if _engine() == "sqlite":
+        return _sqlite().next_id(_db_path())
+
+    next_id = _read_header()["next_id"]
+    for op in _read_journal():
+        next_id = max(next_id, op["id"] + 1)
+    return next_id
+
+
+def _next_id() -> int:
+    """Return the ID for the next new task, skipping any the daemon reserved."""
+    return max(_stored_next_id(), _reserved_id())
+
+
+@_exclusive
+def _commit(*ops: dict, data: dict | None = None) -> None:
+    """Persist operations using the selected storage engine.
+
+    The JSON engine applies them to data when the caller already read the
+    document, so a whole batch costs one read and one write. If a writer that
+    bypassed the lock got there first, the operations are replayed on a fresh
+    read of the store.
+    """
+    if _engine() == "sqlite":
+        with profiling.span("write"):
+            _sqlite().commit(_db_path(), ops)
+        return
+
+    if _engine() == "journal":
+        _append_journal(ops)
+        return
+
+    for attempt in range(COMMIT_ATTEMPTS):
+        if data is None:
+            data = _read_document()
+        for op in ops:
+            _apply(data["tasks"], op, data["counts"])
+            data["next_id"] = max(data["next_id"], op["id"] + 1)
+        if data.get("generation") == _generation():
+            # The full rewrite is the JSON engine's compaction; tasks this
+            # commit touched stay, so it can still be undone in place
+            _archive_old(data, keep={op["id"] for op in ops})
+        try:
+            _write_document(data)
+            return
+        except ConflictError:
+            if attempt == COMMIT_ATTEMPTS - 1:
+                raise
+            data = None
+
+
+@_exclusive
+def _append_journal(ops: Iterable[dict]) -> None:
+    """Append operations to the journal, compacting it once it grows large."""
+    _write_journal(ops)
+    if _journal_path().stat().st_size >= JOURNAL_COMPACT_BYTES:
+        compact()
+
+
+def _write_journal(ops: Iterable[dict]) -> None:
+    """Append operations to the journal and sync them to disk.
+
+    A new journal starts with the generation of the snapshot it builds on,
+    which lets lock-free readers tell when a compaction has folded it in. A
+    journal left behind by a crash after its snapshot was rewritten is
+    dropped rather than appended to.
+    """
+    _ensure_storage_exists()
+    path = _journal_path()
+    current = _generation()
+    with profiling.span("write"), path.open("a+") as f:
+        f.seek(0)
+        line = f.readline()
+        stamp = json.loads(line) if line.startswith('{"generation"') else {}
+        if stamp.get("generation", current) < current:
+            f.truncate(0)
+        if f.seek(0, os.SEEK_END) == 0:
+            f.write(json.dumps({"generation": current}) + "\n")
+        f.writelines(json.dumps(op) + "\n" for op in ops)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+@_exclusive
+def compact() -> None:
+    """Fold the journal into the snapshot, archiving old completed tasks."""
+    if _journal_path().exists():
+        data = _read_document()
+        _archive_old(data)
+        _write_document(data)
+
+
+def _archive_old(data: dict, keep: Container[int] = ()) -> None:
+    """Archive old completed tasks from data if TASK_ARCHIVE_DAYS allows it."""
+    older_than = _archive_after()
+    if older_than is not None:
+        _archive_records(data, older_than, keep)
+
+
+def _archive_records(
+    data: dict, older_than: timedelta, keep: Container[int] = ()
+) -> int:
+    """Move completed tasks created before the cutoff from data to the archive.
+
+    Tasks whose IDs are in keep are left in place. Each call appends one gzip member of JSON lines, which readers see as a
+    single stream. The archive size is committed in the snapshot header, so a
+    member left behind by a crash before data is saved is ignored by readers
+    and cut off by the next append, while its tasks are still in the store.
+    """
+    cutoff = (datetime.now() - older_than).isoformat()
+    records = [
+        record
+        for record in data["tasks"].values()
+        if record["done"]
+        and record["created_at"] < cutoff
+        and record["id"] not in keep
+    ]
+    if not records:
+        return 0
+
+    size = data.get("archive_size", 0)
+    member = gzip.compress(
+        "".join(json.dumps(record) + "\n" for record in records).encode()
+    )
+    with _archive_path().open("ab") as f:
+        f.truncate(size)
+        f.write(member)
+        f.flush()
+        os.fsync(f.fileno())
+    data["archive_size"] = size + len(member)
+
+    archived = data.setdefault("archived", {p.value: 0 for p in Priority})
+    for record in records:
+        _apply(data["tasks"], {"op": "delete", "id": record["id"]}, data["counts"])
+        archived[record["priority"]] += 1
+    return len(records)
+
+
+@_exclusive
+def archive_tasks(older_than: timedelta) -> int:
+    """Move completed tasks older than older_than to the archive.
+
+    Returns the number of tasks archived.
+    """
+    if _engine() == "sqlite":
+        raise ValueError("The SQLite store keeps completed tasks indexed instead")
+
+    data = _read_document()
+    archived = _archive_records(data, older_than)
+    if archived:
+        _write_document(data)
+    return archived
+
+
+def iter_archive(priority: Priority | None = None) -> Iterator[dict]:
+    """Stream archived records, which are all completed, oldest archive first."""
+    size = _read_header().get("archive_size", 0) if _engine() != "sqlite" else 0
+    if not size:
+        return
+
+    # Only the committed part of the archive, as recorded in the header
+    with _archive_path().open("rb") as f:
+        content = io.BytesIO(f.read(size))
+    with gzip.open(content, "rt") as f:
+        for line in f:
+            record = json.loads(line)
+            if priority is None or record["priority"] == priority.value:
+                yield record
+
+
+def archived_counts() -> dict[str, int]:
+    """Return the number of archived tasks per priority."""
+    if _engine() == "sqlite":
+        return {}
+    return _read_header().get("archived", {})
+
+
 def load_tasks() -> list[Task]:
     """Load all tasks from storage."""
-    _ensure_storage_exists()
-    data = json.loads(STORAGE_PATH.read_text())
-    return [_dict_to_task(t) for t in data["tasks"]]
+    return list(iter_tasks())
 
 
+@_exclusive
 def save_tasks(tasks: list[Task]) -> None:
-    """Save all tasks to storage."""
-    _ensure_storage_exists()
-    data = {"version": 1, "tasks": [_task_to_dict(t) for t in tasks]}
-    STORAGE_PATH.write_text(json.dumps(data, indent=2))
+    """Save all tasks to storage, assigning IDs to new ones."""
+    next_id = _next_id()
+    for task in tasks:
+        if task.id is None:
+            task.id = next_id
+        next_id = max(next_id, task.id + 1)
+
+    records = [task_to_dict(t) for t in tasks]
+    if _engine() == "sqlite":
+        _sqlite().replace_all(_db_path(), records, next_id)
+        return
+
+    data = {"version": 1, "next_id": next_id, "tasks": {r["id"]: r for r in records}}
+    # The archive is kept, so its header entries carry over
+    header = _read_header()
+    data.update((key, header[key]) for key in ARCHIVE_KEYS if key in header)
+    _write_document(data)
 
 
 def add_task(task: Task) -> None:
-    """Add a task and save to storage."""
-    tasks = load_tasks()
-    tasks.append(task)
-    save_tasks(tasks)
+    """Add a task and save to storage, assigning its ID."""
+    add_tasks([task])
+
+
+@_exclusive
+def add_tasks(tasks: list[Task]) -> None:
+    """Add tasks in a single storage transaction, assigning their IDs."""
+    next_id = _next_id()
+    for task in tasks:
+        task.id = next_id
+        next_id += 1
+    ops = [{"op": "add", "id": t.id, "task": task_to_dict(t)} for t in tasks]
+    _write_ops(ops)
+    _remember(
+        "Added",
+        [op["task"] for op in ops],
+        undo=[{"op": "delete", "id": op["id"]} for op in ops],
+    )
+
+
+def import_tasks(
+    tasks: Iterable[Task], batch_size: int = IMPORT_BATCH
+) -> Iterator[int]:
+    """Add a stream of tasks batch by batch, yielding the number added so far.
+
+    Only one batch is held at a time. Batches are appended to the journal and
+    folded into the snapshot once at the end, so a large import costs one
+    rewrite rather than one per batch; SQLite commits each batch.
+    """
+    journal = _engine() == "journal" or _json_journals()
+    tasks = iter(tasks)
+    added = 0
+    with _locked():
+        next_id = _next_id()
+        try:
+            while batch := list(islice(tasks, batch_size)):
+                for task in batch:
+                    task.id = next_id
+                    next_id += 1
+                ops = [
+                    {"op": "add", "id": t.id, "task": task_to_dict(t)} for t in batch
+                ]
+                if _engine() == "sqlite":
+                    _sqlite().commit(_db_path(), ops)
+                elif journal:
+                    _write_journal(ops)
+                else:
+                    _commit(*ops)
+                added += len(batch)
+                yield added
+        finally:
+            if journal and added:
+                compact()
+
+
+def _sort_key(sort: list[str]) -> Callable[[dict], tuple]:
+    """Build a record sort key from SORT_KEYS names, ties broken by ID."""
+    keys = [SORT_KEYS[name] for name in sort]
+    return lambda record: (*(key(record) for key in keys), record["id"])
+
+
+def _page(
+    records: Iterator[dict],
+    offset: int,
+    limit: int | None,
+    sort: list[str] | None = None,
+) -> Iterator[dict]:
+    """Skip offset records and stop after limit, before anything is decoded.
+
+    With sort, a page is picked with a bounded heap rather than a full sort.
+    """
+    if not sort:
+        return islice(records, offset, None if limit is None else offset + limit)
+
+    key = _sort_key(sort)
+    with profiling.span("sort"):
+        if limit is None:
+            return iter(sorted(records, key=key)[offset:])
+        return iter(heapq.nsmallest(offset + limit, records, key=key)[offset:])
+
+
+def iter_records(
+    done: bool | None = None,
+    priority: Priority | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+    sort: list[str] | None = None,
+    archived: bool = False,
+) -> Iterator[dict]:
+    """Stream raw task records matching the filters without decoding them.
+
+    sort names SORT_KEYS to order by; otherwise records come in ID order.
+    With archived, matching tasks from the archive come first.
+    """
+    if _engine() == "sqlite":
+        records = _sqlite().iter_records(
+            _db_path(),
+            done=done,
+            priority=priority,
+            offset=offset,
+            limit=limit,
+            sort=sort,
+        )
+        return profiling.timed("read", records)
+
+    records = profiling.timed(
+        "filter",
+        (
+            record
+            for record in _iter_document(done, priority)
+            if (done is None or record["done"] == done)
+            and (priority is None or record["priority"] == priority.value)
+        ),
+    )
+    if archived and done is not False:
+        records = chain(iter_archive(priority), records)
+    return _page(records, offset, limit, sort)
+
+
+def iter_tasks(
+    done: bool | None = None,
+    priority: Priority | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+    sort: list[str] | None = None,
+    archived: bool = False,
+) -> Iterator[Task]:
+    """Stream tasks matching the filters, decoding only the requested page."""
+    records = iter_records(
+        done=done,
+        priority=priority,
+        offset=offset,
+        limit=limit,
+        sort=sort,
+        archived=archived,
+    )
+    return profiling.timed("model", map(dict_to_task, records))
+
+
+def load_table(
+    done: bool | None = None,
+    priority: Priority | None = None,
+) -> TaskTable:
+    """Load matching tasks straight into a compact columnar TaskTable."""
+    table = TaskTable()
+    for record in iter_records(done=done, priority=priority):
+        due_date = record["due_date"]
+        table.append(
+            record["id"],
+            record["title"],
+            record["done"],
+            record["priority"],
+            datetime.fromisoformat(record["created_at"]),
+            datetime.fromisoformat(due_date) if due_date else None,
+            record.get("recur"),
+        )
+    return table
+
+
+def _is_due(record: dict | None, start: int | None, end: int) -> bool:
+    """Return whether a record is a pending task due in [start, end)."""
+    if not record or record["done"] or not record["due_date"]:
+        return False
+    due = _due_key(record)
+    return (start is None or due >= start) and due < end
+
+
+def due_records(end: datetime, start: datetime | None = None) -> list[dict]:
+    """Return raw records of pending tasks due in [start, end), soonest first.
+
+    Range lookups go through the due index, so only matching records are read.
+    Recurring tasks are expanded into their occurrences in the range.
+    """
+    if _engine() == "sqlite":
+        records = _sqlite().due_records(
+            _db_path(), end.isoformat(), start.isoformat() if start else None
+        )
+        recurring = _sqlite().recurring_records(_db_path())
+    else:
+        records = _due_records(end, start)
+        recurring = _recurring_records()
+
+    records = [record for record in records if not record.get("recur")]
+    records.extend(occurrence_records(recurring, end, start))
+    return sorted(records, key=lambda r: (_due_key(r), r["id"]))
+
+
+def _due_records(end: datetime, start: datetime | None) -> list[dict]:
+    """Return records of pending tasks due in [start, end) from the JSON store."""
+    start_us = None if start is None else to_epoch_us(start)
+    end_us = to_epoch_us(end)
+    _ensure_storage_exists()
+    task_ids = _read_due_index(start_us, end_us)
+    if task_ids is None:
+        # Missing or stale index: fall back to a full scan
+        records = [
+            record
+            for record in iter_records(done=False)
+            if _is_due(record, start_us, end_us)
+        ]
+    else:
+        # Tasks changed since the last snapshot may have entered or left the range
+        pending = defaultdict(list)
+        for op in _read_journal():
+            pending[op["id"]].append(op)
+        task_ids = list(dict.fromkeys([*task_ids, *pending]))
+        snapshot = _indexed_records(task_ids)
+        records = []
+        for task_id in task_ids:
+            record = _replay(task_id, snapshot.get(task_id), pending[task_id])
+            if _is_due(record, start_us, end_us):
+                records.append(record)
+    return records
+
+
+def _recurs(record: dict | None) -> bool:
+    """Return whether a record is a pending recurring task."""
+    return bool(record and record.get("recur") and not record["done"])
+
+
+def _recurring_records() -> list[dict]:
+    """Return the pending recurring tasks listed in the snapshot header."""
+    _ensure_storage_exists()
+    task_ids = set(_read_header().get("recurring", ()))
+    for op in _read_journal():
+        if op["op"] in ("add", "update") and op["task"].get("recur"):
+            task_ids.add(op["id"])
+    return [r for r in _found_records(sorted(task_ids)).values() if _recurs(r)]
+
+
+def occurrence_records(
+    recurring: Iterable[dict], end: datetime, start: datetime | None = None
+) -> Iterator[dict]:
+    """Yield a record per occurrence of recurring tasks in [start, end).
+
+    Missed occurrences are not repeated: without a start, each task is only
+    yielded once, at its next occurrence.
+    """
+    for record in recurring:
+        due = datetime.fromisoformat(record["due_date"])
+        if start is None:
+            if due < end:
+                yield record
+            continue
+        for when in recurrence.occurrences(record["recur"], due, start, end):
+            yield {**record, "due_date": when.isoformat()}
+
+
+def due_tasks(end: datetime, start: datetime | None = None) -> list[Task]:
+    """Return pending tasks due in [start, end), soonest first."""
+    return [dict_to_task(record) for record in due_records(end, start)]
+
+
+def search_records(
+    query: str, done: bool | None = None, limit: int | None = None
+) -> list[dict]:
+    """Return raw records whose titles match every query term, best first.
+
+    Terms match whole words or their prefixes, looked up in the search index;
+    only the records that are returned are read.
+    """
+    terms = search.query_terms(query)
+    if not terms:
+        return []
+    if _engine() == "sqlite":
+        return _sqlite().search_records(_db_path(), terms, done, limit)
+
+    _ensure_storage_exists()
+    scores = search.lookup(_search_path(), terms, _snapshot_key())
+    if scores is None:
+        # Missing or stale index: fall back to a full scan
+        records = {}
+        scores = {}
+        for record in iter_records(done=done):
+            if score := search.score(record["title"], terms):
+                records[record["id"]] = record
+                scores[record["id"]] = score
+        return [records[task_id] for task_id in search.rank(scores)[:limit]]
+
+    # Tasks changed since the last snapshot are matched on their current title
+    pending = defaultdict(list)
+    for op in _read_journal():
+        pending[op["id"]].append(op)
+    snapshot = _indexed_records(list(pending))
+    changed = {}
+    for task_id, ops in pending.items():
+        scores.pop(task_id, None)
+        record = _replay(task_id, snapshot.get(task_id), ops)
+        if record and (score := search.score(record["title"], terms)):
+            changed[task_id] = record
+            scores[task_id] = score
+
+    # Read the ranked matches in batches until the limit is reached
+    ranked = search.rank(scores)
+    results = []
+    for start in range(0, len(ranked), SEARCH_BATCH):
+        batch = ranked[start : start + SEARCH_BATCH]
+        records = _indexed_records([i for i in batch if i not in changed])
+        for task_id in batch:
+            record = changed.get(task_id) or records[task_id]
+            if done is None or record["done"] == done:
+                results.append(record)
+                if len(results) == limit:
+                    return results
+    return results
+
+
+def search_tasks(
+    query: str, done: bool | None = None, limit: int | None = None
+) -> list[Task]:
+    """Return tasks whose titles match every query term, best first."""
+    return [dict_to_task(record) for record in search_records(query, done, limit)]
 
 
 def get_tasks(
@@ -63,19 +1269,591 @@ def get_tasks(
     priority: Priority | None = None,
 ) -> list[Task]:
     """Get tasks with optional filtering."""
-    tasks = load_tasks()
+    return list(iter_tasks(done=done, priority=priority))
 
-    if done is not None:
-        tasks = [t for t in tasks if t.done == done]
 
-    if priority is not None:
-        tasks = [t for t in tasks if t.priority == priority]
+def _journal_counts(counts: dict) -> dict:
+    """Apply the journal tail to snapshot counters.
+
+    Only the records the journal touches are read, through the id index.
+    """
+    ops = _read_journal()
+    records = _indexed_records(list(dict.fromkeys(op["id"] for op in ops)))
+    for op in ops:
+        _apply(records, op, counts)
+    return counts
 
-    return tasks
+
+def task_counts() -> dict[str, dict[str, int]]:
+    """Return pending/done counts per priority from the maintained counters."""
+    if _engine() == "sqlite":
+        return _sqlite().counts(_db_path())
+
+    counts = _read_header().get("counts")
+    if counts is None:
+        return recount_tasks()  # Snapshot written before counters existed
+    return _journal_counts(counts)
+
+
+def count_from(
+    counts: dict[str, dict[str, int]],
+    done: bool | None = None,
+    priority: Priority | None = None,
+    archived: dict[str, int] | None = None,
+) -> int:
+    """Add up the counters matching the filters, plus any archived tasks."""
+    priorities = [priority.value] if priority else list(counts)
+    statuses = ["pending", "done"] if done is None else ["done" if done else "pending"]
+    total = sum(counts[p][status] for p in priorities for status in statuses)
+    if archived and done is not False:
+        total += sum(archived.get(p, 0) for p in priorities)
+    return total
+
+
+def count_tasks(
+    done: bool | None = None,
+    priority: Priority | None = None,
+    archived: bool = False,
+) -> int:
+    """Count tasks matching the filters from the maintained counters."""
+    return count_from(
+        task_counts(),
+        done=done,
+        priority=priority,
+        archived=archived_counts() if archived else None,
+    )
+
+
+def recount_tasks() -> dict[str, dict[str, int]]:
+    """Recompute the counters with a full pass over the store."""
+    return _tally(iter_records())
+
+
+@_exclusive
+def repair_counts() -> None:
+    """Rebuild the maintained counters from the tasks themselves."""
+    if _engine() == "sqlite":
+        _sqlite().rebuild_counts(_db_path())
+        return
+
+    data = _read_document()
+    data["counts"] = _tally(data["tasks"].values())
+    _write_document(data)
+
+
+def _find_records(task_ids: list[int], data: dict | None = None) -> dict[int, dict]:
+    """Return raw records by ID without loading the whole store.
+
+    Raises KeyError with every missing ID as its arguments.
+    """
+    if _engine() == "sqlite":
+        records = _sqlite().get_records(_db_path(), task_ids)
+    elif data is not None:
+        records = {i: data["tasks"][i] for i in task_ids if i in data["tasks"]}
+    else:
+        # Look the tasks up in the snapshot, then replay their journal entries
+        pending = defaultdict(list)
+        for op in _read_journal():
+            pending[op["id"]].append(op)
+        snapshot = _indexed_records(task_ids)
+        records = {}
+        for task_id in task_ids:
+            record = _replay(task_id, snapshot.get(task_id), pending[task_id])
+            if record:
+                records[task_id] = record
+
+    missing = [task_id for task_id in task_ids if task_id not in records]
+    if missing:
+        raise KeyError(*missing)
+    return records
+
+
+def get_task(task_id: int) -> Task:
+    """Get a single task by its ID."""
+    return dict_to_task(_find_records([task_id])[task_id])
+
+
+def find_tasks(task_ids: list[int]) -> list[Task]:
+    """Get tasks by their IDs, raising KeyError with every missing ID."""
+    task_ids = list(dict.fromkeys(task_ids))
+    records = _find_records(task_ids)
+    return [dict_to_task(records[task_id]) for task_id in task_ids]
+
+
+def complete_task(task_id: int) -> Task:
+    """Mark a task as done by its ID and return it."""
+    return complete_tasks([task_id])[0]
+
+
+def _json_journals() -> bool:
+    """Return whether the JSON engine can journal writes instead of rewriting.
+
+    Adds, deletes and completions are logged instead of rewriting the
+    snapshot, and folded in by the next full write or compaction. That needs
+    the lock: a writer's generation check can't see journal appends.
+    """
+    return _engine() == "json" and fcntl is not None
+
+
+@_exclusive
+def complete_tasks(task_ids: list[int]) -> list[Task]:
+    """Mark tasks as done in a single storage transaction and return them.
+
+    Only the affected records are read and a small journal entry is written,
+    whatever the size of the store.
+    """
+    task_ids = list(dict.fromkeys(task_ids))
+    rewrite = _engine() == "json" and not _json_journals()
+    data = _read_document() if rewrite else None
+    records = _find_records(task_ids, data)
+
+    pending = [records[i] for i in task_ids if not records[i]["done"]]
+    next_id = max(data["next_id"], _reserved_id()) if data else _next_id()
+    ops, undo, completed = _completion(
+        [records[task_id] for task_id in task_ids], next_id
+    )
+    if _json_journals():
+        _append_journal(ops)
+    else:
+        _commit(*ops, data=data)
+    _remember("Completed", pending, undo=undo)
+    return [dict_to_task(record) for record in completed]
+
+
+def _completion(
+    records: list[dict], next_id: int
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """Return the ops completing records, the ops undoing them, and the results.
+
+    A pending recurring task is not marked done: its occurrence is stored as a
+    new completed task, with IDs from next_id, and the task moves on to its
+    next occurrence, skipping any that were missed.
+    """
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    ops, undo, completed = [], [], []
+    for record in records:
+        task_id = record["id"]
+        if record["done"] or not record.get("recur"):
+            ops.append({"op": "done", "id": task_id})
+            if not record["done"]:
+                undo.append({"op": "reopen", "id": task_id})
+            completed.append({**record, "done": True})
+            continue
+
+        occurrence = {**record, "id": next_id, "done": True}
+        occurrence["created_at"] = datetime.now().isoformat()
+        del occurrence["recur"]
+        due = datetime.fromisoformat(record["due_date"])
+        moved = {
+            **record,
+            "due_date": recurrence.advance(record["recur"], due, today).isoformat(),
+        }
+        ops.append({"op": "add", "id": next_id, "task": occurrence})
+        ops.append({"op": "update", "id": task_id, "task": moved})
+        undo.append({"op": "delete", "id": next_id})
+        undo.append({"op": "update", "id": task_id, "task": record})
+        completed.append(occurrence)
+        next_id += 1
+    return ops, undo, completed
 
 
 def delete_task(task_id: int) -> None:
-    """Delete a task by its 1-indexed ID."""
-    tasks = load_tasks()
-    del tasks[task_id - 1]
-    save_tasks(tasks)
+    """Delete a task by its ID."""
+    delete_tasks([task_id])
+
+
+@_exclusive
+def delete_tasks(task_ids: list[int]) -> list[Task]:
+    """Delete tasks in a single storage transaction and return them."""
+    task_ids = list(dict.fromkeys(task_ids))
+    rewrite = _engine() == "json" and not _json_journals()
+    data = _read_document() if rewrite else None
+    records = _find_records(task_ids, data)
+
+    tasks = [dict_to_task(records[task_id]) for task_id in task_ids]
+    ops = [{"op": "delete", "id": task_id} for task_id in task_ids]
+    if _json_journals():
+        _append_journal(ops)
+    else:
+        _commit(*ops, data=data)
+    _remember(
+        "Deleted",
+        [records[task_id] for task_id in task_ids],
+        undo=[{"op": "add", "id": i, "task": records[i]} for i in task_ids],
+    )
+    return tasks
+
+
+def _remember(verb: str, records: list[dict], undo: list[dict]) -> None:
+    """Record a change on the undo stack, forgetting any changes undone before it.
+
+    undo holds the operations that reverse the change, so undoing never needs
+    a copy of the store.
+    """
+    size = _history_size()
+    if not size or not undo:
+        return
+    if len(records) == 1:
+        summary = f"{verb} '{records[0]['title']}'"
+    else:
+        summary = f"{verb} {len(records)} tasks"
+    history.push(_undo_path(), {"summary": summary, "ops": undo}, size)
+    _redo_path().unlink(missing_ok=True)
+
+
+def _step(
+    source: Path,
+    target: Path,
+    find: Callable[[list[int]], dict[int, dict]],
+    apply: Callable[[list[dict]], None],
+) -> str | None:
+    """Apply the newest change on one history stack and move its inverse to the other.
+
+    Returns the change's summary, or None if the stack is empty. Operations on
+    tasks that have since been archived or restored are skipped.
+    """
+    entry = history.pop(source)
+    if entry is None:
+        return None
+
+    records = find(list(dict.fromkeys(op["id"] for op in entry["ops"])))
+    ops = [op for op in entry["ops"] if (op["op"] == "add") != (op["id"] in records)]
+    inverse = [
+        {"op": REVERSE_OPS[op["op"]], "id": op["id"], "task": records[op["id"]]}
+        if op["op"] in REVERSE_OPS
+        else {"op": INVERSE_OPS[op["op"]], "id": op["id"]}
+        for op in ops
+    ]
+    if ops:
+        apply(ops)
+    history.push(target, {**entry, "ops": inverse}, max(_history_size(), 1))
+    return entry["summary"]
+
+
+def _found_records(task_ids: list[int]) -> dict[int, dict]:
+    """Return raw records for the task IDs that are in the store."""
+    try:
+        return _find_records(task_ids)
+    except KeyError as e:
+        found = [task_id for task_id in task_ids if task_id not in e.args]
+        return _find_records(found) if found else {}
+
+
+def _write_ops(ops: list[dict]) -> None:
+    """Persist operations, journaling them when the JSON engine can."""
+    if _json_journals():
+        _append_journal(ops)
+    else:
+        _commit(*ops)
+
+
+@_exclusive
+def undo() -> str | None:
+    """Reverse the last change to the store and return its summary."""
+    return _step(_undo_path(), _redo_path(), _found_records, _write_ops)
+
+
+@_exclusive
+def redo() -> str | None:
+    """Repeat the last undone change and return its summary."""
+    return _step(_redo_path(), _undo_path(), _found_records, _write_ops)
+
+
+@_exclusive
+def migrate_to_sqlite(force: bool = False) -> int:
+    """Import the JSON store into the SQLite database and return the task count.
+
+    The database has no archive, so archived tasks are imported as ordinary
+    completed tasks.
+    """
+    if not force and _db_path().exists() and _sqlite().count(_db_path()):
+        raise FileExistsError(f"{_db_path()} already contains tasks")
+
+    data = _read_document()
+    records = sorted(
+        chain(data["tasks"].values(), iter_archive()), key=lambda r: r["id"]
+    )
+    _sqlite().replace_all(_db_path(), records, data["next_id"])
+    return len(records)
+
+
+def _export_document() -> dict:
+    """Build a full document from whichever engine is in use.
+
+    Archived tasks are included as ordinary completed tasks, so the document
+    holds the whole store without the archive file next to it.
+    """
+    records = sorted(iter_records(archived=True), key=lambda r: r["id"])
+    records = {record["id"]: record for record in records}
+    return {"version": 1, "next_id": _next_id(), "tasks": records}
+
+
+def export_snapshot(fmt: str) -> bytes:
+    """Serialize the whole store in the given snapshot format."""
+    content, _ = _encode_snapshot(_export_document(), fmt)
+    return content
+
+
+@_exclusive
+def convert_store(fmt: str) -> None:
+    """Rewrite the task store snapshot in the given format."""
+    _write_document(_read_document(), fmt)
+
+
+class MemoryStore:
+    """The decoded task store held in memory, with write-behind persistence.
+
+    Changes apply to memory at once and are buffered until flush() writes them
+    in one storage transaction. Used by the daemon to serve repeated commands
+    without re-reading the store.
+    """
+
+    def __init__(self) -> None:
+        self.pending: list[dict] = []
+        self._load()
+
+    def _signature(self) -> tuple:
+        """Fingerprint the files behind the store to spot outside changes."""
+        signature = []
+        for path in (STORAGE_PATH, _journal_path(), _db_path(), _archive_path()):
+            try:
+                stat = path.stat()
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _load(self) -> None:
+        """Read the whole store into memory."""
+        self.records = {record["id"]: record for record in iter_records()}
+        self.unordered = False
+        self.counts = _tally(self.records.values())
+        self.due_index = sorted(
+            (_due_key(record), task_id)
+            for task_id, record in self.records.items()
+            if _is_due(record, None, DUE_INDEX_END)
+        )
+        self.recurring = {
+            task_id for task_id, record in self.records.items() if _recurs(record)
+        }
+        self.words = defaultdict(set)
+        for task_id, record in self.records.items():
+            for token in search.tokenize(record["title"]):
+                self.words[token].add(task_id)
+        self.vocabulary = sorted(self.words)
+        self.next_id = _next_id()
+        self.reserved = self.next_id
+        self.signature = self._signature()
+
+    def _index_words(self, record: dict | None, add: bool) -> None:
+        """Add a record's title to the search index, or remove it."""
+        if not record:
+            return
+        for token in search.tokenize(record["title"]):
+            if add:
+                if token not in self.words:
+                    insort(self.vocabulary, token)
+                self.words[token].add(record["id"])
+            else:
+                self.words[token].discard(record["id"])
+                if not self.words[token]:
+                    del self.words[token]
+                    del self.vocabulary[bisect_left(self.vocabulary, token)]
+
+    def refresh(self) -> None:
+        """Reload if another process changed the store since the last load."""
+        if self._signature() != self.signature:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered changes, replaying them on any outside changes."""
+        changed = self._signature() != self.signature
+        if self.pending:
+            _commit(*self.pending)
+            self.pending = []
+            # Compaction may have moved completed tasks to the archive
+            changed = changed or self._signature()[-1] != self.signature[-1]
+        self._release()
+        if changed:
+            self._load()
+        else:
+            self.signature = self._signature()
+
+    def _reserve(self, count: int) -> None:
+        """Make sure the next count IDs are reserved for this store.
+
+        IDs are handed out in memory before the adds are flushed, so they are
+        claimed under the lock in a sidecar file that direct writers allocate
+        past; otherwise their tasks could take the same IDs in the meantime.
+        """
+        if self.next_id + count <= self.reserved:
+            return
+        with _locked():
+            self.next_id = max(self.next_id, _stored_next_id())
+            self.reserved = self.next_id + max(count, ID_BLOCK)
+            _write_atomic(_reserve_path(), str(self.reserved).encode())
+
+    def _release(self) -> None:
+        """Give back the unused reserved IDs once every add is flushed."""
+        if self.reserved > self.next_id or _reserve_path().exists():
+            with _locked():
+                _reserve_path().unlink(missing_ok=True)
+            self.reserved = self.next_id
+
+    def _apply(self, ops: list[dict]) -> None:
+        """Apply operations in memory and buffer them for the next flush."""
+        for op in ops:
+            before = self.records.get(op["id"])
+            if _is_due(before, None, DUE_INDEX_END):
+                del self.due_index[
+                    bisect_left(self.due_index, (_due_key(before), op["id"]))
+                ]
+            if op["op"] not in ("done", "reopen"):
+                self._index_words(before, add=False)
+            if op["op"] == "add" and op["id"] < next(reversed(self.records), 0):
+                self.unordered = True
+            _apply(self.records, op, self.counts)
+            after = self.records.get(op["id"])
+            if op["op"] not in ("done", "reopen"):
+                self._index_words(after, add=True)
+            if _is_due(after, None, DUE_INDEX_END):
+                insort(self.due_index, (_due_key(after), op["id"]))
+            if _recurs(after):
+                self.recurring.add(op["id"])
+            else:
+                self.recurring.discard(op["id"])
+        self.pending.extend(ops)
+
+    def _found(self, task_ids: list[int]) -> dict[int, dict]:
+        """Return copies of the records for the task IDs that exist."""
+        return {i: dict(self.records[i]) for i in task_ids if i in self.records}
+
+    def _find(self, task_ids: list[int]) -> list[dict]:
+        """Return raw records by ID, raising KeyError with every missing ID."""
+        task_ids = list(dict.fromkeys(task_ids))
+        missing = [task_id for task_id in task_ids if task_id not in self.records]
+        if missing:
+            raise KeyError(*missing)
+        return [dict(self.records[task_id]) for task_id in task_ids]
+
+    def add(self, records: list[dict]) -> list[int]:
+        """Add raw task records and return the IDs assigned to them."""
+        self._reserve(len(records))
+        task_ids = list(range(self.next_id, self.next_id + len(records)))
+        self.next_id += len(records)
+        ops = [
+            {"op": "add", "id": task_id, "task": {**record, "id": task_id}}
+            for task_id, record in zip(task_ids, records)
+        ]
+        self._apply(ops)
+        _remember(
+            "Added",
+            [op["task"] for op in ops],
+            undo=[{"op": "delete", "id": task_id} for task_id in task_ids],
+        )
+        return task_ids
+
+    def find(self, task_ids: list[int]) -> list[dict]:
+        """Return raw records by ID."""
+        return self._find(task_ids)
+
+    def complete(self, task_ids: list[int]) -> list[dict]:
+        """Mark tasks as done and return their records."""
+        records = self._find(task_ids)
+        pending = [record for record in records if not record["done"]]
+        self._reserve(len(records))
+        ops, undo, completed = _completion(records, self.next_id)
+        self.next_id = max([self.next_id, *(op["id"] + 1 for op in ops)])
+        self._apply(ops)
+        _remember("Completed", pending, undo=undo)
+        return completed
+
+    def delete(self, task_ids: list[int]) -> list[dict]:
+        """Delete tasks and return their records."""
+        records = self._find(task_ids)
+        ops = [{"op": "delete", "id": record["id"]} for record in records]
+        self._apply(ops)
+        _remember(
+            "Deleted",
+            records,
+            undo=[{"op": "add", "id": r["id"], "task": r} for r in records],
+        )
+        return records
+
+    def undo(self) -> str | None:
+        """Reverse the last change and return its summary."""
+        return _step(_undo_path(), _redo_path(), self._found, self._apply)
+
+    def redo(self) -> str | None:
+        """Repeat the last undone change and return its summary."""
+        return _step(_redo_path(), _undo_path(), self._found, self._apply)
+
+    def iter_records(
+        self,
+        done: bool | None = None,
+        priority: Priority | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+        sort: list[str] | None = None,
+        archived: bool = False,
+    ) -> Iterator[dict]:
+        """Stream raw records matching the filters."""
+        if self.unordered:
+            # Put tasks restored by undo back in ID order
+            self.records = dict(sorted(self.records.items()))
+            self.unordered = False
+        records = (
+            record
+            for record in self.records.values()
+            if (done is None or record["done"] == done)
+            and (priority is None or record["priority"] == priority.value)
+        )
+        if archived and done is not False:
+            records = chain(iter_archive(priority), records)
+        return _page(records, offset, limit, sort)
+
+    def due(self, end: datetime, start: datetime | None = None) -> list[dict]:
+        """Return records of pending tasks due in [start, end), soonest first."""
+        index = self.due_index
+        low = 0 if start is None else bisect_left(index, (to_epoch_us(start),))
+        high = bisect_left(index, (to_epoch_us(end),))
+        records = [self.records[task_id] for _, task_id in self.due_index[low:high]]
+        records = [record for record in records if not record.get("recur")]
+        recurring = (self.records[task_id] for task_id in sorted(self.recurring))
+        records.extend(occurrence_records(recurring, end, start))
+        return sorted(records, key=lambda r: (_due_key(r), r["id"]))
+
+    def search(
+        self, query: str, done: bool | None = None, limit: int | None = None
+    ) -> list[dict]:
+        """Return records whose titles match every query term, best first."""
+        matches = []
+        for term in search.query_terms(query):
+            postings = []
+            i = bisect_left(self.vocabulary, term)
+            while i < len(self.vocabulary) and self.vocabulary[i].startswith(term):
+                token = self.vocabulary[i]
+                postings.extend((token, task_id) for task_id in self.words[token])
+                i += 1
+            matches.append(search.match(term, postings))
+
+        records = (
+            self.records[task_id]
+            for task_id in search.rank(search.combine(matches))
+            if done is None or self.records[task_id]["done"] == done
+        )
+        return list(islice(records, limit))
+
+    def count(
+        self,
+        done: bool | None = None,
+        priority: Priority | None = None,
+        archived: bool = False,
+    ) -> int:
+        """Count records matching the filters from the in-memory counters."""
+        return count_from(
+            self.counts,
+            done=done,
+            priority=priority,
+            archived=archived_counts() if archived else None,
+        )
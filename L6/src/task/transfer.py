@@ -0,0 +1,128 @@
+"""Line-based task formats for bulk import and export.
+
+Tasks are encoded and decoded one record at a time, so moving any number of
+them takes constant memory: JSON Lines holds one task record per line, CSV
+one row per task under a header of FIELDS.
+"""
+
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import TextIO
+
+from task import recurrence
+from task.models import Task
+from task.storage import dict_to_task
+
+FORMATS = ("jsonl", "csv")
+
+FIELDS = ("id", "title", "done", "priority", "created_at", "due_date", "recur")
+
+# CSV spellings of done, compared case-insensitively
+TRUE = ("true", "1", "yes")
+FALSE = ("false", "0", "no", "")
+
+
+def format_for(name: str) -> str:
+    """Guess a file's format from its name, defaulting to JSON Lines."""
+    return "csv" if name.lower().endswith(".csv") else "jsonl"
+
+
+def write(records: Iterable[dict], fmt: str, out: TextIO) -> int:
+    """Write raw task records to out and return how many were written."""
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(FIELDS)
+        for record in records:
+            row = [record.get(field) for field in FIELDS]
+            row[2] = "true" if record["done"] else "false"
+            writer.writerow(row)
+            count += 1
+    else:
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+            count += 1
+    return count
+
+
+def _parse_done(value: str) -> bool:
+    """Parse a CSV done column."""
+    value = value.strip().lower()
+    if value not in TRUE + FALSE:
+        raise ValueError(f"invalid done value: {value!r}")
+    return value in TRUE
+
+
+def _parse_time(value: str | None, field: str) -> str | None:
+    """Parse an imported timestamp, converting UTC offsets to naive local time.
+
+    Stored timestamps are naive, and mixing in aware ones breaks every later
+    comparison, so offsets are resolved here.
+    """
+    if not value:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"invalid {field}: {value!r}")
+    try:
+        when = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"invalid {field}: {value!r}") from None
+    if when.tzinfo is not None:
+        when = when.astimezone().replace(tzinfo=None)
+    return when.isoformat()
+
+
+def _to_task(record: dict) -> Task:
+    """Build a task from an imported record, filling in optional fields."""
+    if not isinstance(record, dict):
+        raise ValueError("expected an object")
+    title = record.get("title")
+    if not isinstance(title, str) or not title.strip():
+        raise ValueError("title cannot be empty")
+    done = record.get("done") or False
+    if isinstance(done, str):
+        done = _parse_done(done)
+    due_date = _parse_time(record.get("due_date"), "due_date")
+    recur = record.get("recur") or None
+    if recur is not None:
+        recur = recurrence.parse(recur)
+        if not due_date:
+            raise ValueError("recurring task needs a due_date")
+        recur = recurrence.anchor(recur, datetime.fromisoformat(due_date))
+
+    return dict_to_task(
+        {
+            "id": None,  # Imported tasks are given new IDs
+            "title": title.strip(),
+            "done": bool(done),
+            "priority": (record.get("priority") or "low").lower(),
+            "created_at": _parse_time(record.get("created_at"), "created_at")
+            or datetime.now().isoformat(),
+            "due_date": due_date,
+            "recur": recur,
+        }
+    )
+
+
+def read(lines: TextIO, fmt: str) -> Iterator[Task]:
+    """Decode tasks one at a time, raising ValueError naming a bad line.
+
+    Only title is required; imported tasks get new IDs.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        rows = ((reader.line_num, row) for row in reader)
+    else:
+        rows = (
+            (number, line)
+            for number, line in enumerate(lines, start=1)
+            if line.strip()
+        )
+
+    for number, row in rows:
+        try:
+            yield _to_task(json.loads(row) if fmt == "jsonl" else row)
+        except (ValueError, TypeError, AttributeError) as e:
+            raise ValueError(f"Line {number}: {e}") from None
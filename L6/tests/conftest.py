@@ -28,8 +28,13 @@ def temp_storage(tmp_path, monkeypatch):
 
 
 @pytest.fixture
-def sample_data(temp_storage):
-    """Pre-populated storage with sample tasks."""
+def sample_data(temp_storage, monkeypatch):
+    """Pre-populated storage with sample tasks.
+
+    The completed sample task is old enough to be archived by the next write,
+    so archiving is turned off; archive tests turn it back on.
+    """
+    monkeypatch.setenv("TASK_ARCHIVE_DAYS", "off")
     data = {
         "version": 1,
         "tasks": [
@@ -1,10 +1,18 @@
 """Tests for the add command."""
 
 import json
+from datetime import datetime
 
+from task import storage
 from task.commands import app
 
 
+def _saved(path):
+    """Fold journaled adds into the snapshot and return its contents."""
+    storage.compact()
+    return json.loads(path.read_text())
+
+
 class TestAdd:
     """Test suite for add command."""
 
@@ -16,7 +24,7 @@ class TestAdd:
         assert "Added 'Buy milk'" in result.output
 
         # Verify task was saved
-        data = json.loads(temp_storage.read_text())
+        data = _saved(temp_storage)
         assert len(data["tasks"]) == 1
         assert data["tasks"][0]["title"] == "Buy milk"
         assert data["tasks"][0]["priority"] == "low"
@@ -29,7 +37,7 @@ class TestAdd:
         assert result.exit_code == 0
         assert "Added 'Important task'" in result.output
 
-        data = json.loads(temp_storage.read_text())
+        data = _saved(temp_storage)
         assert data["tasks"][0]["priority"] == "high"
 
     def test_adds_task_with_priority_short_option(self, runner, temp_storage):
@@ -37,7 +45,7 @@ class TestAdd:
         result = runner.invoke(app, ["add", "Medium priority task", "-p", "medium"])
 
         assert result.exit_code == 0
-        data = json.loads(temp_storage.read_text())
+        data = _saved(temp_storage)
         assert data["tasks"][0]["priority"] == "medium"
 
     def test_adds_task_with_due_date_long_option(self, runner, temp_storage):
@@ -45,7 +53,7 @@ class TestAdd:
         result = runner.invoke(app, ["add", "Finish project", "--due", "2025-12-31"])
 
         assert result.exit_code == 0
-        data = json.loads(temp_storage.read_text())
+        data = _saved(temp_storage)
         assert data["tasks"][0]["due_date"] == "2025-12-31T00:00:00"
 
     def test_adds_task_with_due_date_short_option(self, runner, temp_storage):
@@ -53,7 +61,7 @@ class TestAdd:
         result = runner.invoke(app, ["add", "Meeting", "-d", "2025-06-15"])
 
         assert result.exit_code == 0
-        data = json.loads(temp_storage.read_text())
+        data = _saved(temp_storage)
         assert data["tasks"][0]["due_date"] == "2025-06-15T00:00:00"
 
     def test_adds_task_with_all_options(self, runner, temp_storage):
@@ -63,7 +71,7 @@ class TestAdd:
         )
 
         assert result.exit_code == 0
-        data = json.loads(temp_storage.read_text())
+        data = _saved(temp_storage)
         assert data["tasks"][0]["title"] == "Complete assignment"
         assert data["tasks"][0]["priority"] == "high"
         assert data["tasks"][0]["due_date"] == "2025-07-01T00:00:00"
@@ -73,7 +81,7 @@ class TestAdd:
         result = runner.invoke(app, ["add", "Task", "--priority", "HIGH"])
 
         assert result.exit_code == 0
-        data = json.loads(temp_storage.read_text())
+        data = _saved(temp_storage)
         assert data["tasks"][0]["priority"] == "high"
 
     def test_strips_title_whitespace(self, runner, temp_storage):
@@ -82,7 +90,7 @@ class TestAdd:
 
         assert result.exit_code == 0
         assert "Added 'Task with spaces'" in result.output
-        data = json.loads(temp_storage.read_text())
+        data = _saved(temp_storage)
         assert data["tasks"][0]["title"] == "Task with spaces"
 
     def test_empty_title_shows_error(self, runner, temp_storage):
@@ -129,7 +137,7 @@ class TestAdd:
         result = runner.invoke(app, ["add", "Third task"])
 
         assert result.exit_code == 0
-        data = json.loads(temp_storage.read_text())
+        data = _saved(temp_storage)
         assert len(data["tasks"]) == 3
         assert data["tasks"][0]["title"] == "First task"
         assert data["tasks"][1]["title"] == "Second task"
@@ -140,6 +148,72 @@ class TestAdd:
         result = runner.invoke(app, ["add", "Task with timestamp"])
 
         assert result.exit_code == 0
-        data = json.loads(temp_storage.read_text())
+        data = _saved(temp_storage)
         assert "created_at" in data["tasks"][0]
         assert data["tasks"][0]["created_at"] is not None
+
+    def test_adds_tasks_from_file(self, runner, temp_storage, tmp_path):
+        """Test adding one task per non-empty line of a file."""
+        source = tmp_path / "tasks.txt"
+        source.write_text("Buy milk\n\n  Call mom  \nWrite report\n")
+
+        result = runner.invoke(app, ["add", "--from-file", str(source), "-p", "high"])
+
+        assert result.exit_code == 0
+        assert "Added 3 tasks" in result.output
+        assert "tasks/s" in result.output
+        data = _saved(temp_storage)
+        assert [t["title"] for t in data["tasks"]] == [
+            "Buy milk",
+            "Call mom",
+            "Write report",
+        ]
+        assert {t["priority"] for t in data["tasks"]} == {"high"}
+
+    def test_adds_tasks_from_stdin(self, runner, temp_storage):
+        """Test reading titles from stdin with '-'."""
+        result = runner.invoke(app, ["add", "-f", "-"], input="One\nTwo\n")
+
+        assert result.exit_code == 0
+        assert "Added 2 tasks" in result.output
+
+    def test_title_and_file_are_exclusive(self, runner, temp_storage):
+        """Test that a title cannot be combined with --from-file."""
+        result = runner.invoke(app, ["add", "Task", "-f", "-"], input="One\n")
+
+        assert result.exit_code == 2
+        assert "not both" in result.output
+
+    def test_missing_title_shows_error(self, runner, temp_storage):
+        """Test that add needs a title or a file."""
+        result = runner.invoke(app, ["add"])
+
+        assert result.exit_code == 2
+        assert "Provide a title or --from-file" in result.output
+
+    def test_adds_recurring_task(self, runner, temp_storage):
+        """Test that --every stores the rule, starting on its first occurrence."""
+        result = runner.invoke(
+            app, ["add", "Gym", "--every", "Mon, Thu", "--due", "2026-10-13"]
+        )
+
+        assert result.exit_code == 0
+        from task.storage import load_tasks
+        (task,) = load_tasks()
+        assert task.recur == "mon,thu"
+        assert task.due_date.isoformat() == "2026-10-15T00:00:00"
+
+    def test_recurring_task_defaults_to_today(self, runner, temp_storage):
+        """Test that a recurring task without --due starts today."""
+        runner.invoke(app, ["add", "Water plants", "--every", "3d"])
+
+        from task.storage import load_tasks
+        (task,) = load_tasks()
+        assert task.due_date.date() == datetime.now().date()
+
+    def test_invalid_recurrence_shows_error(self, runner, temp_storage):
+        """Test that an unknown rule is rejected."""
+        result = runner.invoke(app, ["add", "Task", "--every", "hourly"])
+
+        assert result.exit_code == 2
+        assert "Invalid recurrence: hourly" in result.output
@@ -0,0 +1,48 @@
+"""Tests for the archive command."""
+
+from task import storage
+from task.commands import app
+
+
+class TestArchive:
+    """Test suite for archive command."""
+
+    def test_moves_old_completed_tasks(self, runner, sample_data, temp_storage):
+        """Test that old completed tasks leave the store for the archive."""
+        result = runner.invoke(app, ["archive"])
+
+        assert result.exit_code == 0
+        assert "Archived 1 tasks" in result.output
+        assert [t.title for t in storage.load_tasks()] == ["First task"]
+        assert temp_storage.with_suffix(".archive.gz").exists()
+
+    def test_list_merges_archive_when_asked(self, runner, sample_data):
+        """Test that --all and --done show archived tasks, the default does not."""
+        runner.invoke(app, ["archive"])
+
+        result = runner.invoke(app, ["list", "--all"])
+        assert "Second task" in result.output
+        assert "2 tasks (1 pending, 1 done)" in result.output
+
+        result = runner.invoke(app, ["list", "--done"])
+        assert "Second task" in result.output
+
+        result = runner.invoke(app, ["list"])
+        assert "Second task" not in result.output
+
+    def test_recent_tasks_stay(self, runner, temp_storage):
+        """Test that tasks newer than --older-than are kept."""
+        runner.invoke(app, ["add", "Fresh"])
+        runner.invoke(app, ["done", "1"])
+
+        result = runner.invoke(app, ["archive", "--older-than", "1w"])
+
+        assert result.exit_code == 0
+        assert "No completed tasks older than 1w" in result.output
+
+    def test_invalid_duration(self, runner, sample_data):
+        """Test that an invalid duration shows error."""
+        result = runner.invoke(app, ["archive", "--older-than", "old"])
+
+        assert result.exit_code == 2
+        assert "Invalid duration: old" in result.output
@@ -0,0 +1,102 @@
+"""Tests for the clear command."""
+
+from task.commands import app
+from task.storage import load_tasks
+
+
+class TestClear:
+    """Test suite for clear command."""
+
+    def test_deletes_task_with_force(self, runner, sample_data):
+        """Test deleting a task without confirmation."""
+        result = runner.invoke(app, ["clear", "1", "--force"])
+
+        assert result.exit_code == 0
+        assert "Deleted 'First task'" in result.output
+        assert [t.title for t in load_tasks()] == ["Second task"]
+
+    def test_deletes_task_after_confirmation(self, runner, sample_data):
+        """Test deleting a task after confirming the prompt."""
+        result = runner.invoke(app, ["clear", "2"], input="y\n")
+
+        assert result.exit_code == 0
+        assert "Delete 'Second task'?" in result.output
+        assert [t.title for t in load_tasks()] == ["First task"]
+
+    def test_declined_confirmation_keeps_task(self, runner, sample_data):
+        """Test that answering no leaves the task in place."""
+        result = runner.invoke(app, ["clear", "1"], input="n\n")
+
+        assert result.exit_code == 1
+        assert "Cancelled" in result.output
+        assert len(load_tasks()) == 2
+
+    def test_missing_task_shows_error(self, runner, sample_data):
+        """Test that an unknown ID shows an error."""
+        result = runner.invoke(app, ["clear", "999", "--force"])
+
+        assert result.exit_code == 2
+        assert "Task 999 not found" in result.output
+
+    def test_ids_stay_stable_after_delete(self, runner, temp_storage):
+        """Test that later tasks keep their IDs after a delete."""
+        runner.invoke(app, ["add", "Task A"])
+        runner.invoke(app, ["add", "Task B"])
+        runner.invoke(app, ["add", "Task C"])
+
+        runner.invoke(app, ["clear", "1", "--force"])
+        result = runner.invoke(app, ["done", "3"])
+
+        assert result.exit_code == 0
+        assert "Completed: Task C" in result.output
+
+    def test_deletes_ids_with_force(self, runner, temp_storage):
+        """Test deleting several tasks with --ids."""
+        runner.invoke(app, ["add", "--from-file", "-"], input="A\nB\nC\nD\n")
+
+        result = runner.invoke(app, ["clear", "--ids", "1,3-4", "--force"])
+
+        assert result.exit_code == 0
+        assert "Deleted 3 tasks" in result.output
+        assert [t.title for t in load_tasks()] == ["B"]
+
+    def test_batch_confirmation_shows_count(self, runner, sample_data):
+        """Test that a batch delete asks once for all tasks."""
+        result = runner.invoke(app, ["clear", "--ids", "1-2"], input="y\n")
+
+        assert result.exit_code == 0
+        assert "Delete 2 tasks?" in result.output
+        assert load_tasks() == []
+
+    def test_batch_with_missing_ids_deletes_nothing(self, runner, sample_data):
+        """Test that missing IDs abort the whole batch."""
+        result = runner.invoke(app, ["clear", "--ids", "1,8", "--force"])
+
+        assert result.exit_code == 2
+        assert "Task 8 not found" in result.output
+        assert len(load_tasks()) == 2
+
+    def test_requires_id_or_ids(self, runner, sample_data):
+        """Test that clear needs exactly one way of naming tasks."""
+        result = runner.invoke(app, ["clear"])
+
+        assert result.exit_code == 2
+        assert "Provide a task ID or --ids" in result.output
+
+    def test_open_range_shows_error(self, runner, sample_data):
+        """Test that a range without an end is reported as such."""
+        result = runner.invoke(app, ["clear", "--ids", "3-", "--force"])
+
+        assert result.exit_code == 2
+        assert "Invalid range: 3-" in result.output
+        assert len(load_tasks()) == 2
+
+    def test_empty_ids_shows_error(self, runner, sample_data, temp_storage):
+        """Test that an empty --ids changes nothing."""
+        before = temp_storage.read_bytes()
+
+        result = runner.invoke(app, ["clear", "--ids", "", "--force"])
+
+        assert result.exit_code == 2
+        assert "No task IDs given" in result.output
+        assert temp_storage.read_bytes() == before
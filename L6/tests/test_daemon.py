@@ -0,0 +1,272 @@
+"""Tests for the task daemon and the client that uses it."""
+
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from task import client, daemon, storage
+from task.commands import app
+from task.models import Priority, Task
+
+
+@pytest.fixture
+def running_daemon(sample_data, monkeypatch):
+    """A daemon serving the sample store from a background thread."""
+    monkeypatch.setattr(daemon, "FLUSH_DELAY", 60.0)
+    thread = threading.Thread(target=daemon.serve)
+    thread.start()
+    while client.request("status") is None:
+        time.sleep(0.01)
+    yield thread
+    if thread.is_alive():
+        client.request("stop")
+        thread.join()
+
+
+def _snapshot_titles():
+    """Return task titles straight from the snapshot, bypassing the daemon."""
+    return [t.title for t in storage.load_tasks()]
+
+
+class TestDaemon:
+    """Test suite for the daemon and its client."""
+
+    def test_changes_are_served_from_memory(self, running_daemon):
+        """Test that changes are visible at once but written behind."""
+        client.add_tasks([Task(title="Third task")])
+        client.complete_tasks([1])
+
+        tasks = list(client.iter_tasks())
+        assert [(t.id, t.title, t.done) for t in tasks] == [
+            (1, "First task", True),
+            (2, "Second task", True),
+            (3, "Third task", False),
+        ]
+        assert _snapshot_titles() == ["First task", "Second task"]
+
+    def test_flush_writes_pending_changes(self, running_daemon):
+        """Test that a flush persists buffered changes in one write."""
+        client.add_tasks([Task(title="Third task")])
+        client.delete_tasks([2])
+
+        client.request("flush")
+
+        assert _snapshot_titles() == ["First task", "Third task"]
+
+    def test_changes_flush_after_delay(self, running_daemon, monkeypatch):
+        """Test write-behind persistence without an explicit flush."""
+        monkeypatch.setattr(daemon, "FLUSH_DELAY", 0.05)
+        client.add_tasks([Task(title="Third task")])
+        deadline = time.monotonic() + 5
+        while len(_snapshot_titles()) < 3 and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        assert _snapshot_titles() == ["First task", "Second task", "Third task"]
+
+    def test_stop_flushes(self, running_daemon):
+        """Test that stopping the daemon writes pending changes."""
+        client.complete_tasks([1])
+
+        client.request("stop")
+        running_daemon.join()
+
+        assert not client.socket_path().exists()
+        assert storage.get_task(1).done is True
+
+    def test_filters_run_in_daemon(self, running_daemon):
+        """Test listing with filters through the daemon."""
+        tasks = client.iter_tasks(done=True, priority=Priority.HIGH)
+
+        assert [t.title for t in tasks] == ["Second task"]
+
+    def test_pages_and_counts_in_daemon(self, running_daemon):
+        """Test offset, limit and counts served from memory."""
+        client.add_tasks([Task(title=f"Task {i}") for i in range(3, 8)])
+
+        tasks = client.iter_tasks(done=False, offset=1, limit=2)
+
+        assert [t.id for t in tasks] == [3, 4]
+        assert client.count_tasks(done=False) == 6
+        client.complete_tasks([3])
+        assert client.task_counts()["low"] == {"pending": 5, "done": 1}
+
+    def test_missing_ids_raise_key_error(self, running_daemon):
+        """Test that daemon errors surface as the same exceptions."""
+        with pytest.raises(KeyError) as excinfo:
+            client.complete_tasks([1, 8, 9])
+
+        assert excinfo.value.args == (8, 9)
+        assert client.find_tasks([1])[0].done is False
+
+    def test_failed_flush_keeps_serving(self, running_daemon, monkeypatch):
+        """Test that a write conflict fails the request, not the daemon."""
+        commit = storage._commit
+
+        def conflict(*ops, data=None):
+            monkeypatch.setattr(storage, "_commit", commit)
+            raise storage.ConflictError("changed by another process")
+
+        client.add_tasks([Task(title="Third task")])
+        monkeypatch.setattr(storage, "_commit", conflict)
+
+        with pytest.raises(storage.ConflictError, match="another process"):
+            client.request("flush")
+        assert running_daemon.is_alive()
+        assert client.request("status")["pending"] == 1
+
+        client.request("stop")
+        running_daemon.join()
+        assert _snapshot_titles() == ["First task", "Second task", "Third task"]
+
+    def test_outside_changes_are_picked_up(self, running_daemon):
+        """Test that the daemon reloads after a direct write to the store."""
+        storage.add_task(Task(title="Added directly"))
+
+        assert [t.title for t in client.iter_tasks(done=False)] == [
+            "First task",
+            "Added directly",
+        ]
+
+    def test_cli_uses_daemon(self, running_daemon, runner):
+        """Test that commands go through a running daemon transparently."""
+        result = runner.invoke(app, ["add", "Via daemon"])
+
+        assert result.exit_code == 0
+        assert "Added 'Via daemon'" in result.output
+        assert client.request("status")["pending"] == 1
+        assert "Via daemon" not in _snapshot_titles()
+
+        result = runner.invoke(app, ["list"])
+        assert "Via daemon" in result.output
+
+    def test_falls_back_without_daemon(self, sample_data):
+        """Test that the client uses storage directly when no daemon runs."""
+        client.add_tasks([Task(title="Third task")])
+
+        assert client.request("status") is None
+        assert _snapshot_titles() == ["First task", "Second task", "Third task"]
+
+    def test_stale_socket_falls_back(self, sample_data):
+        """Test that a socket file left by a dead daemon is ignored."""
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(client.socket_path()))
+        stale.close()
+
+        assert [t.title for t in client.iter_tasks(done=False)] == ["First task"]
+
+    def test_status_command(self, running_daemon, runner):
+        """Test the daemon status command."""
+        result = runner.invoke(app, ["daemon", "status"])
+
+        assert result.exit_code == 0
+        assert "2 tasks, 0 changes pending" in result.output
+
+    def test_stop_command(self, running_daemon, runner):
+        """Test that the stop command reports a running daemon as stopped."""
+        result = runner.invoke(app, ["daemon", "stop"])
+        running_daemon.join()
+
+        assert "Daemon stopped" in result.output
+        assert runner.invoke(app, ["daemon", "stop"]).output.strip() == (
+            "Daemon is not running"
+        )
+
+    def test_start_serves_selected_list(self, runner, temp_storage, monkeypatch):
+        """Test that a daemon started for a named list serves that list."""
+        # The daemon process finds the store through HOME, as a user's would
+        monkeypatch.setenv("HOME", str(temp_storage.parent.parent))
+        runner.invoke(app, ["--list", "work", "add", "Work task"])
+
+        result = runner.invoke(app, ["--list", "work", "daemon", "start"])
+        try:
+            assert result.exit_code == 0
+            assert client.socket_path() == storage.list_path("work").with_suffix(
+                ".sock"
+            )
+            assert client.request("status")["tasks"] == 1
+        finally:
+            runner.invoke(app, ["--list", "work", "daemon", "stop"])
+        storage.use_list("default")
+        assert client.request("status") is None
+
+    def test_due_tasks_from_memory(self, running_daemon):
+        """Test that due queries see unflushed changes via the in-memory index."""
+        client.add_tasks(
+            [
+                Task(title="Soon", due_date=datetime(2026, 1, 2)),
+                Task(title="Later", due_date=datetime(2026, 2, 1)),
+            ]
+        )
+        client.complete_tasks([3])
+
+        tasks = client.due_tasks(datetime(2026, 3, 1), start=datetime(2026, 1, 1))
+
+        assert [t.title for t in tasks] == ["Later"]
+        assert _snapshot_titles() == ["First task", "Second task"]
+
+    def test_search_from_memory(self, running_daemon):
+        """Test that searches see unflushed changes via the in-memory index."""
+        client.add_tasks([Task(title="Third task"), Task(title="Taskforce")])
+        client.delete_tasks([1])
+
+        tasks = client.search_tasks("task", done=None)
+
+        assert [t.title for t in tasks] == ["Second task", "Third task", "Taskforce"]
+        assert client.search_tasks("taskf") == [client.find_tasks([4])[0]]
+
+    def test_undo_and_redo_in_memory(self, running_daemon):
+        """Test that the daemon undoes and redoes changes it holds."""
+        client.delete_tasks([1])
+
+        assert client.undo() == "Deleted 'First task'"
+        assert [t.id for t in client.iter_tasks(done=None)] == [1, 2]
+        assert client.redo() == "Deleted 'First task'"
+        assert [t.id for t in client.iter_tasks(done=None)] == [2]
+        assert client.search_tasks("first") == []
+
+    def test_recurring_task_in_memory(self, running_daemon):
+        """Test that the daemon expands and completes recurring tasks."""
+        today = datetime.combine(datetime.now().date(), datetime.min.time())
+        client.add_tasks([Task(title="Standup", due_date=today, recur="daily")])
+
+        window = client.due_tasks(today + timedelta(days=2), start=today)
+        (done,) = client.complete_tasks([3])
+
+        assert [(t.id, t.due_date) for t in window] == [
+            (3, today),
+            (3, today + timedelta(days=1)),
+        ]
+        assert (done.id, done.done) == (4, True)
+        assert [t.due_date for t in client.due_tasks(today + timedelta(days=2))] == [
+            today + timedelta(days=1)
+        ]
+
+    def test_direct_writers_skip_reserved_ids(self, sample_data, monkeypatch):
+        """Test that tasks added behind a buffered add don't take its ID."""
+        monkeypatch.setenv("TASK_ARCHIVE_DAYS", "off")
+        store = storage.MemoryStore()
+        (task_id,) = store.add([storage.task_to_dict(Task(title="Buffered"))])
+        list(storage.import_tasks([Task(title="Imported")]))
+        storage.add_tasks([Task(title="Added")])
+
+        store.flush()
+
+        tasks = {t.id: t.title for t in storage.load_tasks()}
+        assert tasks[task_id] == "Buffered"
+        assert {"Imported", "Added"} <= set(tasks.values())
+        assert len(tasks) == 5
+        assert not storage._reserve_path().exists()
+
+    def test_list_merges_archive(self, running_daemon):
+        """Test that archived tasks are listed and counted through the daemon."""
+        client.request("flush")
+        storage.archive_tasks(timedelta(days=1))
+
+        tasks = client.iter_tasks(done=True, archived=True)
+
+        assert [t.title for t in tasks] == ["Second task"]
+        assert client.count_tasks(archived=True) == 2
+        assert client.count_tasks() == 1
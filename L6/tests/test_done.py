@@ -1,6 +1,7 @@
 """Tests for the done command."""
 
 import json
+from datetime import timedelta
 
 from task.commands import app
 
@@ -162,3 +163,63 @@ class TestDone:
         assert tasks[0].done is False
         assert tasks[1].done is True
         assert tasks[2].done is False
+
+    def test_marks_ids_and_ranges_in_one_call(self, runner, temp_storage):
+        """Test completing a mix of IDs and ranges at once."""
+        runner.invoke(app, ["add", "--from-file", "-"], input="A\nB\nC\nD\nE\n")
+
+        result = runner.invoke(app, ["done", "1", "3-4"])
+
+        assert result.exit_code == 0
+        assert "Completed 3 tasks" in result.output
+        assert "tasks/s" in result.output
+
+        from task.storage import load_tasks
+        assert [t.done for t in load_tasks()] == [True, False, True, True, False]
+
+    def test_missing_ids_in_batch_change_nothing(self, runner, sample_data):
+        """Test that missing IDs are listed and nothing is completed."""
+        result = runner.invoke(app, ["done", "1", "5-6"])
+
+        assert result.exit_code == 2
+        assert "Tasks 5, 6 not found" in result.output
+
+        from task.storage import load_tasks
+        assert load_tasks()[0].done is False
+
+    def test_many_missing_ids_are_summarized(self, runner, sample_data):
+        """Test that a long list of missing IDs is cut short."""
+        result = runner.invoke(app, ["done", "1-5000"])
+
+        assert result.exit_code == 2
+        assert "Tasks 3, 4, 5, 6, 7, 8, 9, 10, 11, 12 and 4,988 more not found" in (
+            result.output.replace("\n", "")
+        )
+
+    def test_non_numeric_id_shows_error(self, runner, sample_data):
+        """Test that a non-numeric ID is named in the error."""
+        result = runner.invoke(app, ["done", "abc"])
+
+        assert result.exit_code == 2
+        assert "Invalid task ID: abc" in result.output
+
+    def test_invalid_range_shows_error(self, runner, sample_data):
+        """Test that a malformed range shows an error."""
+        result = runner.invoke(app, ["done", "3-1"])
+
+        assert result.exit_code == 2
+        assert "Invalid range: 3-1" in result.output
+
+    def test_completes_one_occurrence_of_recurring_task(self, runner, temp_storage):
+        """Test that done keeps a recurring task pending, due next time."""
+        runner.invoke(app, ["add", "Standup", "--every", "daily"])
+
+        result = runner.invoke(app, ["done", "1"])
+
+        assert result.exit_code == 0
+        assert "Completed: Standup" in result.output
+        from task.storage import load_tasks
+        template, occurrence = load_tasks()
+        assert (template.done, template.recur) == (False, "daily")
+        assert (occurrence.done, occurrence.recur) == (True, None)
+        assert template.due_date - occurrence.due_date == timedelta(days=1)
@@ -0,0 +1,63 @@
+"""Tests for the due command."""
+
+from datetime import datetime, timedelta
+
+from task.commands import app
+
+
+def _add(runner, title, days):
+    """Add a task due the given number of days from today."""
+    due = (datetime.now() + timedelta(days=days)).strftime("%Y-%m-%d")
+    runner.invoke(app, ["add", title, "--due", due])
+
+
+class TestDue:
+    """Test suite for due command."""
+
+    def test_lists_tasks_due_within_a_week(self, runner, temp_storage):
+        """Test the default 7 day window, including today and the last day."""
+        _add(runner, "Today", 0)
+        _add(runner, "Last day", 7)
+        _add(runner, "Next week", 8)
+        _add(runner, "Yesterday", -1)
+
+        result = runner.invoke(app, ["due"])
+
+        assert result.exit_code == 0
+        assert "Today" in result.output
+        assert "Last day" in result.output
+        assert "Next week" not in result.output
+        assert "Yesterday" not in result.output
+
+    def test_within_weeks(self, runner, temp_storage):
+        """Test that --within accepts weeks."""
+        _add(runner, "Next week", 8)
+
+        result = runner.invoke(app, ["due", "--within", "2w"])
+
+        assert result.exit_code == 0
+        assert "Next week" in result.output
+
+    def test_lists_each_occurrence_of_recurring_task(self, runner, temp_storage):
+        """Test that a recurring task appears once per occurrence in the window."""
+        runner.invoke(app, ["add", "Standup", "--every", "2d"])
+
+        result = runner.invoke(app, ["due", "--within", "5d"])
+
+        assert result.exit_code == 0
+        assert result.output.count("Standup") == 3
+        assert "(2d)" in result.output
+
+    def test_no_tasks_due(self, runner, sample_data):
+        """Test the message when nothing is due."""
+        result = runner.invoke(app, ["due", "--within", "3d"])
+
+        assert result.exit_code == 0
+        assert "No tasks due within 3d" in result.output
+
+    def test_invalid_duration(self, runner, temp_storage):
+        """Test that an invalid duration shows error."""
+        result = runner.invoke(app, ["due", "--within", "soon"])
+
+        assert result.exit_code == 2
+        assert "Invalid duration: soon" in result.output
@@ -0,0 +1,140 @@
+"""Tests for the export command."""
+
+import json
+from datetime import timedelta
+
+from task import binary, storage
+from task.commands import app
+from task.models import Task
+
+
+class TestExport:
+    """Test suite for export command."""
+
+    def test_exports_json_to_stdout(self, runner, sample_data):
+        """Test that JSON export prints a valid snapshot."""
+        result = runner.invoke(app, ["export"])
+
+        assert result.exit_code == 0
+        data = json.loads(result.output)
+        assert [t["title"] for t in data["tasks"]] == ["First task", "Second task"]
+        assert data["next_id"] == 3
+
+    def test_exports_binary_to_file(self, runner, sample_data, tmp_path):
+        """Test that binary export writes a marked, smaller file."""
+        output = tmp_path / "tasks.bin"
+        result = runner.invoke(app, ["export", "-f", "binary", "-o", str(output)])
+
+        assert result.exit_code == 0
+        assert "Exported tasks to" in result.output
+        assert binary.is_binary(output)
+        assert output.stat().st_size < len(storage.export_snapshot("json"))
+
+    def test_binary_export_needs_output(self, runner, sample_data):
+        """Test that binary data is not written to the terminal."""
+        result = runner.invoke(app, ["export", "--format", "binary"])
+
+        assert result.exit_code == 2
+        assert "Binary export needs --output" in result.output
+
+    def test_exports_jsonl_to_stdout(self, runner, sample_data):
+        """Test that JSON Lines export prints one record per line."""
+        result = runner.invoke(app, ["export", "-f", "jsonl"])
+
+        assert result.exit_code == 0
+        records = [json.loads(line) for line in result.output.splitlines()]
+        assert [(r["id"], r["title"]) for r in records] == [
+            (1, "First task"),
+            (2, "Second task"),
+        ]
+
+    def test_exports_csv_to_file(self, runner, sample_data, tmp_path):
+        """Test that CSV export writes a header and reports throughput."""
+        output = tmp_path / "tasks.csv"
+        result = runner.invoke(app, ["export", "-f", "csv", "-o", str(output)])
+
+        assert result.exit_code == 0
+        assert "Exported 2 tasks" in result.output
+        assert "tasks/s" in result.output
+        lines = output.read_text().splitlines()
+        assert lines[0] == "id,title,done,priority,created_at,due_date,recur"
+        assert lines[2] == "2,Second task,true,high,2025-01-02T10:00:00,2025-12-31T00:00:00,"
+
+    def test_streaming_export_includes_archive(self, runner, sample_data):
+        """Test that archived tasks are exported too."""
+        storage.archive_tasks(timedelta(0))
+
+        result = runner.invoke(app, ["export", "-f", "jsonl"])
+
+        assert "Second task" in result.output
+
+    def test_snapshot_export_includes_archive(self, runner, sample_data):
+        """Test that a JSON export holds archived tasks as completed ones."""
+        storage.archive_tasks(timedelta(0))
+
+        result = runner.invoke(app, ["export"])
+
+        data = json.loads(result.output)
+        assert [(t["id"], t["done"]) for t in data["tasks"]] == [(1, False), (2, True)]
+        assert data["counts"]["high"]["done"] == 1
+
+    def test_in_place_conversion_keeps_archive(self, runner, sample_data):
+        """Test that converting the store leaves archived tasks in the archive."""
+        storage.archive_tasks(timedelta(0))
+
+        runner.invoke(app, ["export", "-f", "binary", "--in-place"])
+
+        assert [r["title"] for r in storage.iter_archive()] == ["Second task"]
+        assert storage.archived_counts()["high"] == 1
+
+    def test_streaming_formats_not_in_place(self, runner, sample_data):
+        """Test that the store can't be converted to an interchange format."""
+        result = runner.invoke(app, ["export", "-f", "csv", "--in-place"])
+
+        assert result.exit_code == 2
+        assert "Only json and binary" in result.output
+
+    def test_invalid_format_shows_error(self, runner, sample_data):
+        """Test that unknown formats are rejected."""
+        result = runner.invoke(app, ["export", "--format", "xml"])
+
+        assert result.exit_code == 2
+        assert "Invalid format: xml" in result.output
+
+    def test_converts_store_in_place_and_back(self, runner, sample_data, temp_storage):
+        """Test round-tripping the live store through the binary format."""
+        before = storage.load_tasks()
+
+        result = runner.invoke(app, ["export", "-f", "binary", "--in-place"])
+        assert result.exit_code == 0
+        assert "Converted task store to binary" in result.output
+        assert binary.is_binary(temp_storage)
+        assert storage.load_tasks() == before
+
+        runner.invoke(app, ["export", "-f", "json", "--in-place"])
+        assert json.loads(temp_storage.read_text())["next_id"] == 3
+        assert storage.load_tasks() == before
+
+    def test_binary_store_stays_binary(self, runner, sample_data, temp_storage):
+        """Test that commands keep working on a binary store."""
+        runner.invoke(app, ["export", "-f", "binary", "--in-place"])
+
+        runner.invoke(app, ["add", "Third task", "-p", "high"])
+        runner.invoke(app, ["done", "1"])
+        result = runner.invoke(app, ["list", "--all"])
+
+        assert binary.is_binary(temp_storage)
+        assert "Third task" in result.output
+        assert storage.get_task(1).done is True
+
+    def test_binary_store_with_journal(self, sample_data, temp_storage, monkeypatch):
+        """Test indexed lookups and journal replay on a binary snapshot."""
+        storage.convert_store("binary")
+        monkeypatch.setenv("TASK_STORAGE", "journal")
+
+        storage.add_task(Task(title="Ünïcode task"))
+        storage.complete_task(1)
+
+        assert storage.get_task(1).done is True
+        assert storage._indexed_records([2])[2]["due_date"] == "2025-12-31T00:00:00"
+        assert [t.title for t in storage.load_tasks()][-1] == "Ünïcode task"
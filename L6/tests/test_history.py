@@ -0,0 +1,43 @@
+"""Tests for the bounded undo and redo stacks."""
+
+from task import history
+
+
+class TestHistory:
+    """Test suite for history stacks."""
+
+    def test_pop_returns_newest_first(self, tmp_path):
+        """Test that entries come back in reverse order, then None."""
+        path = tmp_path / "tasks.undo"
+        for i in range(3):
+            history.push(path, {"i": i}, limit=10)
+
+        assert [history.pop(path)["i"] for _ in range(3)] == [2, 1, 0]
+        assert history.pop(path) is None
+
+    def test_missing_stack_is_empty(self, tmp_path):
+        """Test that popping a stack that was never written returns None."""
+        assert history.pop(tmp_path / "tasks.undo") is None
+
+    def test_keeps_at_least_limit_entries(self, tmp_path):
+        """Test that old entries are dropped, but never the newest limit."""
+        path = tmp_path / "tasks.undo"
+        for i in range(100):
+            history.push(path, {"i": i}, limit=5)
+
+        entries = []
+        while (entry := history.pop(path)) is not None:
+            entries.append(entry["i"])
+        assert 5 <= len(entries) <= 10
+        assert entries == list(range(99, 99 - len(entries), -1))
+
+    def test_push_after_pop_continues(self, tmp_path):
+        """Test that a popped entry's place is reused by the next push."""
+        path = tmp_path / "tasks.undo"
+        history.push(path, {"i": 0}, limit=2)
+        history.push(path, {"i": 1}, limit=2)
+        history.pop(path)
+        history.push(path, {"i": 2}, limit=2)
+
+        assert history.pop(path) == {"i": 2}
+        assert history.pop(path) == {"i": 0}
@@ -0,0 +1,201 @@
+"""Tests for the import command."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from task import storage, transfer
+from task.commands import app
+from task.models import Priority, Task
+
+
+class TestImport:
+    """Test suite for import command."""
+
+    def test_imports_jsonl(self, runner, sample_data, tmp_path, monkeypatch):
+        """Test that JSON Lines records are added after the existing tasks."""
+        monkeypatch.setenv("TASK_ARCHIVE_DAYS", "off")
+        source = tmp_path / "tasks.jsonl"
+        source.write_text(
+            '{"title": "Imported", "priority": "high", "done": true}\n'
+            "\n"
+            '{"id": 1, "title": "Dated", "due_date": "2026-03-01T00:00:00"}\n'
+        )
+
+        result = runner.invoke(app, ["import", str(source)])
+
+        assert result.exit_code == 0
+        assert "Imported 2 tasks" in result.output
+        tasks = storage.load_tasks()
+        assert [(t.id, t.title) for t in tasks[2:]] == [(3, "Imported"), (4, "Dated")]
+        assert tasks[2].done and tasks[2].priority == Priority.HIGH
+        assert tasks[3].due_date.month == 3
+
+    def test_imports_csv_from_stdin(self, runner, temp_storage):
+        """Test that CSV rows are read from stdin with --format."""
+        rows = "title,done,priority\nFirst,false,low\n\"Second, too\",TRUE,medium\n"
+
+        result = runner.invoke(app, ["import", "-", "-f", "csv"], input=rows)
+
+        assert result.exit_code == 0
+        tasks = storage.load_tasks()
+        assert [(t.title, t.done) for t in tasks] == [
+            ("First", False),
+            ("Second, too", True),
+        ]
+
+    def test_round_trips_export(self, runner, sample_data, tmp_path, monkeypatch):
+        """Test that an exported CSV file imports back to the same tasks."""
+        monkeypatch.setenv("TASK_ARCHIVE_DAYS", "off")
+        output = tmp_path / "tasks.csv"
+        runner.invoke(app, ["export", "-f", "csv", "-o", str(output)])
+
+        result = runner.invoke(app, ["import", str(output)])
+
+        assert result.exit_code == 0
+        first, second, *imported = storage.load_tasks()
+        assert [(t.title, t.done, t.created_at, t.due_date) for t in imported] == [
+            (t.title, t.done, t.created_at, t.due_date) for t in (first, second)
+        ]
+
+    def test_invalid_record_reports_line(self, runner, temp_storage, tmp_path):
+        """Test that a bad record stops the import and names its line."""
+        source = tmp_path / "tasks.jsonl"
+        source.write_text('{"title": "Good"}\n{"title": "Bad", "priority": "top"}\n')
+
+        result = runner.invoke(app, ["import", str(source)])
+
+        assert result.exit_code == 2
+        assert "Line 2:" in result.output
+
+    def test_offset_timestamps_become_local(self, runner, temp_storage, tmp_path):
+        """Test that UTC offsets are resolved so later commands keep working."""
+        source = tmp_path / "tasks.jsonl"
+        source.write_text(
+            '{"title": "tz task", "due_date": "2026-10-20T09:00:00+02:00"}\n'
+        )
+
+        result = runner.invoke(app, ["import", str(source)])
+        added = runner.invoke(app, ["add", "After", "--due", "2026-10-21"])
+        due = runner.invoke(app, ["due", "--within", "3650d"])
+
+        assert result.exit_code == 0
+        assert added.exit_code == 0
+        assert due.exit_code == 0
+        (task, _) = storage.load_tasks()
+        expected = datetime.fromisoformat("2026-10-20T09:00:00+02:00").astimezone()
+        assert task.due_date == expected.replace(tzinfo=None)
+
+    def test_empty_file_shows_warning(self, runner, temp_storage, tmp_path):
+        """Test that importing nothing is reported."""
+        source = tmp_path / "tasks.jsonl"
+        source.write_text("")
+
+        result = runner.invoke(app, ["import", str(source)])
+
+        assert result.exit_code == 0
+        assert "No tasks to import" in result.output
+
+    def test_invalid_format_shows_error(self, runner, temp_storage, tmp_path):
+        """Test that unknown formats are rejected."""
+        source = tmp_path / "tasks.jsonl"
+        source.write_text("")
+
+        result = runner.invoke(app, ["import", str(source), "--format", "xml"])
+
+        assert result.exit_code == 2
+        assert "Invalid format: xml" in result.output
+
+
+class TestImportTasks:
+    """Test batched imports into each storage engine."""
+
+    @pytest.mark.parametrize("engine", ["json", "journal", "sqlite"])
+    def test_batches(self, engine, temp_storage, monkeypatch):
+        """Test that every batch is stored and counted, with IDs in order."""
+        monkeypatch.setenv("TASK_STORAGE", engine)
+        storage.add_task(Task(title="Existing"))
+        tasks = (Task(title=f"Task {i}") for i in range(7))
+
+        progress = list(storage.import_tasks(tasks, batch_size=3))
+
+        assert progress == [3, 6, 7]
+        assert [t.id for t in storage.load_tasks()] == list(range(1, 9))
+
+    def test_rewrites_snapshot_once(self, temp_storage, monkeypatch):
+        """Test that JSON batches go to the journal and are folded in at the end."""
+        writes = []
+        write_snapshot = storage._write_snapshot
+        monkeypatch.setattr(
+            storage,
+            "_write_snapshot",
+            lambda data, fmt="json": writes.append(data) or write_snapshot(data, fmt),
+        )
+        tasks = (Task(title=f"Task {i}") for i in range(10))
+
+        for count in storage.import_tasks(tasks, batch_size=2):
+            if count < 10:
+                assert storage._journal_path().exists()
+
+        assert len(writes) == 1
+        assert not storage._journal_path().exists()
+        assert storage.count_tasks() == 10
+
+    def test_failed_import_keeps_stored_batches(self, temp_storage):
+        """Test that batches stored before a bad record stay stored."""
+
+        def tasks():
+            yield from (Task(title=f"Task {i}") for i in range(4))
+            raise ValueError("Line 5: title cannot be empty")
+
+        with pytest.raises(ValueError):
+            list(storage.import_tasks(tasks(), batch_size=2))
+
+        assert storage.count_tasks() == 4
+        assert not storage._journal_path().exists()
+
+
+class TestTransfer:
+    """Test the JSON Lines and CSV codecs."""
+
+    @pytest.mark.parametrize("fmt", transfer.FORMATS)
+    def test_write_then_read(self, fmt, tmp_path):
+        """Test that written records decode back to the same tasks."""
+        tasks = [
+            Task(title="Plain", id=1),
+            Task(title='Quote " and, comma', done=True, priority=Priority.HIGH, id=2),
+        ]
+        path = tmp_path / f"tasks.{fmt}"
+        with path.open("w", newline="") as out:
+            count = transfer.write(map(storage.task_to_dict, tasks), fmt, out)
+
+        with path.open(newline="") as lines:
+            decoded = list(transfer.read(lines, fmt))
+
+        assert count == 2
+        assert [(t.title, t.done, t.priority, t.created_at) for t in decoded] == [
+            (t.title, t.done, t.priority, t.created_at) for t in tasks
+        ]
+        assert {t.id for t in decoded} == {None}
+
+    def test_invalid_json(self):
+        """Test that malformed lines are reported with their number."""
+        with pytest.raises(ValueError, match="Line 2:"):
+            list(transfer.read(['{"title": "ok"}\n', "{oops\n"], "jsonl"))
+
+    def test_invalid_done(self):
+        """Test that unknown done values in CSV are rejected."""
+        with pytest.raises(ValueError, match="Line 2: invalid done value"):
+            list(transfer.read(["title,done\n", "x,maybe\n"], "csv"))
+
+    def test_invalid_timestamp(self):
+        """Test that unparsable dates are reported with their line."""
+        with pytest.raises(ValueError, match="Line 1: invalid due_date"):
+            list(transfer.read(['{"title": "x", "due_date": "soon"}\n'], "jsonl"))
+
+    def test_format_for(self):
+        """Test that CSV is picked by extension and JSON Lines otherwise."""
+        assert transfer.format_for("TASKS.CSV") == "csv"
+        assert transfer.format_for("tasks.jsonl") == "jsonl"
+        assert transfer.format_for("<stdin>") == "jsonl"
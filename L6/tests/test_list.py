@@ -1,5 +1,10 @@
 """Tests for the list command."""
 
+import io
+
+from rich.console import Console
+
+from task import display
 from task.commands import app
 
 
@@ -219,3 +224,223 @@ class TestList:
         # Both tasks should be visible with --all
         assert "First task" in result.output
         assert "Second task" in result.output
+
+    def test_shows_long_ids_in_full(self, runner, temp_storage):
+        """Test that IDs wider than the column minimum are not cropped."""
+        from task.models import Task
+        from task.storage import save_tasks
+
+        save_tasks([Task(title="Late task", id=123457)])
+
+        result = runner.invoke(app, ["list"])
+
+        assert result.exit_code == 0
+        assert "123457" in result.output
+
+    def test_limit_caps_rows(self, runner, temp_storage):
+        """Test that --limit shows only the first N matching tasks."""
+        for i in range(1, 6):
+            runner.invoke(app, ["add", f"Task {i}"])
+
+        result = runner.invoke(app, ["list", "--limit", "2"])
+
+        assert result.exit_code == 0
+        assert "Task 1" in result.output
+        assert "Task 2" in result.output
+        assert "Task 3" not in result.output
+
+    def test_limit_on_binary_store(self, runner, temp_storage):
+        """Test that --limit works on a memory-mapped binary store."""
+        for i in range(1, 6):
+            runner.invoke(app, ["add", f"Task {i}"])
+        runner.invoke(app, ["done", "1"])
+        runner.invoke(app, ["export", "-f", "binary", "--in-place"])
+
+        result = runner.invoke(app, ["list", "-n", "1"])
+
+        assert result.exit_code == 0
+        assert "Task 2" in result.output
+        assert "Task 3" not in result.output
+
+    def test_invalid_limit_shows_error(self, runner, temp_storage):
+        """Test that a non-positive limit is rejected."""
+        result = runner.invoke(app, ["list", "--limit", "0"])
+
+        assert result.exit_code == 2
+        assert "Limit must be positive" in result.output
+
+    def test_offset_skips_tasks(self, runner, temp_storage):
+        """Test that --offset starts after the first N matching tasks."""
+        runner.invoke(app, ["add", "-f", "-"], input="T1\nT2\nT3\nT4\nT5\n")
+
+        result = runner.invoke(app, ["list", "--offset", "3"])
+
+        assert result.exit_code == 0
+        assert "T3" not in result.output
+        assert "T4" in result.output
+        assert "Showing 4-5 of 5 tasks (5 pending, 0 done)" in result.output
+
+    def test_page_uses_limit_as_page_size(self, runner, temp_storage):
+        """Test that --page N shows the Nth slice of --limit tasks."""
+        runner.invoke(app, ["add", "-f", "-"], input="T1\nT2\nT3\nT4\nT5\n")
+
+        result = runner.invoke(app, ["list", "--page", "2", "-n", "2"])
+
+        assert result.exit_code == 0
+        assert "T2" not in result.output
+        assert "T3" in result.output
+        assert "T4" in result.output
+        assert "T5" not in result.output
+        assert "Showing 3-4 of 5 tasks" in result.output
+
+    def test_page_past_the_end(self, runner, sample_data):
+        """Test that a page beyond the last task shows a warning."""
+        result = runner.invoke(app, ["list", "--page", "3"])
+
+        assert result.exit_code == 0
+        assert "No tasks found" in result.output
+
+    def test_page_and_offset_are_exclusive(self, runner, sample_data):
+        """Test that --page and --offset cannot be combined."""
+        result = runner.invoke(app, ["list", "--page", "1", "--offset", "1"])
+
+        assert result.exit_code == 2
+        assert "Use either --offset or --page" in result.output
+
+    def test_summary_counts_all_matching_tasks(self, runner, sample_data):
+        """Test that the summary comes from counters, not the shown rows."""
+        result = runner.invoke(app, ["list", "-a", "-n", "1"])
+
+        assert "Second task" not in result.output
+        assert "Showing 1-1 of 2 tasks (1 pending, 1 done)" in result.output
+
+    def test_pager_streams_pages_when_not_a_terminal(self, runner, temp_storage):
+        """Test that --pager renders every page without prompting when piped."""
+        runner.invoke(app, ["add", "-f", "-"], input="".join(f"T{i}\n" for i in range(60)))
+
+        result = runner.invoke(app, ["list", "--pager"])
+
+        assert result.exit_code == 0
+        assert "T0" in result.output
+        assert "T59" in result.output
+        assert "more" not in result.output
+        assert "60 tasks (60 pending, 0 done)" in result.output
+
+    def test_pager_stops_when_user_quits(self, runner, temp_storage, monkeypatch):
+        """Test that quitting the pager stops before later pages are built."""
+        runner.invoke(app, ["add", "-f", "-"], input="".join(f"T{i}\n" for i in range(30)))
+        screen = io.StringIO()
+        terminal = Console(
+            file=screen,
+            force_interactive=True,
+            force_terminal=True,
+            color_system=None,
+            height=16,
+        )
+        monkeypatch.setattr(display, "console", lambda: terminal)
+        monkeypatch.setattr(display.typer, "getchar", lambda: "q")
+
+        runner.invoke(app, ["list", "--pager"])
+
+        output = screen.getvalue()
+        assert "T9" in output
+        assert "T10" not in output
+        assert "Showing 1-10 of 30 tasks" in output
+
+    def test_sort_by_priority_then_due(self, runner, temp_storage):
+        """Test that --sort orders by each key in turn."""
+        runner.invoke(app, ["add", "Low soon", "-d", "2026-01-01"])
+        runner.invoke(app, ["add", "High undated", "-p", "high"])
+        runner.invoke(app, ["add", "High soon", "-p", "high", "-d", "2026-01-02"])
+        runner.invoke(app, ["add", "High sooner", "-p", "high", "-d", "2026-01-01"])
+
+        result = runner.invoke(app, ["list", "--sort", "priority,due"])
+
+        assert result.exit_code == 0
+        positions = [
+            result.output.index(title)
+            for title in ["High sooner", "High soon ", "High undated", "Low soon"]
+        ]
+        assert positions == sorted(positions)
+
+    def test_top_shows_most_urgent(self, runner, temp_storage):
+        """Test that --top keeps the first N tasks by priority and due date."""
+        runner.invoke(app, ["add", "-f", "-"], input="T1\nT2\nT3\n")
+        runner.invoke(app, ["add", "Urgent", "-p", "high"])
+
+        result = runner.invoke(app, ["list", "--top", "2"])
+
+        assert result.exit_code == 0
+        assert result.output.index("Urgent") < result.output.index("T1")
+        assert "T2" not in result.output
+        assert "Showing 1-2 of 4 tasks" in result.output
+
+    def test_invalid_sort_key(self, runner, sample_data):
+        """Test that an unknown sort key shows error."""
+        result = runner.invoke(app, ["list", "--sort", "priority,size"])
+
+        assert result.exit_code == 2
+        assert "Invalid sort key: size" in result.output
+
+    def test_top_and_limit_are_exclusive(self, runner, sample_data):
+        """Test that --top and --limit cannot be combined."""
+        result = runner.invoke(app, ["list", "--top", "1", "-n", "1"])
+
+        assert result.exit_code == 2
+        assert "Use either --limit or --top" in result.output
+
+
+class TestNamedLists:
+    """Test suite for --list and --all-lists."""
+
+    def test_list_has_its_own_shard(self, runner, sample_data, temp_storage):
+        """Test that tasks added to a named list are kept apart from the default."""
+        result = runner.invoke(app, ["--list", "work", "add", "Write report"])
+
+        assert result.exit_code == 0
+        assert (temp_storage.parent / "lists" / "work.json").exists()
+        assert "Write report" in runner.invoke(app, ["--list", "work", "list"]).output
+        default = runner.invoke(app, ["--list", "default", "list"])
+        assert "Write report" not in default.output
+        assert "First task" in default.output
+
+    def test_list_from_environment(self, runner, temp_storage, monkeypatch):
+        """Test that TASK_LIST selects the list like --list."""
+        runner.invoke(app, ["--list", "home", "add", "Buy milk"])
+        monkeypatch.setenv("TASK_LIST", "home")
+
+        result = runner.invoke(app, ["list"])
+
+        assert "Buy milk" in result.output
+
+    def test_all_lists_shows_every_list(self, runner, sample_data):
+        """Test that --all-lists shows each list with its own summary."""
+        runner.invoke(app, ["--list", "work", "add", "Write report"])
+        runner.invoke(app, ["--list", "home", "add", "Buy milk"])
+
+        result = runner.invoke(app, ["list", "--all-lists"])
+
+        assert result.exit_code == 0
+        positions = [
+            result.output.index(text)
+            for text in ["default", "First task", "home", "Buy milk", "work"]
+        ]
+        assert positions == sorted(positions)
+        assert "Write report" in result.output
+        assert result.output.count("1 tasks (1 pending, 0 done)") == 3
+
+    def test_all_lists_with_empty_list(self, runner, temp_storage):
+        """Test that a list without matching tasks is reported, not skipped."""
+        runner.invoke(app, ["--list", "work", "add", "Write report"])
+
+        result = runner.invoke(app, ["list", "--all-lists"])
+
+        assert result.exit_code == 0
+        assert result.output.index("No tasks found") < result.output.index("work")
+
+    def test_invalid_list_name(self, runner, temp_storage):
+        """Test that a list name that isn't a plain word shows error."""
+        result = runner.invoke(app, ["--list", "../work", "list"])
+
+        assert result.exit_code == 2
+        assert "Invalid list name: ../work" in result.output
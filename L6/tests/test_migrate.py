@@ -0,0 +1,42 @@
+"""Tests for the migrate command."""
+
+from task.commands import app
+
+
+class TestMigrate:
+    """Test suite for migrate command."""
+
+    def test_imports_tasks_into_sqlite(self, runner, sample_data, monkeypatch):
+        """Test importing the JSON store and listing from SQLite."""
+        result = runner.invoke(app, ["migrate"])
+
+        assert result.exit_code == 0
+        assert "Imported 2 tasks" in result.output
+
+        monkeypatch.setenv("TASK_STORAGE", "sqlite")
+        result = runner.invoke(app, ["list", "--all"])
+        assert "First task" in result.output
+        assert "Second task" in result.output
+
+    def test_existing_database_requires_force(self, runner, sample_data):
+        """Test that migrating twice needs --force."""
+        runner.invoke(app, ["migrate"])
+
+        result = runner.invoke(app, ["migrate"])
+        assert result.exit_code == 1
+        assert "Use --force to overwrite" in result.output
+
+        result = runner.invoke(app, ["migrate", "--force"])
+        assert result.exit_code == 0
+
+    def test_commands_work_on_sqlite(self, runner, temp_storage, monkeypatch):
+        """Test add, done and list against the SQLite engine."""
+        monkeypatch.setenv("TASK_STORAGE", "sqlite")
+        runner.invoke(app, ["add", "High task", "-p", "high"])
+        runner.invoke(app, ["add", "Low task"])
+        runner.invoke(app, ["done", "2"])
+
+        result = runner.invoke(app, ["list", "-p", "high"])
+
+        assert "High task" in result.output
+        assert "Low task" not in result.output
@@ -0,0 +1,89 @@
+"""Tests for the task models."""
+
+from datetime import datetime
+
+import pytest
+
+from task import storage
+from task.models import Priority, Task, TaskTable
+
+
+class TestTask:
+    """Test suite for the Task dataclass."""
+
+    def test_task_has_no_instance_dict(self):
+        """Test that Task instances use slots."""
+        task = Task(title="Slotted")
+
+        assert not hasattr(task, "__dict__")
+        with pytest.raises(AttributeError):
+            task.notes = "not a field"
+
+
+class TestTaskTable:
+    """Test suite for the columnar TaskTable."""
+
+    def test_round_trips_tasks(self):
+        """Test that tasks read back with the values they were stored with."""
+        table = TaskTable()
+        created = datetime(2025, 1, 2, 10, 30, 15, 123456)
+        due = datetime(2025, 12, 31)
+        table.append(7, "Write report", True, "high", created, due)
+        table.append(8, "Call Bob", False, "low", created, None)
+
+        assert len(table) == 2
+        assert table[0] == Task(
+            id=7,
+            title="Write report",
+            done=True,
+            priority=Priority.HIGH,
+            created_at=created,
+            due_date=due,
+        )
+        assert table[1].due_date is None
+        assert [t.title for t in table] == ["Write report", "Call Bob"]
+
+    def test_keeps_recurrence_rules(self):
+        """Test that only recurring rows carry a rule."""
+        table = TaskTable()
+        created = datetime(2025, 1, 1)
+        table.append(1, "Standup", False, "low", created, created, "daily")
+        table.append(2, "Report", False, "low", created, None)
+
+        assert [t.recur for t in table] == ["daily", None]
+        assert table.recur == {0: "daily"}
+
+    def test_titles_are_interned(self):
+        """Test that repeated titles share one string object."""
+        table = TaskTable()
+        created = datetime(2025, 1, 1)
+        table.append(1, "".join(["Daily", " standup"]), False, "low", created, None)
+        table.append(2, "".join(["Daily", " standup"]), False, "low", created, None)
+
+        assert table.titles[0] is table.titles[1]
+
+    def test_done_count(self):
+        """Test counting completed tasks from the done column."""
+        table = TaskTable()
+        created = datetime(2025, 1, 1)
+        for i in range(5):
+            table.append(i + 1, f"Task {i}", i < 2, "medium", created, None)
+
+        assert table.done_count() == 2
+
+    def test_storage_loads_into_table(self, sample_data):
+        """Test loading filtered tasks directly into a TaskTable."""
+        table = storage.load_table(done=True)
+
+        assert len(table) == 1
+        assert table[0].title == "Second task"
+        assert table[0].due_date == datetime(2025, 12, 31)
+        assert list(table) == storage.get_tasks(done=True)
+
+    def test_table_keeps_recurring_tasks(self, temp_storage):
+        """Test that tasks loaded into a table keep their recurrence rule."""
+        due = datetime(2025, 12, 31)
+        storage.add_tasks([Task(title="Standup", due_date=due, recur="daily")])
+
+        assert list(storage.load_table()) == storage.load_tasks()
+        assert storage.load_table()[0].recur == "daily"
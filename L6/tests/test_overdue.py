@@ -0,0 +1,31 @@
+"""Tests for the overdue command."""
+
+from datetime import datetime, timedelta
+
+from task.commands import app
+
+
+class TestOverdue:
+    """Test suite for overdue command."""
+
+    def test_lists_pending_tasks_past_due(self, runner, sample_data):
+        """Test that only pending tasks due before today are listed."""
+        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        today = datetime.now().strftime("%Y-%m-%d")
+        runner.invoke(app, ["add", "Missed", "--due", yesterday])
+        runner.invoke(app, ["add", "Due today", "--due", today])
+
+        result = runner.invoke(app, ["overdue"])
+
+        assert result.exit_code == 0
+        assert "Missed" in result.output
+        assert "Due today" not in result.output
+        # Completed tasks are never overdue
+        assert "Second task" not in result.output
+
+    def test_no_overdue_tasks(self, runner, temp_storage):
+        """Test the message when nothing is overdue."""
+        result = runner.invoke(app, ["overdue"])
+
+        assert result.exit_code == 0
+        assert "No overdue tasks" in result.output
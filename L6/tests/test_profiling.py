@@ -0,0 +1,86 @@
+"""Tests for profiling spans and the --profile option."""
+
+import pstats
+import time
+from collections import defaultdict
+
+import pytest
+
+from task import profiling
+from task.commands import app
+
+
+@pytest.fixture(autouse=True)
+def fresh_profile(monkeypatch):
+    """Start every test with profiling off and no recorded time."""
+    monkeypatch.setattr(profiling, "_enabled", False)
+    monkeypatch.setattr(profiling, "_totals", defaultdict(float))
+    monkeypatch.setattr(profiling, "_stack", [])
+
+
+class TestSpans:
+    """Test suite for span and timed."""
+
+    def test_disabled_spans_record_nothing(self):
+        """Test that hooks are pass-throughs until profiling is enabled."""
+        items = [1, 2]
+        with profiling.span("outer"):
+            assert profiling.timed("inner", items) is items
+
+        assert "outer" not in profiling.totals()
+
+    def test_nested_spans_are_exclusive(self):
+        """Test that a span is not charged for the time of its children."""
+        profiling.enable()
+        with profiling.span("outer"):
+            with profiling.span("inner"):
+                time.sleep(0.02)
+
+        totals = profiling.totals()
+        assert totals["inner"] >= 0.02
+        assert totals["outer"] < 0.01
+
+    def test_pipeline_stages_are_told_apart(self):
+        """Test that each lazy stage is charged only for its own work."""
+        profiling.enable()
+
+        def slow_source():
+            for i in range(3):
+                time.sleep(0.01)
+                yield i
+
+        source = profiling.timed("read", slow_source())
+        assert list(profiling.timed("build", map(str, source))) == ["0", "1", "2"]
+
+        totals = profiling.totals()
+        assert totals["read"] >= 0.03
+        assert totals["build"] < 0.01
+
+
+class TestProfileOption:
+    """Test suite for the --profile global option."""
+
+    def test_profile_reports_phases(self, runner, sample_data):
+        """Test that --profile prints per-phase timings to stderr."""
+        result = runner.invoke(app, ["--profile", "list"])
+
+        assert result.exit_code == 0
+        assert "First task" in result.stdout
+        for phase in ["import", "decode", "render", "total"]:
+            assert phase in result.stderr
+
+    def test_env_var_enables_profile(self, runner, sample_data):
+        """Test that TASK_PROFILE works like --profile."""
+        result = runner.invoke(app, ["add", "Profiled"], env={"TASK_PROFILE": "1"})
+
+        assert result.exit_code == 0
+        assert "write" in result.stderr
+
+    def test_profile_out_writes_pstats(self, runner, sample_data, tmp_path):
+        """Test that --profile-out dumps stats pstats can load."""
+        out = tmp_path / "list.prof"
+
+        result = runner.invoke(app, ["--profile-out", str(out), "list"])
+
+        assert result.exit_code == 0
+        assert pstats.Stats(str(out)).total_calls > 0
@@ -0,0 +1,58 @@
+"""Tests for task ID range parsing."""
+
+import pytest
+
+from task.ranges import MAX_IDS, parse_days, parse_ids
+
+
+class TestParseIds:
+    """Test suite for parse_ids."""
+
+    def test_single_ids_and_ranges(self):
+        """Test mixing single IDs, ranges and comma lists."""
+        assert parse_ids(["3", "7,9-11"]) == [3, 7, 9, 10, 11]
+
+    @pytest.mark.parametrize(
+        ("spec", "message"),
+        [
+            ("abc", "Invalid task ID: abc"),
+            ("5-2", "Invalid range: 5-2"),
+            ("0", "Task ID must be positive"),
+            ("1-x", "Invalid range: 1-x"),
+            ("3-", "Invalid range: 3-"),
+            ("-3", "Invalid range: -3"),
+        ],
+    )
+    def test_invalid_specs(self, spec, message):
+        """Test that malformed or non-positive specs are rejected."""
+        with pytest.raises(ValueError, match=f"^{message}$"):
+            parse_ids([spec])
+
+    @pytest.mark.parametrize("specs", [[], [""], [" ", ","]])
+    def test_no_ids(self, specs):
+        """Test that specs without any ID are rejected."""
+        with pytest.raises(ValueError, match="^No task IDs given$"):
+            parse_ids(specs)
+
+    def test_too_many_ids(self):
+        """Test that the total number of IDs is capped."""
+        assert len(parse_ids([f"1-{MAX_IDS}"])) == MAX_IDS
+        with pytest.raises(ValueError, match="Too many task IDs"):
+            parse_ids([f"1-{MAX_IDS}", "1"])
+
+
+class TestParseDays:
+    """Test suite for parse_days."""
+
+    @pytest.mark.parametrize(
+        ("spec", "days"), [("7d", 7), ("2w", 14), ("10", 10), (" 3D ", 3)]
+    )
+    def test_durations(self, spec, days):
+        """Test days, weeks and bare numbers."""
+        assert parse_days(spec) == days
+
+    @pytest.mark.parametrize("spec", ["", "d", "1m", "-1d", "1.5w"])
+    def test_invalid_durations(self, spec):
+        """Test that malformed durations are rejected."""
+        with pytest.raises(ValueError):
+            parse_days(spec)
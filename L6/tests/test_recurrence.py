@@ -0,0 +1,257 @@
+"""Tests for recurrence rules and recurring tasks in storage."""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from task import binary, recurrence, sqlite_store, storage
+from task.models import NO_DUE_DATE, Task
+
+TODAY = datetime.combine(datetime.now().date(), datetime.min.time())
+
+
+def _dates(rule, due, start, end):
+    """Return the occurrences of a rule as ISO dates."""
+    return [
+        when.date().isoformat()
+        for when in recurrence.occurrences(rule, due, start, end)
+    ]
+
+
+class TestRules:
+    """Test suite for parsing and stepping through recurrence rules."""
+
+    @pytest.mark.parametrize(
+        ("rule", "expected"),
+        [
+            ("daily", "daily"),
+            (" Weekly ", "weekly"),
+            ("3D", "3d"),
+            ("fri, mon", "mon,fri"),
+            ("weekdays", "weekdays"),
+        ],
+    )
+    def test_parse_normalizes(self, rule, expected):
+        """Test that rules are normalized."""
+        assert recurrence.parse(rule) == expected
+
+    @pytest.mark.parametrize(
+        "rule", ["", "hourly", "0d", "mon,funday", "2x", "monthly:32", "daily:1"]
+    )
+    def test_parse_rejects_unknown_rules(self, rule):
+        """Test that malformed rules raise ValueError."""
+        with pytest.raises(ValueError):
+            recurrence.parse(rule)
+
+    def test_weekday_list(self):
+        """Test that weekday lists step to the next listed day."""
+        monday = datetime(2026, 10, 12)
+
+        dates = _dates("mon,thu", monday, None, monday + timedelta(days=14))
+
+        assert dates == ["2026-10-12", "2026-10-15", "2026-10-19", "2026-10-22"]
+
+    def test_monthly_clamps_to_month_end(self):
+        """Test that monthly occurrences stay within shorter months."""
+        when = recurrence.next_after("monthly", datetime(2026, 1, 31))
+
+        assert when == datetime(2026, 2, 28)
+
+    def test_monthly_keeps_anchor_day(self):
+        """Test that clamping to a short month doesn't move later occurrences."""
+        due = datetime(2026, 1, 31)
+
+        dates = _dates("monthly", due, None, datetime(2026, 5, 1))
+
+        assert dates == ["2026-01-31", "2026-02-28", "2026-03-31", "2026-04-30"]
+        assert recurrence.next_after("monthly:31", datetime(2026, 2, 28)) == (
+            datetime(2026, 3, 31)
+        )
+
+    def test_anchor_pins_day_of_month(self):
+        """Test that only monthly and yearly rules are anchored."""
+        due = datetime(2026, 1, 31)
+
+        assert recurrence.anchor("monthly", due) == "monthly:31"
+        assert recurrence.anchor("yearly:29", due) == "yearly:29"
+        assert recurrence.anchor("weekly", due) == "weekly"
+        assert recurrence.parse("Monthly:31") == "monthly:31"
+
+    def test_first_snaps_to_anchor_day(self):
+        """Test that an anchored rule starts on its day of the month."""
+        start = datetime(2026, 10, 18)
+
+        assert recurrence.first("monthly:15", start) == datetime(2026, 11, 15)
+        assert recurrence.first("monthly:31", start) == datetime(2026, 10, 31)
+
+    def test_window_skips_earlier_occurrences(self):
+        """Test that only occurrences in [start, end) are yielded."""
+        due = datetime(2020, 1, 1)
+        start = datetime(2026, 10, 1)
+
+        dates = _dates("2w", due, start, start + timedelta(days=28))
+
+        assert dates == ["2026-10-14", "2026-10-28"]
+
+    def test_first_snaps_to_listed_day(self):
+        """Test that a weekday rule starts on its first listed day."""
+        assert recurrence.first("fri", datetime(2026, 10, 12)) == datetime(
+            2026, 10, 16
+        )
+
+    def test_advance_skips_missed_occurrences(self):
+        """Test that advancing never lands in the past."""
+        due = TODAY - timedelta(days=10)
+
+        assert recurrence.advance("daily", due, TODAY) == TODAY
+        assert recurrence.advance("daily", TODAY, TODAY) == TODAY + timedelta(1)
+
+
+class TestRecurringTasks:
+    """Test suite for storing and completing recurring tasks."""
+
+    def _add(self, due=TODAY, rule="daily"):
+        """Add a recurring task and a plain one due the same day."""
+        storage.add_tasks(
+            [
+                Task(title="Standup", due_date=due, recur=rule),
+                Task(title="Report", due_date=due),
+            ]
+        )
+
+    @pytest.mark.parametrize("engine", ["json", "journal", "sqlite"])
+    def test_occurrences_are_not_stored(self, engine, temp_storage, monkeypatch):
+        """Test that a window lists every occurrence from one stored task."""
+        monkeypatch.setenv("TASK_STORAGE", engine)
+        self._add()
+
+        tasks = storage.due_tasks(TODAY + timedelta(days=3), start=TODAY)
+
+        assert [(t.id, t.title) for t in tasks] == [
+            (1, "Standup"),
+            (2, "Report"),
+            (1, "Standup"),
+            (1, "Standup"),
+        ]
+        assert [t.due_date for t in tasks if t.id == 1] == [
+            TODAY + timedelta(days=n) for n in range(3)
+        ]
+        assert storage.count_tasks() == 2
+
+    @pytest.mark.parametrize("engine", ["json", "journal", "sqlite"])
+    def test_completing_materializes_occurrence(
+        self, engine, temp_storage, monkeypatch
+    ):
+        """Test that done stores the occurrence and moves the task on."""
+        monkeypatch.setenv("TASK_STORAGE", engine)
+        self._add()
+
+        (done,) = storage.complete_tasks([1])
+
+        assert (done.id, done.title, done.done, done.recur) == (
+            3,
+            "Standup",
+            True,
+            None,
+        )
+        assert done.due_date == TODAY
+        task = storage.get_task(1)
+        assert (task.done, task.recur) == (False, "daily")
+        assert task.due_date == TODAY + timedelta(days=1)
+
+    def test_completing_monthly_task_keeps_day(self, temp_storage):
+        """Test that a month-end task returns to its day after February."""
+        due = datetime(2030, 1, 31)
+        storage.add_tasks(
+            [Task(title="Rent", due_date=due, recur=recurrence.anchor("monthly", due))]
+        )
+
+        storage.complete_tasks([1])
+        storage.complete_tasks([1])
+
+        assert storage.get_task(1).due_date == datetime(2030, 3, 31)
+
+    def test_missed_occurrences_show_once(self, temp_storage):
+        """Test that an overdue recurring task is listed once, then skips ahead."""
+        self._add(due=TODAY - timedelta(days=5))
+
+        overdue = storage.due_tasks(TODAY)
+        storage.complete_tasks([1])
+
+        assert [t.title for t in overdue] == ["Standup", "Report"]
+        assert storage.get_task(1).due_date == TODAY
+        assert storage.find_tasks([3])[0].due_date == TODAY - timedelta(days=5)
+
+    def test_window_after_snapshot_rewrite(self, temp_storage):
+        """Test that recurring tasks are found through the snapshot header."""
+        self._add(due=TODAY - timedelta(days=30))
+        storage.compact()
+        storage.delete_tasks([2])
+
+        tasks = storage.due_tasks(TODAY + timedelta(days=1), start=TODAY)
+
+        assert storage._read_header()["recurring"] == [1]
+        assert [(t.id, t.due_date) for t in tasks] == [(1, TODAY)]
+
+    @pytest.mark.parametrize("engine", ["json", "journal", "sqlite"])
+    def test_undo_and_redo_completion(self, engine, temp_storage, monkeypatch):
+        """Test that undo removes the occurrence and restores the due date."""
+        monkeypatch.setenv("TASK_STORAGE", engine)
+        self._add()
+        storage.complete_tasks([1])
+
+        assert storage.undo() == "Completed 'Standup'"
+        assert [t.id for t in storage.iter_tasks()] == [1, 2]
+        assert storage.get_task(1).due_date == TODAY
+
+        storage.redo()
+        assert storage.get_task(1).due_date == TODAY + timedelta(days=1)
+        assert storage.get_task(3).done
+
+    def test_binary_snapshot_keeps_rule(self, temp_storage):
+        """Test that rules round-trip through the binary snapshot."""
+        self._add(rule="mon,fri")
+
+        storage.convert_store("binary")
+
+        assert [t.recur for t in storage.load_tasks()] == ["mon,fri", None]
+        offsets = storage._read_index([1], storage._snapshot_key())
+        assert binary.read_records(temp_storage, [offsets[1]])[0]["recur"] == (
+            "mon,fri"
+        )
+
+    def test_reads_version_2_binary_snapshot(self, temp_storage):
+        """Test that binary snapshots from before recurrence still load."""
+        layout = binary.RECORDS[2]
+        header = json.dumps({"version": 1, "next_id": 2}).encode()
+        heap = len(binary.MAGIC) + binary.PREAMBLE.size + len(header) + layout.size
+        row = layout.pack(1, 0, 0, 0, NO_DUE_DATE, heap, len(b"Old task"))
+        temp_storage.write_bytes(
+            binary.MARKER
+            + b"\x02"
+            + binary.PREAMBLE.pack(len(header), 1)
+            + header
+            + row
+            + b"Old task"
+        )
+
+        (task,) = storage.load_tasks()
+
+        assert (task.id, task.title, task.recur) == (1, "Old task", None)
+
+    def test_sqlite_migration_adds_column(self, temp_storage, monkeypatch):
+        """Test that databases from before recurrence gain the rule column."""
+        monkeypatch.setenv("TASK_STORAGE", "sqlite")
+        db = storage._db_path()
+        with sqlite3.connect(db) as conn:
+            schema = sqlite_store.SCHEMA.replace(",\n    recur TEXT", "")
+            conn.executescript(schema)
+            conn.execute("PRAGMA user_version = 1")
+        conn.close()
+
+        self._add(rule="weekly")
+
+        assert [t.recur for t in storage.load_tasks()] == ["weekly", None]
+
@@ -0,0 +1,39 @@
+"""Tests for the redo command."""
+
+from task import storage
+from task.commands import app
+
+
+class TestRedo:
+    """Test suite for redo command."""
+
+    def test_redoes_undone_change(self, runner, sample_data):
+        """Test that redo repeats the change undo reversed."""
+        runner.invoke(app, ["clear", "1", "--force"])
+        runner.invoke(app, ["undo"])
+
+        result = runner.invoke(app, ["redo"])
+
+        assert result.exit_code == 0
+        assert "Redid: Deleted 'First task'" in result.output
+        assert [t.title for t in storage.load_tasks()] == ["Second task"]
+
+    def test_redo_then_undo_again(self, runner, temp_storage):
+        """Test that a redone change can be undone again."""
+        runner.invoke(app, ["add", "A"])
+        runner.invoke(app, ["undo"])
+        runner.invoke(app, ["redo"])
+
+        assert "Undid: Added 'A'" in runner.invoke(app, ["undo"]).output
+        assert storage.load_tasks() == []
+
+    def test_new_change_clears_redo(self, runner, temp_storage):
+        """Test that a change made after undo can't be mixed with redo."""
+        runner.invoke(app, ["add", "A"])
+        runner.invoke(app, ["undo"])
+        runner.invoke(app, ["add", "B"])
+
+        result = runner.invoke(app, ["redo"])
+
+        assert "Nothing to redo" in result.output
+        assert [t.title for t in storage.load_tasks()] == ["B"]
@@ -0,0 +1,48 @@
+"""Tests for the search command."""
+
+from task.commands import app
+
+
+class TestSearch:
+    """Test suite for search command."""
+
+    def test_finds_pending_tasks_by_word(self, runner, sample_data):
+        """Test that search matches words in pending task titles."""
+        result = runner.invoke(app, ["search", "task"])
+
+        assert result.exit_code == 0
+        assert "First task" in result.output
+        assert "Second task" not in result.output
+
+    def test_all_includes_completed(self, runner, sample_data):
+        """Test that --all also searches completed tasks."""
+        result = runner.invoke(app, ["search", "sec", "--all"])
+
+        assert result.exit_code == 0
+        assert "Second task" in result.output
+
+    def test_best_match_first(self, runner, temp_storage):
+        """Test that whole-word matches rank above prefix matches."""
+        runner.invoke(app, ["add", "Reporting pipeline"])
+        runner.invoke(app, ["add", "Write report"])
+
+        result = runner.invoke(app, ["search", "report"])
+
+        assert result.exit_code == 0
+        assert result.output.index("Write report") < result.output.index(
+            "Reporting pipeline"
+        )
+
+    def test_no_matches(self, runner, sample_data):
+        """Test the message when nothing matches."""
+        result = runner.invoke(app, ["search", "groceries"])
+
+        assert result.exit_code == 0
+        assert "No tasks match 'groceries'" in result.output
+
+    def test_terms_without_words(self, runner, sample_data):
+        """Test that a query with no searchable words shows error."""
+        result = runner.invoke(app, ["search", "--", "--"])
+
+        assert result.exit_code == 2
+        assert "Search terms must contain letters or digits" in result.output
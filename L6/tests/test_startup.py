@@ -0,0 +1,90 @@
+"""Tests for CLI startup cost, measured with python -X importtime."""
+
+import importlib
+import os
+import subprocess
+import sys
+
+import pytest
+import typer
+
+from task.commands import COMMANDS
+
+# Budget for the self time of task's own modules, in microseconds. typer and
+# rich are excluded; the budget is loose enough to only catch regressions
+# such as a heavy import moving back to module level.
+STARTUP_BUDGET_US = 50_000
+
+# Modules that must not be imported just to start the CLI
+HEAVY_MODULES = ("rich.console", "rich.table", "sqlite3")
+
+
+def _import_times(code: str, home) -> dict[str, int]:
+    """Run code with -X importtime and return each module's self time in us."""
+    env = {**os.environ, "HOME": str(home), "PYTHONPATH": os.pathsep.join(sys.path)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        if self_us.strip().isdigit():
+            times[name.strip()] = int(self_us)
+    return times
+
+
+def _run_cli(*args: str) -> str:
+    """Build code that runs the CLI with the given arguments."""
+    return (
+        f"import sys; sys.argv = ['task', *{list(args)!r}]\n"
+        "from task.main import app\n"
+        "app(standalone_mode=False)"
+    )
+
+
+class TestStartup:
+    """Test suite for import-time regressions."""
+
+    def test_startup_imports_no_commands(self, tmp_path):
+        """Test that importing the CLI loads no command modules or rich."""
+        modules = _import_times("import task.main", tmp_path)
+
+        assert not [m for m in modules if m.startswith("task.commands.")]
+        assert not [m for m in HEAVY_MODULES if m in modules]
+
+    def test_add_imports_only_its_command(self, tmp_path):
+        """Test that `task add` loads its own module and nothing heavier."""
+        modules = _import_times(_run_cli("add", "Buy milk"), tmp_path)
+
+        commands = [m for m in modules if m.startswith("task.commands.")]
+        assert commands == ["task.commands.add"]
+        assert "rich.table" not in modules
+        assert "sqlite3" not in modules
+
+    def test_startup_budget(self, tmp_path):
+        """Test that task's own modules stay within the startup budget."""
+        _import_times("import task.main", tmp_path)  # Warm the bytecode cache
+        modules = _import_times("import task.main", tmp_path)
+
+        own = sum(us for m, us in modules.items() if m.split(".")[0] == "task")
+        assert own < STARTUP_BUDGET_US
+
+    def test_profiling_starts_before_typer(self, tmp_path):
+        """Test that the profiler's clock starts before typer is loaded."""
+        modules = list(_import_times("import task.main", tmp_path))
+
+        assert modules.index("task.profiling") < modules.index("typer")
+
+    @pytest.mark.parametrize("name", sorted(COMMANDS))
+    def test_registry_matches_command(self, name):
+        """Test that the lazy registry's help matches the real command."""
+        module_name, help_text = COMMANDS[name]
+        command = typer.main.get_command(importlib.import_module(module_name).app)
+
+        assert command.name == name
+        assert command.help.splitlines()[0] == help_text
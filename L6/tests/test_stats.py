@@ -0,0 +1,46 @@
+"""Tests for the stats command."""
+
+import re
+
+from task import storage
+from task.commands import app
+
+
+def _row(output: str, name: str) -> list[int]:
+    """Return the pending, done and total counts of one table row."""
+    line = next(line for line in output.splitlines() if f" {name} " in line)
+    return [int(n) for n in re.findall(r"\d+", line)]
+
+
+class TestStats:
+    """Test suite for stats command."""
+
+    def test_shows_counts_per_priority(self, runner, sample_data):
+        """Test that stats shows pending and done counts with totals."""
+        runner.invoke(app, ["add", "Urgent", "-p", "high"])
+
+        result = runner.invoke(app, ["stats"])
+
+        assert result.exit_code == 0
+        assert _row(result.output, "high") == [1, 1, 2]
+        assert _row(result.output, "low") == [1, 0, 1]
+        assert _row(result.output, "all") == [2, 1, 3]
+
+    def test_check_reports_consistent_counters(self, runner, sample_data):
+        """Test that --check confirms counters that match the tasks."""
+        result = runner.invoke(app, ["stats", "--check"])
+
+        assert result.exit_code == 0
+        assert "Counters match the stored tasks" in result.output
+
+    def test_check_repairs_stale_counters(self, runner, sample_data):
+        """Test that --check rebuilds counters that drifted."""
+        data = storage._read_document()
+        data["counts"]["high"]["done"] = 7
+        storage._write_document(data)
+
+        result = runner.invoke(app, ["stats", "--check"])
+
+        assert result.exit_code == 0
+        assert "Counters were out of date" in result.output
+        assert storage.task_counts()["high"]["done"] == 1
@@ -0,0 +1,975 @@
+"""Tests for the storage engines."""
+
+import json
+import multiprocessing
+from datetime import datetime, timedelta
+
+import pytest
+
+from task import binary, sqlite_store, storage
+from task.models import Priority, Task
+
+
+@pytest.fixture
+def journal(temp_storage, monkeypatch):
+    """Storage using the append-only journal engine."""
+    monkeypatch.setenv("TASK_STORAGE", "journal")
+    return temp_storage.with_suffix(".log")
+
+
+class TestJournal:
+    """Test suite for the journal storage engine."""
+
+    def test_add_appends_to_journal_only(self, journal, temp_storage):
+        """Test that adding a task leaves the snapshot untouched."""
+        storage.add_task(Task(title="Buy milk"))
+
+        assert json.loads(temp_storage.read_text())["tasks"] == []
+        stamp, *ops = map(json.loads, journal.read_text().splitlines())
+        assert stamp == {"generation": 0}
+        assert ops[0]["op"] == "add"
+        assert ops[0]["task"]["title"] == "Buy milk"
+
+    def test_load_replays_snapshot_and_journal(self, journal, sample_data):
+        """Test that legacy snapshot data is merged with the journal tail."""
+        storage.add_task(Task(title="Third task"))
+        storage.complete_task(1)
+        storage.delete_task(2)
+
+        tasks = storage.load_tasks()
+        assert [t.title for t in tasks] == ["First task", "Third task"]
+        assert tasks[0].done is True
+
+    def test_compaction_folds_journal_into_snapshot(
+        self, journal, temp_storage, monkeypatch
+    ):
+        """Test that a large journal is compacted into the snapshot."""
+        monkeypatch.setattr(storage, "JOURNAL_COMPACT_BYTES", 1)
+
+        storage.add_task(Task(title="Buy milk"))
+
+        assert not journal.exists()
+        data = json.loads(temp_storage.read_text())
+        assert data["tasks"][0]["title"] == "Buy milk"
+
+    def test_save_tasks_discards_journal(self, journal, sample_data):
+        """Test that a full save supersedes pending journal entries."""
+        storage.add_task(Task(title="Third task"))
+        storage.save_tasks([Task(title="Only task")])
+
+        assert not journal.exists()
+        assert [t.title for t in storage.load_tasks()] == ["Only task"]
+
+    def test_torn_trailing_record_is_ignored(self, journal, sample_data):
+        """Test that an interrupted append does not corrupt the store."""
+        storage.add_task(Task(title="Third task"))
+        with journal.open("a") as f:
+            f.write('{"op": "add", "task": {"ti')
+
+        assert len(storage.load_tasks()) == 3
+
+    def test_missing_task_is_rejected(self, journal, sample_data):
+        """Test that invalid IDs are not written to the journal."""
+        with pytest.raises(KeyError):
+            storage.delete_task(5)
+
+        assert not journal.exists()
+
+    def test_json_engine_reads_pending_journal(self, journal, sample_data, monkeypatch):
+        """Test that switching back to the JSON engine keeps journaled tasks."""
+        storage.add_task(Task(title="Third task"))
+        monkeypatch.setenv("TASK_STORAGE", "json")
+
+        storage.complete_task(3)
+        storage.add_task(Task(title="Fourth task"))
+        storage.compact()
+
+        assert not journal.exists()
+        tasks = storage.load_tasks()
+        assert tasks[2].title == "Third task"
+        assert tasks[2].done is True
+
+
+class TestInPlaceCompletion:
+    """Test that completing tasks on the JSON engine doesn't rewrite the store."""
+
+    def test_done_appends_to_journal(self, sample_data, temp_storage):
+        """Test that the snapshot is untouched and the change is still seen."""
+        storage.add_task(Task(title="Third task", priority=Priority.HIGH))
+        snapshot = temp_storage.read_bytes()
+
+        storage.complete_tasks([1, 3])
+
+        assert temp_storage.read_bytes() == snapshot
+        assert temp_storage.with_suffix(".log").exists()
+        assert [t.done for t in storage.load_tasks()] == [True, True, True]
+        assert storage.task_counts()["high"] == {"pending": 0, "done": 2}
+
+    def test_add_and_delete_append_to_journal(self, sample_data, temp_storage):
+        """Test that adds and deletes leave the snapshot untouched too."""
+        snapshot = temp_storage.read_bytes()
+
+        storage.add_task(Task(title="Third task"))
+        storage.delete_tasks([1, 3])
+
+        assert temp_storage.read_bytes() == snapshot
+        assert [t.title for t in storage.load_tasks()] == ["Second task"]
+        assert storage._next_id() == 4
+
+    def test_done_reads_only_affected_records(self, temp_storage, monkeypatch):
+        """Test that completing a task doesn't read the whole store."""
+        storage.add_tasks([Task(title=f"Task {i}") for i in range(10)])
+        storage.compact()
+        monkeypatch.setattr(storage, "_read_snapshot", None)
+        monkeypatch.setattr(storage, "_iter_snapshot", None)
+
+        assert storage.complete_task(7).done is True
+        with pytest.raises(KeyError):
+            storage.complete_task(99)
+
+    def test_next_write_folds_completions(self, sample_data, temp_storage):
+        """Test that compaction folds logged changes into the snapshot."""
+        storage.add_task(Task(title="Third task"))
+        storage.complete_task(3)
+        storage.delete_task(1)
+        storage.compact()
+
+        assert not temp_storage.with_suffix(".log").exists()
+        data = json.loads(temp_storage.read_text().splitlines()[-2].rstrip(","))
+        assert data["id"] == 3 and data["done"] is True
+
+    def test_without_locks_the_store_is_rewritten(self, sample_data, monkeypatch):
+        """Test that without advisory locks completions rewrite the snapshot."""
+        monkeypatch.setattr(storage, "fcntl", None)
+
+        storage.complete_task(1)
+
+        assert not storage._journal_path().exists()
+        assert storage._read_header()["counts"]["low"]["done"] == 1
+
+
+class TestTaskIds:
+    """Test suite for stable task IDs."""
+
+    def test_legacy_store_is_numbered_by_position(self, sample_data):
+        """Test that stores without IDs get them in list order."""
+        tasks = storage.load_tasks()
+
+        assert [(t.id, t.title) for t in tasks] == [(1, "First task"), (2, "Second task")]
+
+    def test_ids_are_stable_across_deletes(self, temp_storage):
+        """Test that deleting a task does not renumber later tasks."""
+        for title in ["A", "B", "C"]:
+            storage.add_task(Task(title=title))
+
+        storage.delete_task(1)
+
+        assert storage.get_task(3).title == "C"
+        with pytest.raises(KeyError):
+            storage.get_task(1)
+
+    def test_ids_are_never_reused(self, temp_storage):
+        """Test that new tasks get fresh IDs after the newest is deleted."""
+        storage.add_task(Task(title="A"))
+        storage.add_task(Task(title="B"))
+        storage.delete_task(2)
+
+        task = Task(title="C")
+        storage.add_task(task)
+
+        assert task.id == 3
+        storage.compact()
+        data = json.loads(temp_storage.read_text())
+        assert data["next_id"] == 4
+        assert [t["id"] for t in data["tasks"]] == [1, 3]
+
+    def test_header_is_read_without_records(self, temp_storage):
+        """Test that the snapshot header sits on its own first line."""
+        storage.add_task(Task(title="A"))
+        storage.compact()
+
+        header = storage._read_header()
+
+        assert "tasks" not in header
+        assert (header["next_id"], header["generation"]) == (2, 1)
+        assert header["counts"]["low"] == {"pending": 1, "done": 0}
+
+    def test_journal_lookup_uses_index(self, journal, monkeypatch):
+        """Test that journal lookups read one record instead of the store."""
+        monkeypatch.setenv("TASK_STORAGE", "json")
+        for title in ["A", "B", "C"]:
+            storage.add_task(Task(title=title))
+        storage.compact()
+        monkeypatch.setenv("TASK_STORAGE", "journal")
+
+        def full_read():
+            raise AssertionError("full snapshot read")
+
+        monkeypatch.setattr(storage, "_read_snapshot", full_read)
+        storage.complete_task(2)
+
+        assert storage.get_task(2).done is True
+        assert storage.get_task(3).done is False
+        with pytest.raises(KeyError):
+            storage.get_task(4)
+
+    def test_stale_index_falls_back_to_full_read(self, temp_storage):
+        """Test that an index out of step with the snapshot is ignored."""
+        storage.add_task(Task(title="A"))
+        storage.compact()
+        temp_storage.write_text(temp_storage.read_text() + "\n")
+
+        assert storage._indexed_records([1])[1]["title"] == "A"
+
+
+@pytest.fixture
+def sqlite_db(temp_storage, monkeypatch):
+    """Storage using the SQLite engine."""
+    monkeypatch.setenv("TASK_STORAGE", "sqlite")
+    return temp_storage.with_suffix(".db")
+
+
+class TestSqlite:
+    """Test suite for the SQLite storage engine."""
+
+    def test_add_writes_to_database(self, sqlite_db, temp_storage):
+        """Test that tasks are stored in the database, not tasks.json."""
+        storage.add_task(Task(title="Buy milk", priority=Priority.HIGH))
+
+        assert sqlite_db.exists()
+        assert json.loads(temp_storage.read_text())["tasks"] == []
+        tasks = storage.load_tasks()
+        assert tasks[0].title == "Buy milk"
+        assert tasks[0].priority == Priority.HIGH
+
+    def test_get_tasks_filters_with_indexes(self, sqlite_db):
+        """Test filtering by done and priority."""
+        storage.add_task(Task(title="Low", priority=Priority.LOW))
+        storage.add_task(Task(title="High", priority=Priority.HIGH))
+        storage.add_task(Task(title="High done", priority=Priority.HIGH, done=True))
+
+        tasks = storage.get_tasks(done=False, priority=Priority.HIGH)
+
+        assert [t.title for t in tasks] == ["High"]
+
+    def test_offset_and_limit_in_sql(self, sqlite_db):
+        """Test that pages are cut by the query rather than in Python."""
+        storage.add_tasks([Task(title=f"Task {i}") for i in range(1, 11)])
+        storage.complete_task(2)
+
+        tasks = storage.iter_tasks(done=False, offset=2, limit=2)
+
+        assert [t.id for t in tasks] == [4, 5]
+
+    def test_filters_use_indexes(self, sqlite_db):
+        """Test that the query planner picks the priority index."""
+        storage.add_task(Task(title="Task"))
+
+        conn = sqlite_store.connect(sqlite_db)
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM tasks WHERE priority = ?", ("high",)
+        ).fetchall()
+        conn.close()
+        assert "idx_tasks_priority" in str([tuple(row) for row in plan])
+
+    def test_complete_and_delete_by_id(self, sqlite_db):
+        """Test that done and delete address tasks by ID."""
+        for title in ["A", "B", "C"]:
+            storage.add_task(Task(title=title))
+
+        assert storage.complete_task(3).title == "C"
+        storage.delete_task(1)
+
+        tasks = storage.load_tasks()
+        assert [(t.id, t.done) for t in tasks] == [(2, False), (3, True)]
+
+    def test_ids_are_not_reused(self, sqlite_db):
+        """Test that deleting the newest task does not free its ID."""
+        storage.add_task(Task(title="A"))
+        storage.add_task(Task(title="B"))
+        storage.delete_task(2)
+
+        task = Task(title="C")
+        storage.add_task(task)
+
+        assert task.id == 3
+
+    def test_missing_task_raises(self, sqlite_db):
+        """Test that an unknown ID raises KeyError."""
+        with pytest.raises(KeyError):
+            storage.complete_task(1)
+
+    def test_migrate_imports_json_store(self, sample_data, monkeypatch):
+        """Test importing tasks.json into the database."""
+        assert storage.migrate_to_sqlite() == 2
+
+        monkeypatch.setenv("TASK_STORAGE", "sqlite")
+        tasks = storage.load_tasks()
+        assert [t.title for t in tasks] == ["First task", "Second task"]
+        assert [t.id for t in tasks] == [1, 2]
+        assert tasks[1].done is True
+        assert tasks[1].due_date is not None
+
+    def test_migrate_keeps_archived_tasks(self, sample_data, monkeypatch):
+        """Test that archived tasks are migrated as completed tasks."""
+        storage.archive_tasks(timedelta(days=1))
+
+        assert storage.migrate_to_sqlite() == 2
+
+        monkeypatch.setenv("TASK_STORAGE", "sqlite")
+        tasks = storage.load_tasks()
+        assert [(t.id, t.done) for t in tasks] == [(1, False), (2, True)]
+
+    def test_migrate_refuses_to_overwrite(self, sample_data):
+        """Test that a populated database requires force to overwrite."""
+        storage.migrate_to_sqlite()
+
+        with pytest.raises(FileExistsError):
+            storage.migrate_to_sqlite()
+        assert storage.migrate_to_sqlite(force=True) == 2
+
+
+class TestStreaming:
+    """Test suite for the streaming record loader."""
+
+    def test_filters_run_on_raw_records(self, sample_data):
+        """Test that raw records are filtered without building Tasks."""
+        records = list(storage.iter_records(done=True, priority=Priority.HIGH))
+
+        assert [r["title"] for r in records] == ["Second task"]
+        assert records[0]["priority"] == "high"
+
+    def test_only_matching_records_are_decoded(self, temp_storage, monkeypatch):
+        """Test that iter_tasks decodes only the tasks it yields."""
+        for i in range(10):
+            storage.add_task(Task(title=f"Task {i}", done=i % 5 == 0))
+
+        decoded = []
+        decode = storage.dict_to_task
+        monkeypatch.setattr(
+            storage, "dict_to_task", lambda r: decoded.append(r) or decode(r)
+        )
+        tasks = list(storage.iter_tasks(done=True))
+
+        assert [t.title for t in tasks] == ["Task 0", "Task 5"]
+        assert len(decoded) == 2
+
+    def test_only_requested_page_is_decoded(self, temp_storage, monkeypatch):
+        """Test that offset and limit are applied before decoding."""
+        storage.add_tasks([Task(title=f"Task {i}") for i in range(1, 11)])
+        decoded = []
+        decode = storage.dict_to_task
+        monkeypatch.setattr(
+            storage, "dict_to_task", lambda r: decoded.append(r) or decode(r)
+        )
+
+        tasks = list(storage.iter_tasks(offset=4, limit=3))
+
+        assert [t.title for t in tasks] == ["Task 5", "Task 6", "Task 7"]
+        assert len(decoded) == 3
+
+    def test_count_tasks(self, sample_data):
+        """Test counting tasks on raw fields."""
+        assert storage.count_tasks() == 2
+        assert storage.count_tasks(done=False) == 1
+        assert storage.count_tasks(priority=Priority.MEDIUM) == 0
+
+    def test_stream_applies_journal_tail(self, journal, temp_storage, monkeypatch):
+        """Test that streaming merges journaled changes in ID order."""
+        monkeypatch.setenv("TASK_STORAGE", "json")
+        for title in ["A", "B", "C"]:
+            storage.add_task(Task(title=title))
+        monkeypatch.setenv("TASK_STORAGE", "journal")
+
+        storage.delete_task(1)
+        storage.complete_task(2)
+        storage.add_task(Task(title="D"))
+
+        records = list(storage.iter_records())
+        assert [(r["title"], r["done"]) for r in records] == [
+            ("B", True),
+            ("C", False),
+            ("D", False),
+        ]
+
+    def test_stream_reads_legacy_snapshot(self, sample_data):
+        """Test that a pretty-printed legacy store can still be streamed."""
+        assert [r["id"] for r in storage.iter_records()] == [1, 2]
+
+
+@pytest.fixture
+def binary_store(temp_storage):
+    """Binary snapshot with ten tasks, every third one done."""
+    for i in range(10):
+        priority = Priority.HIGH if i % 2 else Priority.LOW
+        storage.add_task(Task(title=f"Task {i + 1}", done=i % 3 == 0, priority=priority))
+    storage.convert_store("binary")
+    return temp_storage
+
+
+class TestMemoryMappedReads:
+    """Test suite for the memory-mapped binary read path."""
+
+    def test_scan_decodes_only_matches(self, binary_store, monkeypatch):
+        """Test that the scan filters on fixed-width fields before decoding."""
+        decoded = []
+        to_record = binary._to_record
+        monkeypatch.setattr(
+            binary, "_to_record", lambda row, title: decoded.append(row) or to_record(row, title)
+        )
+
+        records = list(binary.scan(binary_store, done=True, priority="high"))
+
+        assert [r["title"] for r in records] == ["Task 4", "Task 10"]
+        assert len(decoded) == 2
+
+    def test_early_stop_releases_map(self, binary_store):
+        """Test that abandoning a scan lets the file be rewritten."""
+        scan = binary.scan(binary_store)
+        assert next(scan)["id"] == 1
+        scan.close()
+
+        storage.convert_store("json")
+        assert not binary.is_binary(binary_store)
+
+    def test_count_without_decoding(self, binary_store):
+        """Test counting from the header counters without decoding."""
+        assert storage.count_tasks() == 10
+        assert storage.count_tasks(done=True) == 4
+        assert storage.count_tasks(done=False, priority=Priority.HIGH) == 3
+
+    def test_journaled_changes_bypass_filters(self, binary_store, monkeypatch):
+        """Test that records changed in the journal are filtered after replay."""
+        monkeypatch.setenv("TASK_STORAGE", "journal")
+        storage.complete_task(2)
+
+        done = [t.title for t in storage.iter_tasks(done=True, priority=Priority.HIGH)]
+
+        assert done == ["Task 2", "Task 4", "Task 10"]
+        assert storage.count_tasks(done=True) == 5
+
+    def test_old_binary_version_is_rejected(self, temp_storage):
+        """Test that an unknown binary version raises a clear error."""
+        temp_storage.write_bytes(binary.MARKER + b"\x01" + bytes(12))
+
+        with pytest.raises(ValueError, match="Unsupported binary snapshot version"):
+            storage.load_tasks()
+
+
+class TestBatch:
+    """Test batch mutations applied in one storage transaction."""
+
+    def test_add_tasks_writes_once(self, temp_storage, monkeypatch):
+        """Test that a batch add is a single snapshot write."""
+        monkeypatch.setattr(storage, "fcntl", None)
+        writes = []
+        write_snapshot = storage._write_snapshot
+        monkeypatch.setattr(
+            storage, "_write_snapshot", lambda *a: writes.append(a) or write_snapshot(*a)
+        )
+
+        storage.add_tasks([Task(title=f"Task {i}") for i in range(1, 101)])
+
+        assert len(writes) == 1
+        assert [t.id for t in storage.load_tasks()] == list(range(1, 101))
+
+    def test_complete_tasks(self, sample_data):
+        """Test completing several tasks at once."""
+        tasks = storage.complete_tasks([1, 2, 1])
+
+        assert [t.title for t in tasks] == ["First task", "Second task"]
+        assert all(t.done for t in storage.load_tasks())
+
+    def test_missing_ids_reject_whole_batch(self, sample_data):
+        """Test that one missing ID leaves every task untouched."""
+        with pytest.raises(KeyError) as excinfo:
+            storage.delete_tasks([1, 7, 9])
+
+        assert excinfo.value.args == (7, 9)
+        assert len(storage.load_tasks()) == 2
+
+    @pytest.mark.parametrize("engine", ["journal", "sqlite"])
+    def test_batch_on_other_engines(self, engine, temp_storage, monkeypatch):
+        """Test batch mutations on the journal and SQLite engines."""
+        monkeypatch.setenv("TASK_STORAGE", engine)
+        storage.add_tasks([Task(title=f"Task {i}") for i in range(1, 6)])
+
+        storage.complete_tasks([2, 3])
+        deleted = storage.delete_tasks([4, 5])
+
+        assert [t.title for t in deleted] == ["Task 4", "Task 5"]
+        assert [(t.id, t.done) for t in storage.load_tasks()] == [
+            (1, False),
+            (2, True),
+            (3, True),
+        ]
+
+    def test_snapshot_write_leaves_no_temp_file(self, sample_data, temp_storage):
+        """Test that snapshots are replaced atomically via a temp file."""
+        storage.add_task(Task(title="Third task"))
+
+        assert not list(temp_storage.parent.glob("*.tmp"))
+        assert len(storage.load_tasks()) == 3
+
+
+def _add_many(count):
+    """Add tasks one at a time from a separate process."""
+    for i in range(count):
+        storage.add_task(Task(title=f"Task {i}"))
+
+
+class TestConcurrentWrites:
+    """Test locking, atomic replacement and the generation check."""
+
+    @pytest.mark.parametrize("engine", ["json", "journal"])
+    def test_parallel_writers_lose_nothing(self, engine, temp_storage, monkeypatch):
+        """Test that concurrent processes never overwrite each other's tasks."""
+        monkeypatch.setenv("TASK_STORAGE", engine)
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=_add_many, args=(25,)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert [t.id for t in storage.load_tasks()] == list(range(1, 101))
+
+    def test_generation_increments_on_write(self, sample_data, monkeypatch):
+        """Test that every snapshot write bumps the generation."""
+        monkeypatch.setattr(storage, "fcntl", None)
+        storage.add_task(Task(title="Third task"))
+        storage.delete_task(3)
+
+        assert storage._read_header()["generation"] == 2
+
+    def test_stale_document_is_rejected(self, sample_data, monkeypatch):
+        """Test that writing a document read before another write conflicts."""
+        monkeypatch.setattr(storage, "fcntl", None)
+        stale = storage._read_document()
+        storage.add_task(Task(title="Third task"))
+
+        with pytest.raises(storage.ConflictError):
+            storage._write_document(stale)
+        assert len(storage.load_tasks()) == 3
+
+    def test_commit_replays_ops_after_conflict(self, sample_data, monkeypatch):
+        """Test that a commit that lost a race is replayed on fresh data."""
+        monkeypatch.setattr(storage, "fcntl", None)
+        stale = storage._read_document()
+        storage.add_task(Task(title="Third task"))
+
+        storage._commit({"op": "done", "id": 1}, data=stale)
+
+        tasks = storage.load_tasks()
+        assert [t.title for t in tasks] == ["First task", "Second task", "Third task"]
+        assert tasks[0].done is True
+
+    def test_crash_mid_write_keeps_old_snapshot(self, sample_data, temp_storage, monkeypatch):
+        """Test that a failed write leaves the previous snapshot intact."""
+        monkeypatch.setattr(storage, "fcntl", None)
+        storage.add_task(Task(title="Third task"))
+        before = temp_storage.read_bytes()
+
+        def crash(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(storage.os, "replace", crash)
+        with pytest.raises(OSError):
+            storage.add_task(Task(title="Fourth task"))
+
+        assert temp_storage.read_bytes() == before
+
+    @pytest.mark.parametrize("fmt", ["json", "binary"])
+    def test_indexes_of_same_size_snapshot_are_ignored(self, fmt, temp_storage):
+        """Test that indexes left from a same-size snapshot are never used."""
+        created = datetime(2025, 1, 1)
+        due = datetime(2025, 6, 1)
+        storage.save_tasks(
+            [
+                Task(title="x", id=1, created_at=created),
+                Task(title="yy", id=2, created_at=created, due_date=due),
+            ]
+        )
+        storage.convert_store(fmt)
+        suffixes = (".idx", ".due", ".words")
+        stale = {s: temp_storage.with_suffix(s).read_bytes() for s in suffixes}
+        size = temp_storage.stat().st_size
+        storage.save_tasks(
+            [
+                Task(title="yy", id=1, created_at=created, due_date=due),
+                Task(title="x", id=2, created_at=created),
+            ]
+        )
+        storage.convert_store(fmt)
+        for suffix, content in stale.items():
+            temp_storage.with_suffix(suffix).write_bytes(content)
+
+        assert temp_storage.stat().st_size == size
+        assert storage.get_task(2).title == "x"
+        assert storage._read_due_index(None, storage.DUE_INDEX_END) is None
+        assert [t.id for t in storage.search_tasks("yy")] == [1]
+
+    def _compact_after_journal_read(self, monkeypatch):
+        """Make the next journal read race with a compaction."""
+        read = storage._read_stamped_journal
+
+        def racing():
+            journal = read()
+            monkeypatch.setattr(storage, "_read_stamped_journal", read)
+            storage.compact()
+            return journal
+
+        monkeypatch.setattr(storage, "_read_stamped_journal", racing)
+
+    def test_stream_racing_compaction(self, journal, monkeypatch):
+        """Test that journaled tasks folded in mid-read are streamed once."""
+        storage.add_tasks([Task(title=f"Task {n}") for n in range(3)])
+        self._compact_after_journal_read(monkeypatch)
+
+        assert [t.id for t in storage.iter_tasks()] == [1, 2, 3]
+        assert not journal.exists()
+
+    def test_document_racing_compaction(self, journal, monkeypatch):
+        """Test that a full read racing a compaction keeps journaled tasks."""
+        storage.add_tasks([Task(title=f"Task {n}") for n in range(3)])
+        self._compact_after_journal_read(monkeypatch)
+
+        assert list(storage._read_document()["tasks"]) == [1, 2, 3]
+
+    def test_stale_journal_is_dropped(self, journal, temp_storage):
+        """Test that a journal left behind by a crashed compaction is ignored."""
+        storage.add_task(Task(title="First task"))
+        stale = journal.read_bytes()
+        storage.compact()
+        journal.write_bytes(stale)
+
+        storage.add_task(Task(title="Second task"))
+
+        assert [t.title for t in storage.load_tasks()] == ["First task", "Second task"]
+        assert len(journal.read_text().splitlines()) == 2
+
+
+class TestCounters:
+    """Test the per-priority counters kept by each engine."""
+
+    @pytest.mark.parametrize("engine", ["json", "journal", "sqlite"])
+    def test_counters_follow_changes(self, engine, temp_storage, monkeypatch):
+        """Test that counters are updated on add, done and delete."""
+        monkeypatch.setenv("TASK_STORAGE", engine)
+        storage.add_tasks(
+            [Task(title=f"Task {i}", priority=Priority.HIGH) for i in range(4)]
+            + [Task(title="Low")]
+        )
+        storage.complete_tasks([1, 2, 2])
+        storage.delete_tasks([3, 5])
+
+        counts = storage.task_counts()
+
+        assert counts["high"] == {"pending": 1, "done": 2}
+        assert counts["low"] == {"pending": 0, "done": 0}
+        assert counts == storage.recount_tasks()
+        assert storage.count_tasks(done=True) == 2
+
+    def test_counts_come_from_the_header(self, sample_data, monkeypatch):
+        """Test that counting reads the header rather than the tasks."""
+        storage.add_task(Task(title="Third task", priority=Priority.MEDIUM))
+        monkeypatch.setattr(storage, "iter_records", None)
+
+        assert storage.count_tasks(priority=Priority.MEDIUM) == 1
+        assert storage.count_tasks(done=False) == 2
+
+    def test_journal_tail_reads_only_touched_records(self, journal, sample_data, monkeypatch):
+        """Test that journaled changes are counted via the id index."""
+        storage.save_tasks(storage.load_tasks())
+        storage.complete_task(1)
+        monkeypatch.setattr(storage, "_read_snapshot", None)
+
+        assert storage.task_counts()["low"] == {"pending": 0, "done": 1}
+
+    def test_legacy_store_is_counted_on_read(self, sample_data):
+        """Test that a store without counters is tallied from its tasks."""
+        assert storage.task_counts()["high"] == {"pending": 0, "done": 1}
+
+    def test_repair_rebuilds_stale_counters(self, sample_data):
+        """Test that repair_counts fixes counters that drifted."""
+        data = storage._read_document()
+        data["counts"]["low"]["pending"] = 99
+        storage._write_document(data)
+
+        assert storage.count_tasks(done=False) == 99
+        storage.repair_counts()
+        assert storage.task_counts() == storage.recount_tasks()
+
+    def test_sqlite_backfills_counters(self, sqlite_db):
+        """Test that a database without counters gets them on connect."""
+        storage.add_tasks([Task(title="A"), Task(title="B")])
+        with sqlite_store.connect(sqlite_db) as conn:
+            conn.execute("DELETE FROM task_counts")
+
+        assert storage.count_tasks() == 2
+
+
+def _dated(title, day, done=False):
+    """Return a task due on the given day of January 2026."""
+    return Task(title=title, done=done, due_date=datetime(2026, 1, day))
+
+
+class TestDueIndex:
+    """Test range lookups through the due-date index."""
+
+    @pytest.mark.parametrize("engine", ["json", "journal", "sqlite"])
+    def test_range_lookup(self, engine, temp_storage, monkeypatch):
+        """Test that only pending tasks due in [start, end) are returned."""
+        monkeypatch.setenv("TASK_STORAGE", engine)
+        storage.add_tasks(
+            [
+                _dated("Late", 20),
+                _dated("Early", 5),
+                _dated("Finished", 6, done=True),
+                Task(title="Undated"),
+                _dated("Middle", 10),
+            ]
+        )
+
+        tasks = storage.due_tasks(datetime(2026, 1, 20), start=datetime(2026, 1, 5))
+
+        assert [t.title for t in tasks] == ["Early", "Middle"]
+        assert [t.title for t in storage.due_tasks(datetime(2026, 1, 6))] == ["Early"]
+
+    def test_lookup_bisects_without_scanning(self, temp_storage, monkeypatch):
+        """Test that the index is used instead of a scan of the store."""
+        storage.add_tasks([_dated(f"Task {day}", day) for day in range(1, 29)])
+        storage.compact()
+        monkeypatch.setattr(storage, "iter_records", None)
+
+        tasks = storage.due_tasks(datetime(2026, 1, 13), start=datetime(2026, 1, 10))
+
+        assert [t.id for t in tasks] == [10, 11, 12]
+
+    def test_journal_changes_are_applied(self, journal, temp_storage):
+        """Test that journaled adds and completions move tasks in and out."""
+        storage.save_tasks([_dated("Snapshot", 3), _dated("Other", 4)])
+        storage.complete_task(1)
+        storage.add_task(_dated("Journaled", 2))
+
+        tasks = storage.due_tasks(datetime(2026, 1, 10))
+
+        assert [t.title for t in tasks] == ["Journaled", "Other"]
+
+    def test_stale_index_falls_back_to_scan(self, sample_data, temp_storage):
+        """Test that a snapshot written without the index is scanned."""
+        storage.add_task(_dated("Pending", 1))
+        storage.compact()
+        temp_storage.with_suffix(".due").unlink()
+
+        assert [t.title for t in storage.due_tasks(datetime(2026, 1, 2))] == ["Pending"]
+
+        temp_storage.with_suffix(".due").write_bytes(bytes(16))
+        assert [t.title for t in storage.due_tasks(datetime(2026, 1, 2))] == ["Pending"]
+
+
+class TestSearchIndex:
+    """Test title search through the inverted index."""
+
+    @pytest.mark.parametrize("engine", ["json", "journal", "sqlite"])
+    def test_prefix_matching_and_ranking(self, engine, temp_storage, monkeypatch):
+        """Test that every term must match and whole words rank first."""
+        monkeypatch.setenv("TASK_STORAGE", engine)
+        storage.add_tasks(
+            [
+                Task(title="Review pull request"),
+                Task(title="Pull weeds"),
+                Task(title="Request review from Sam"),
+                Task(title="Reviewing notes"),
+            ]
+        )
+        storage.delete_task(1)
+
+        titles = [t.title for t in storage.search_tasks("review REQ")]
+        assert titles == ["Request review from Sam"]
+        titles = [t.title for t in storage.search_tasks("review")]
+        assert titles == ["Request review from Sam", "Reviewing notes"]
+        assert len(storage.search_tasks("re", limit=1)) == 1
+
+    def test_lookup_reads_only_matches(self, temp_storage, monkeypatch):
+        """Test that the index is used instead of a scan of the store."""
+        storage.add_tasks([Task(title=f"Task {i}") for i in range(50)])
+        storage.compact()
+        monkeypatch.setattr(storage, "iter_records", None)
+
+        assert [t.id for t in storage.search_tasks("7")] == [8]
+        assert [t.id for t in storage.search_tasks("4", limit=3)] == [5, 41, 42]
+
+    def test_journal_changes_are_applied(self, journal, temp_storage):
+        """Test that journaled adds, completions and deletes are searched."""
+        storage.save_tasks([Task(title="Buy milk"), Task(title="Buy bread")])
+        storage.add_task(Task(title="Buy eggs"))
+        storage.complete_task(1)
+        storage.delete_task(2)
+
+        assert [t.title for t in storage.search_tasks("buy", done=False)] == [
+            "Buy eggs"
+        ]
+        assert [t.title for t in storage.search_tasks("buy", done=True)] == [
+            "Buy milk"
+        ]
+
+    def test_stale_index_falls_back_to_scan(self, sample_data, temp_storage):
+        """Test that a snapshot written without the index is scanned."""
+        assert [t.title for t in storage.search_tasks("first")] == ["First task"]
+
+        storage.add_task(Task(title="Third task"))
+        temp_storage.with_suffix(".words").write_bytes(bytes(24))
+        assert [t.id for t in storage.search_tasks("task", done=False)] == [1, 3]
+
+    def test_sqlite_backfills_words(self, sqlite_db):
+        """Test that a database without the search index gets it on connect."""
+        storage.add_tasks([Task(title="Alpha"), Task(title="Beta")])
+        with sqlite_store.connect(sqlite_db) as conn:
+            conn.execute("DELETE FROM task_words")
+            conn.execute("PRAGMA user_version = 0")
+
+        assert [t.title for t in storage.search_tasks("bet")] == ["Beta"]
+
+
+class TestSorting:
+    """Test sorted listings and top-k selection."""
+
+    @pytest.mark.parametrize("engine", ["json", "journal", "sqlite"])
+    def test_sorted_pages(self, engine, temp_storage, monkeypatch):
+        """Test that every engine orders by the keys, then by ID."""
+        monkeypatch.setenv("TASK_STORAGE", engine)
+        storage.add_tasks(
+            [
+                Task(title="b", due_date=datetime(2026, 1, 2)),
+                Task(title="C", priority=Priority.HIGH),
+                Task(title="a", priority=Priority.MEDIUM),
+                Task(title="d", due_date=datetime(2026, 1, 1)),
+                Task(title="e", priority=Priority.HIGH),
+            ]
+        )
+
+        def titles(sort, **kwargs):
+            return [t.title for t in storage.iter_tasks(sort=sort, **kwargs)]
+
+        assert titles(["priority", "due"]) == ["C", "e", "a", "d", "b"]
+        assert titles(["due", "title"]) == ["d", "b", "a", "C", "e"]
+        assert titles(["title"], offset=1, limit=2) == ["b", "C"]
+
+    def test_top_uses_bounded_heap(self, temp_storage, monkeypatch):
+        """Test that a limited sort selects with nsmallest, not a full sort."""
+        storage.add_tasks([Task(title=f"Task {i}") for i in range(20)])
+        monkeypatch.setattr(storage, "sorted", None, raising=False)
+
+        tasks = storage.iter_tasks(sort=["priority"], limit=3, offset=1)
+
+        assert [t.id for t in tasks] == [2, 3, 4]
+
+
+class TestLists:
+    """Test task lists stored as separate shards."""
+
+    def test_lists_are_isolated(self, temp_storage):
+        """Test that each list has its own IDs, indexes and journal."""
+        storage.add_task(Task(title="Default"))
+        storage.use_list("work")
+        storage.add_tasks([Task(title="Work 1"), Task(title="Work 2")])
+
+        assert [t.id for t in storage.load_tasks()] == [1, 2]
+        assert {p.name for p in (temp_storage.parent / "lists").glob("work.*")} >= {
+            "work.json",
+            "work.idx",
+            "work.lock",
+        }
+        storage.use_list(storage.DEFAULT_LIST)
+        assert [t.title for t in storage.load_tasks()] == ["Default"]
+
+    def test_list_names(self, temp_storage):
+        """Test that the default list comes first, then named lists by name."""
+        for name in ["work", "home"]:
+            storage.use_list(name)
+            storage.add_task(Task(title=name))
+
+        assert storage.list_names() == ["default", "home", "work"]
+
+    @pytest.mark.parametrize("name", ["", "a/b", "..", "work.json"])
+    def test_invalid_names(self, name):
+        """Test that names which aren't plain words are rejected."""
+        with pytest.raises(ValueError, match="Invalid list name"):
+            storage.list_path(name)
+
+
+class TestArchive:
+    """Test the compressed archive of completed tasks."""
+
+    def test_compaction_archives_old_completed_tasks(
+        self, journal, sample_data, monkeypatch
+    ):
+        """Test that folding the journal also archives old completed tasks."""
+        monkeypatch.delenv("TASK_ARCHIVE_DAYS")
+        storage.add_task(Task(title="Third task"))
+        storage.compact()
+
+        assert [t.title for t in storage.load_tasks()] == ["First task", "Third task"]
+        assert [r["title"] for r in storage.iter_archive()] == ["Second task"]
+        assert storage.archived_counts()["high"] == 1
+        assert storage.count_tasks(done=True) == 0
+        assert storage.count_tasks(done=True, archived=True) == 1
+
+    def test_json_writes_archive_old_completed_tasks(self, sample_data, monkeypatch):
+        """Test that the default engine archives when it rewrites the snapshot."""
+        monkeypatch.delenv("TASK_ARCHIVE_DAYS")
+        monkeypatch.setattr(storage, "fcntl", None)
+        old = datetime(2020, 1, 1)
+        storage.add_tasks([Task(title="Old", done=True, created_at=old)])
+
+        assert [t.title for t in storage.load_tasks()] == ["First task", "Old"]
+        assert [r["title"] for r in storage.iter_archive()] == ["Second task"]
+
+        storage.add_task(Task(title="Third task"))
+
+        assert [t.title for t in storage.load_tasks()] == ["First task", "Third task"]
+        assert [r["title"] for r in storage.iter_archive()] == ["Second task", "Old"]
+
+    def test_archiving_can_be_disabled(self, journal, sample_data, monkeypatch):
+        """Test that TASK_ARCHIVE_DAYS=off keeps completed tasks in the store."""
+        monkeypatch.setenv("TASK_ARCHIVE_DAYS", "off")
+        storage.add_task(Task(title="Third task"))
+        storage.compact()
+
+        assert len(storage.load_tasks()) == 3
+        assert list(storage.iter_archive()) == []
+
+    def test_archive_appends_segments(self, temp_storage):
+        """Test that each run appends a member and readers see them all."""
+        old = datetime(2020, 1, 1)
+        storage.add_tasks([Task(title="A", done=True, created_at=old)])
+        storage.archive_tasks(timedelta(days=1))
+        storage.add_tasks([Task(title="B", done=True, created_at=old)])
+        storage.archive_tasks(timedelta(days=1))
+
+        assert [r["title"] for r in storage.iter_archive()] == ["A", "B"]
+        assert storage.load_tasks() == []
+
+    def test_uncommitted_segment_is_ignored(self, sample_data, temp_storage):
+        """Test a crash after the archive append but before the store write."""
+        storage.add_task(Task(title="Old", done=True, created_at=datetime(2020, 1, 1)))
+        storage._archive_records(storage._read_document(), timedelta(days=1))
+
+        assert list(storage.iter_archive()) == []
+        assert [t.id for t in storage.iter_tasks(done=True, archived=True)] == [2, 3]
+
+        storage.archive_tasks(timedelta(days=1))
+        assert [r["id"] for r in storage.iter_archive()] == [2, 3]
+
+    def test_save_tasks_keeps_archive(self, sample_data):
+        """Test that replacing the stored tasks leaves the archive in place."""
+        storage.archive_tasks(timedelta(days=1))
+        storage.save_tasks(storage.load_tasks())
+
+        assert [r["title"] for r in storage.iter_archive()] == ["Second task"]
+
+    def test_sqlite_has_no_archive(self, sqlite_db):
+        """Test that archiving is refused for the SQLite engine."""
+        with pytest.raises(ValueError):
+            storage.archive_tasks(timedelta(days=1))
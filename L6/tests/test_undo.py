@@ -0,0 +1,123 @@
+"""Tests for the undo command."""
+
+from datetime import timedelta
+
+import pytest
+
+from task import storage
+from task.commands import app
+from task.models import Task
+
+
+def _titles(**kwargs):
+    """Return the titles of tasks in the store."""
+    return [(t.title, t.done) for t in storage.iter_tasks(**kwargs)]
+
+
+class TestUndo:
+    """Test suite for undo command."""
+
+    def test_undoes_delete(self, runner, sample_data):
+        """Test that a deleted task comes back with its ID and fields."""
+        before = storage.load_tasks()
+        runner.invoke(app, ["clear", "1", "--force"])
+
+        result = runner.invoke(app, ["undo"])
+
+        assert result.exit_code == 0
+        assert "Undid: Deleted 'First task'" in result.output
+        assert storage.load_tasks() == before
+
+    def test_undoes_done(self, runner, sample_data):
+        """Test that a completed task is pending again."""
+        runner.invoke(app, ["done", "1"])
+
+        result = runner.invoke(app, ["undo"])
+
+        assert "Undid: Completed 'First task'" in result.output
+        assert _titles() == [("First task", False), ("Second task", True)]
+
+    def test_undoes_add_of_many(self, runner, temp_storage):
+        """Test that a batch add is undone as one change."""
+        runner.invoke(app, ["add", "-f", "-"], input="A\nB\nC\n")
+
+        result = runner.invoke(app, ["undo"])
+
+        assert "Undid: Added 3 tasks" in result.output
+        assert storage.load_tasks() == []
+
+    def test_undoes_in_reverse_order(self, runner, temp_storage):
+        """Test that repeated undo walks back through changes."""
+        runner.invoke(app, ["add", "A"])
+        runner.invoke(app, ["done", "1"])
+        runner.invoke(app, ["clear", "1", "--force"])
+
+        for expected in ["Deleted 'A'", "Completed 'A'", "Added 'A'"]:
+            assert expected in runner.invoke(app, ["undo"]).output
+        assert "Nothing to undo" in runner.invoke(app, ["undo"]).output
+
+    def test_completing_done_task_is_not_recorded(self, runner, sample_data):
+        """Test that a change that did nothing leaves nothing to undo."""
+        runner.invoke(app, ["done", "2"])
+
+        result = runner.invoke(app, ["undo"])
+
+        assert "Nothing to undo" in result.output
+
+    def test_history_can_be_disabled(self, runner, temp_storage, monkeypatch):
+        """Test that TASK_HISTORY=off records nothing."""
+        monkeypatch.setenv("TASK_HISTORY", "off")
+        runner.invoke(app, ["add", "A"])
+
+        assert "Nothing to undo" in runner.invoke(app, ["undo"]).output
+        assert not storage._undo_path().exists()
+
+    def test_history_is_bounded(self, temp_storage, monkeypatch):
+        """Test that only the last TASK_HISTORY changes are kept."""
+        monkeypatch.setenv("TASK_HISTORY", "3")
+        for i in range(20):
+            storage.add_task(Task(title=f"Task {i}"))
+
+        undone = 0
+        while storage.undo() is not None:
+            undone += 1
+        assert 3 <= undone < 6
+        assert len(storage.load_tasks()) == 20 - undone
+
+    def test_skips_archived_tasks(self, temp_storage):
+        """Test that undoing a completion skips tasks archived since."""
+        storage.add_tasks([Task(title="A"), Task(title="B")])
+        storage.complete_tasks([1, 2])
+        storage.archive_tasks(older_than=timedelta(0))
+
+        assert storage.undo() == "Completed 2 tasks"
+        assert _titles(done=None) == []
+        assert sum(storage.archived_counts().values()) == 2
+
+    @pytest.mark.parametrize("engine", ["json", "journal", "sqlite"])
+    def test_every_engine(self, engine, temp_storage, monkeypatch):
+        """Test that add, done and delete are undone on every engine."""
+        monkeypatch.setenv("TASK_STORAGE", engine)
+        storage.add_tasks([Task(title="A"), Task(title="B")])
+        storage.complete_tasks([1])
+        storage.delete_tasks([2])
+
+        storage.undo()
+        assert _titles(done=None) == [("A", True), ("B", False)]
+        storage.undo()
+        assert _titles(done=None) == [("A", False), ("B", False)]
+        storage.undo()
+        assert _titles(done=None) == []
+
+    def test_does_not_rewrite_store(self, temp_storage, monkeypatch):
+        """Test that undoing a completion only appends to the journal."""
+        storage.add_tasks([Task(title="A"), Task(title="B")])
+        storage.compact()
+        storage.complete_tasks([2])
+        monkeypatch.setattr(storage, "_write_snapshot", None)
+        monkeypatch.setattr(storage, "_read_snapshot", None)
+
+        storage.undo()
+
+        assert storage._journal_path().exists()
+        assert [t.done for t in storage.find_tasks([1, 2])] == [False, False]